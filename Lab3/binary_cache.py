@@ -0,0 +1,87 @@
+import mmap
+import os
+import struct
+from array import array
+
+from .json_stream import iter_json_array
+
+MAGIC = b'LAB3COL\0'
+FORMAT_VERSION = 1
+# magic, версия, размер исходного файла, mtime исходного файла (нс), число записей, длина данных
+HEADER = struct.Struct('<8sIxxxxQqQQ')
+
+
+def cache_path_for(path, field):
+    return f'{path}.{field}.cache'
+
+
+def _read_cache(cache_path, size, mtime_ns):
+    """Значения из кеша через mmap или None, если кеша нет или он устарел"""
+    try:
+        with open(cache_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < HEADER.size:
+        mapped.close()
+        return None
+    magic, version, cached_size, cached_mtime, count, data_length = HEADER.unpack_from(mapped)
+    if (magic, version, cached_size, cached_mtime) != (MAGIC, FORMAT_VERSION, size, mtime_ns) \
+            or len(mapped) != HEADER.size + data_length + (count + 1) * 8:
+        mapped.close()
+        return None
+    return mapped, count, data_length
+
+
+def _iter_cache(mapped, count, data_length):
+    try:
+        offsets = array('q')
+        offsets.frombytes(mapped[HEADER.size + data_length:])
+        for i in range(count):
+            yield mapped[HEADER.size + offsets[i]:HEADER.size + offsets[i + 1]].decode('utf-8')
+    finally:
+        mapped.close()
+
+
+def _iter_and_build(path, field, cache_path, size, mtime_ns):
+    tmp = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        out = open(tmp, 'wb')
+    except OSError:
+        # Каталог недоступен для записи - просто читаем без кеша
+        for item in iter_json_array(path, fields=[field]):
+            yield item[field]
+        return
+
+    complete = False
+    try:
+        with out:
+            out.write(bytes(HEADER.size))
+            offsets = array('q', [0])
+            for item in iter_json_array(path, fields=[field]):
+                value = item[field]
+                offsets.append(offsets[-1] + out.write(value.encode('utf-8')))
+                yield value
+            out.write(offsets.tobytes())
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, FORMAT_VERSION, size, mtime_ns, len(offsets) - 1, offsets[-1]))
+        os.replace(tmp, cache_path)
+        complete = True
+    finally:
+        if not complete and os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def iter_field(path, field):
+    """Значения строкового поля field всех записей JSON-массива из файла path.
+
+    При первом чтении рядом с файлом сохраняется двоичный кеш значений; пока размер
+    и время изменения файла не поменялись, следующие чтения идут из кеша через mmap
+    без разбора JSON. Кеш перестраивается автоматически.
+    """
+    stat = os.stat(path)
+    cache_path = cache_path_for(path, field)
+    cached = _read_cache(cache_path, stat.st_size, stat.st_mtime_ns)
+    if cached is not None:
+        return _iter_cache(*cached)
+    return _iter_and_build(path, field, cache_path, stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,48 @@
+import heapq
+import json
+import os
+import tempfile
+
+
+def _write_run(directory, number, items):
+    path = os.path.join(directory, f'run{number}.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+        for item in sorted(items):
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+    return path
+
+
+def _read_run(f):
+    for line in f:
+        yield json.loads(line)
+
+
+def sorted_unique(items, key=None, run_size=100000):
+    """Отсортированные уникальные значения key(item) - генератор.
+
+    В памяти держится не больше run_size различных значений: при переполнении
+    они сортируются и сбрасываются во временный файл, затем файлы сливаются.
+    """
+    with tempfile.TemporaryDirectory(prefix='sorted_unique_') as directory:
+        runs = []
+        current = set()
+        for item in items:
+            current.add(key(item) if key is not None else item)
+            if len(current) >= run_size:
+                runs.append(_write_run(directory, len(runs), current))
+                current = set()
+
+        files = [open(path, encoding='utf-8') for path in runs]
+        try:
+            previous = object()
+            for value in heapq.merge(sorted(current), *map(_read_run, files)):
+                if value != previous:
+                    previous = value
+                    yield value
+        finally:
+            for f in files:
+                f.close()
+
+if __name__ == '__main__':
+    data = ['b', 'A', 'c', 'a', 'B', 'd', 'a']
+    print(list(sorted_unique(data, key=str.lower, run_size=2)))
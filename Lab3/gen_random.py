@@ -1,7 +1,9 @@
 import random
+from itertools import count
 
 def gen_random(num_count, begin, end):
-    for _ in range(num_count):
+    # num_count=None - бесконечная последовательность
+    for _ in (range(num_count) if num_count is not None else count()):
         yield random.randint(begin, end)
 
 if __name__ == '__main__':
@@ -0,0 +1,75 @@
+import json
+
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+def iter_json_array(path, fields=None, chunk_size=1 << 16):
+    """Читать элементы JSON-массива верхнего уровня по одному, не загружая весь файл.
+
+    Если заданы fields, от каждого элемента-словаря остаются только эти поля.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        eof = False
+        started = False
+
+        def read_more():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        while True:
+            # Пропускаем пробелы и разделители между элементами
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buf):
+                if eof:
+                    raise ValueError(f"{path}: неожиданный конец файла")
+                read_more()
+                continue
+
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError(f"{path}: ожидался JSON-массив")
+                started = True
+                pos += 1
+                continue
+
+            if buf[pos] == ']':
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                read_more()
+                continue
+            # Число в конце буфера могло оборваться на границе блока ('3.' читается как 3)
+            if not eof and (end == len(buf) or buf[end] in _NUMBER_CHARS):
+                read_more()
+                continue
+
+            pos = end
+            if fields is not None:
+                item = {name: item[name] for name in fields}
+            yield item
+
+            if pos > chunk_size:
+                buf = buf[pos:]
+                pos = 0
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as tmp:
+        json.dump([{'job-name': 'Программист', 'salary': 1}, {'job-name': 'Водитель', 'salary': 2}], tmp)
+    print(list(iter_json_array(tmp.name, fields=['job-name'], chunk_size=8)))
+    os.remove(tmp.name)
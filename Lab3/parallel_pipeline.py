@@ -0,0 +1,125 @@
+import heapq
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+
+from .stage_cache import content_chunks, function_digest
+
+
+def chunks(items, size):
+    """Разбить поток на списки по size элементов"""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_chunk(names, prefix, suffix):
+    """Этапы f1-f3 для одной порции: уникальные названия в нижнем регистре
+    (по возрастанию) и пары (название, название + suffix) для подходящих под prefix"""
+    unique = sorted(set(name.lower() for name in names))
+    return unique, [(name, name + suffix) for name in unique if name.startswith(prefix)]
+
+
+def _merge_unique(sorted_lists, key=None):
+    previous = object()
+    for item in heapq.merge(*sorted_lists, key=key):
+        current = item if key is None else key(item)
+        if current != previous:
+            previous = current
+            yield item
+
+
+class _RunningMerge:
+    """Накопленный отсортированный список без повторов, в который вливаются части.
+
+    Части копятся, пока их суммарный размер меньше накопленного списка, затем
+    сливаются с ним за один проход. Памяти нужно O(различных + порция), а каждый
+    элемент в среднем участвует в O(log) слияний.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self.merged = []
+        self._parts = []
+        self._buffered = 0
+
+    def add(self, part):
+        self._parts.append(part)
+        self._buffered += len(part)
+        if self._buffered >= len(self.merged):
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.merged = list(_merge_unique([self.merged] + self._parts, key=self.key))
+            self._parts = []
+            self._buffered = 0
+        return self.merged
+
+
+class _InlineExecutor(Executor):
+    """Исполнитель без пула: задача выполняется сразу в текущем процессе"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+
+def run_stages(names, prefix, suffix, workers=None, chunk_size=10000, cache=None):
+    """Выполнить f1-f3 по порциям в пуле процессов и слить результаты.
+
+    Возвращает (f1, f2, f3) - те же списки, что и последовательный запуск.
+    Одновременно в обработке не больше 2 * workers порций; результаты порций
+    сразу вливаются в накопленные списки. Если задан cache (StageCache), порции
+    делятся по содержимому и неизменившиеся берутся из кеша. При workers=1 пул
+    не создаётся: порции считаются в текущем процессе.
+    """
+    workers = workers or os.cpu_count() or 1
+    unique_merge = _RunningMerge()
+    matched_merge = _RunningMerge(key=lambda pair: pair[0])
+
+    def collect(result):
+        unique, matched = result
+        unique_merge.add(unique)
+        matched_merge.add([tuple(pair) for pair in matched])
+
+    if cache is not None:
+        stage = function_digest(process_chunk, prefix, suffix)
+        portions = content_chunks(names, chunk_size)
+    else:
+        portions = chunks(names, chunk_size)
+
+    with ProcessPoolExecutor(workers) if workers > 1 else _InlineExecutor() as executor:
+        pending = deque()
+
+        def finish(future, key):
+            result = future.result()
+            if key is not None:
+                cache.put(key, result)
+            collect(result)
+
+        for chunk in portions:
+            key = None
+            if cache is not None:
+                key = cache.key(chunk, stage)
+                cached = cache.get(key)
+                if cached is not None:
+                    # Порядок частей не важен: они сливаются сортировкой
+                    collect(cached)
+                    continue
+            if len(pending) >= 2 * workers:
+                finish(*pending.popleft())
+            pending.append((executor.submit(process_chunk, chunk, prefix, suffix), key))
+        for future, key in pending:
+            finish(future, key)
+
+    matched = matched_merge.flush()
+    return unique_merge.flush(), [name for name, _ in matched], [job for _, job in matched]
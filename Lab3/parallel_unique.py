@@ -0,0 +1,153 @@
+import os
+import pickle
+import queue
+import traceback
+from collections import deque
+from multiprocessing import Process, Queue
+
+from .parallel_pipeline import chunks
+
+# Как часто проверять, живы ли процессы, пока ждём их ответа (секунды)
+_POLL_INTERVAL = 0.5
+
+
+def _shard_worker(shard, tasks, results):
+    """Процесс-владелец одной части множества встреченных элементов.
+
+    В results кладутся кортежи (shard, индексы новых элементов, ошибка).
+    """
+    seen = set()
+    try:
+        while True:
+            data = tasks.get()
+            if data is None:
+                break
+            new = []
+            for i, item in enumerate(pickle.loads(data)):
+                if item not in seen:
+                    seen.add(item)
+                    new.append(i)
+            results.put((shard, new, None))
+    except Exception:
+        results.put((shard, None, traceback.format_exc()))
+    # Непрочитанные результаты после остановки не нужны - не ждём их отправки
+    results.cancel_join_thread()
+
+
+class ParallelUnique(object):
+    """Итератор по элементам без повторов, множество встреченных разделено между процессами.
+
+    Элемент попадает в процесс по хешу, поэтому каждый процесс хранит только свою
+    часть множества. ignore_case - как у Unique. С ordered=True порядок тот же, что
+    у Unique; с ordered=False элементы выдаются по частям в том порядке, в котором
+    процессы заканчивают проверку.
+    Элементы должны сериализоваться pickle: иначе ошибка возникает при передаче
+    порции. Если процесс завершился или упал, итератор выдаёт RuntimeError.
+    """
+
+    def __init__(self, items, workers=None, ignore_case=False, ordered=True, chunk_size=10000):
+        self.ignore_case = ignore_case
+        self.ordered = ordered
+        self.chunk_size = chunk_size
+
+        self._output = Queue()
+        self._shards = []
+        for shard in range(workers or os.cpu_count() or 1):
+            tasks = Queue()
+            process = Process(target=_shard_worker, args=(shard, tasks, self._output), daemon=True)
+            process.start()
+            self._shards.append((process, tasks))
+        self._results = self._run(iter(items))
+
+    def __next__(self):
+        return next(self._results)
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Остановить процессы"""
+        for process, tasks in self._shards:
+            if process.is_alive():
+                tasks.put(None)
+        for process, _ in self._shards:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._shards = []
+
+    def _partition(self, chunk):
+        n = len(self._shards)
+        items = [[] for _ in range(n)]
+        positions = [[] for _ in range(n)]
+        for i, item in enumerate(chunk):
+            shard = hash(item) % n
+            items[shard].append(item)
+            positions[shard].append(i)
+        return items, positions
+
+    def _receive(self):
+        """Дождаться ответа любого процесса; упавший процесс - RuntimeError"""
+        while True:
+            try:
+                shard, new, error = self._output.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                for process, _ in self._shards:
+                    if not process.is_alive():
+                        raise RuntimeError(f"Процесс {process.pid} завершился с кодом {process.exitcode}")
+                continue
+            if error is not None:
+                raise RuntimeError(f"Ошибка в процессе части {shard}:\n{error}")
+            return shard, new
+
+    def _run(self, items):
+        # Порции в обработке: [порция, элементы по частям, позиции по частям, ответы, осталось ответов]
+        pending = deque()
+        # Для каждой части - порции, ответа на которые она ещё не дала (процесс отвечает по очереди)
+        waiting = [deque() for _ in self._shards]
+
+        def receive_one():
+            shard, new = self._receive()
+            entry = waiting[shard].popleft()
+            entry[3][shard] = new
+            entry[4] -= 1
+            if not self.ordered:
+                shard_items = entry[1][shard]
+                yield from (shard_items[i] for i in new)
+            # Завершённые порции снимаются с начала очереди
+            while pending and pending[0][4] == 0:
+                chunk, _, positions, answers, _ = pending.popleft()
+                if self.ordered:
+                    first = sorted(part[i] for part, new in zip(positions, answers) for i in new)
+                    yield from (chunk[i] for i in first)
+
+        try:
+            for chunk in chunks(items, self.chunk_size):
+                if self.ignore_case:
+                    chunk = [item.lower() for item in chunk]
+                shard_items, positions = self._partition(chunk)
+                # Сериализация здесь, а не в фоновом потоке очереди: ошибка доходит до вызывающего
+                data = [pickle.dumps(shard) for shard in shard_items]
+                entry = [chunk, shard_items, positions, [None] * len(self._shards), len(self._shards)]
+                for (_, tasks), shard_data, shard_waiting in zip(self._shards, data, waiting):
+                    tasks.put(shard_data)
+                    shard_waiting.append(entry)
+                pending.append(entry)
+                # Пока процессы проверяют следующую порцию, выдаём результат предыдущей
+                while len(pending) > 1:
+                    yield from receive_one()
+            while pending:
+                yield from receive_one()
+        finally:
+            self.close()
+
+if __name__ == '__main__':
+    data = ['a', 'A', 'b', 'B', 'a', 'A', 'c', 'b', 'B']
+    print(list(ParallelUnique(data, workers=2, chunk_size=3)))
+    print(list(ParallelUnique(data, workers=2, ignore_case=True, chunk_size=3)))
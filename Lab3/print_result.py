@@ -17,6 +17,15 @@ def print_result(func):
 
     return wrapper
 
+def print_stream(func):
+    """Как print_result, но для генераторов: каждый элемент печатается, когда его забирают"""
+    def wrapper(*args, **kwargs):
+        for item in func(*args, **kwargs):
+            print(item)
+            yield item
+
+    return wrapper
+
 @print_result
 def test_1():
     return 1
@@ -1,31 +1,114 @@
-import json
+import argparse
+import os
+import random
 from .gen_random import gen_random
-from .print_result import print_result
+from .print_result import print_result, print_stream
 from .cm_timer import cm_timer_1
+from .json_stream import iter_json_array
+from .binary_cache import iter_field
+from .external_sort import sorted_unique
+from .parallel_pipeline import run_stages
+from .stage_cache import StageCache
 
 
-path = r"/home/egorp/python/Labs3Sem/Lab3/data.json"
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data.json')
+JOB_PREFIX = 'программист'
+JOB_SUFFIX = ' с опытом Python'
 
-with open(path, encoding='utf-8') as f:
-    data = json.load(f)
+
+def read_job_names(path, use_cache=True):
+    """Читать названия вакансий из файла по одной, не загружая файл целиком.
+
+    С use_cache названия берутся из двоичного кеша рядом с файлом (см. binary_cache).
+    """
+    if use_cache:
+        return iter_field(path, 'job-name')
+    return (item['job-name'] for item in iter_json_array(path, fields=['job-name']))
 
 @print_result
 def f1(arg):
-    return sorted(set(item['job-name'].lower() for item in arg))
+    return sorted(set(name.lower() for name in arg))
 
 @print_result
 def f2(arg):
-    return list(filter(lambda s: s.startswith('программист'), arg))
+    return list(filter(lambda s: s.startswith(JOB_PREFIX), arg))
 
 @print_result
 def f3(arg):
-    return list(map(lambda s: s + ' с опытом Python', arg))
+    return list(map(lambda s: s + JOB_SUFFIX, arg))
 
 @print_result
 def f4(arg):
     salaries = gen_random(len(arg), 100000, 2000000)
     return ['{} зарплата {}'.format(job, salary) for job, salary in zip(arg, salaries)]
 
+# Потоковый вариант: этапы - генераторы, элементы проходят по цепочке по одному
+
+@print_stream
+def f1_stream(arg, run_size=100000):
+    return sorted_unique(arg, key=str.lower, run_size=run_size)
+
+@print_stream
+def f2_stream(arg):
+    return filter(lambda s: s.startswith(JOB_PREFIX), arg)
+
+@print_stream
+def f3_stream(arg):
+    return map(lambda s: s + JOB_SUFFIX, arg)
+
+@print_stream
+def f4_stream(arg):
+    salaries = gen_random(None, 100000, 2000000)
+    return ('{} зарплата {}'.format(job, salary) for job, salary in zip(arg, salaries))
+
+# Параллельный вариант: f1-f3 считаются по порциям в пуле процессов,
+# печать и f4 - как в последовательном запуске
+
+def run_parallel(names, workers=None, chunk_size=10000, cache=None):
+    unique, matched, jobs = run_stages(names, JOB_PREFIX, JOB_SUFFIX, workers, chunk_size, cache)
+    # Списки этапов печатаются тем же декоратором, что и у f1-f3
+    show = print_result(list)
+    show(unique)
+    show(matched)
+    return f4(show(jobs))
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Обработка вакансий из JSON-файла")
+    parser.add_argument('path', nargs='?', default=os.environ.get('LAB3_DATA', DEFAULT_PATH),
+                        help="путь к data.json (по умолчанию $LAB3_DATA или data.json рядом с модулем)")
+    parser.add_argument('--stream', action='store_true',
+                        help="потоковый режим: этапы не собирают промежуточные списки")
+    parser.add_argument('--run-size', type=int, default=100000,
+                        help="сколько различных названий f1 держит в памяти до сброса на диск")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="параллельный режим: число процессов (0 - последовательный запуск)")
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help="размер порции названий в параллельном режиме")
+    parser.add_argument('--cache', help="каталог кеша этапов: неизменившиеся порции не пересчитываются, "
+                                        "ненужные текущему входу записи удаляются")
+    parser.add_argument('--no-parse-cache', action='store_true',
+                        help="не использовать двоичный кеш разобранного файла")
+    parser.add_argument('--seed', type=int, help="зерно генератора зарплат для воспроизводимого вывода")
+    args = parser.parse_args()
+    if args.stream and (args.workers or args.cache):
+        parser.error("--stream нельзя сочетать с --workers и --cache: они считают этапы по порциям")
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    cache = StageCache(args.cache) if args.cache else None
+    names = read_job_names(args.path, not args.no_parse_cache)
+
     with cm_timer_1():
-        f4(f3(f2(f1(data))))
+        if args.workers or cache is not None:
+            # С кешем без --workers порции считаются в этом же процессе
+            run_parallel(names, args.workers or 1, args.chunk_size, cache)
+        elif args.stream:
+            for _ in f4_stream(f3_stream(f2_stream(f1_stream(names, args.run_size)))):
+                pass
+        else:
+            f4(f3(f2(f1(names))))
+
+    if cache is not None:
+        cache.prune()
+        print(cache.report())
@@ -0,0 +1,74 @@
+import math
+import time
+from collections import OrderedDict
+
+
+class BloomFilter:
+    """Приближённое множество фиксированного размера.
+
+    Ложноотрицательных ответов нет, ложноположительные - с вероятностью около
+    error_rate, пока добавлено не больше capacity элементов (дальше она растёт).
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.01):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity должно быть > 0, error_rate - в интервале (0, 1)")
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Двойное хеширование: k позиций из двух значений хеша
+        h1 = hash(item)
+        h2 = hash((item, 0x9e3779b9)) | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def add(self, item):
+        bits = self.bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+
+class SlidingWindowSet:
+    """Множество последних элементов: не больше max_items и не старше max_age секунд.
+
+    Проверка элемента обновляет его время, как в LRU: часто встречающийся
+    элемент не вытесняется, пока он повторяется чаще, чем истекает окно.
+    """
+
+    def __init__(self, max_items=None, max_age=None, clock=time.monotonic):
+        if max_items is None and max_age is None:
+            raise ValueError("Нужно задать max_items или max_age")
+        self.max_items = max_items
+        self.max_age = max_age
+        self.clock = clock
+        self.items = OrderedDict()
+
+    def _expire(self, now):
+        if self.max_age is not None:
+            deadline = now - self.max_age
+            while self.items and next(iter(self.items.values())) < deadline:
+                self.items.popitem(last=False)
+
+    def __contains__(self, item):
+        now = self.clock()
+        self._expire(now)
+        if item in self.items:
+            self.items[item] = now
+            self.items.move_to_end(item)
+            return True
+        return False
+
+    def add(self, item):
+        self.items[item] = self.clock()
+        self.items.move_to_end(item)
+        if self.max_items is not None and len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+
+    def __len__(self):
+        return len(self.items)
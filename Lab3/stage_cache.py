@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import zlib
+
+
+def content_chunks(items, avg_size=10000):
+    """Разбить поток строк на порции по содержимому.
+
+    Порция заканчивается на строке, crc32 которой делится на avg_size, поэтому
+    вставка или удаление строк меняет только соседние порции, а не все следующие.
+    Размер порции ограничен 4 * avg_size.
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if zlib.crc32(item.encode('utf-8')) % avg_size == 0 or len(chunk) >= 4 * avg_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _hash_code(h, code):
+    h.update(code.co_code)
+    for const in code.co_consts:
+        # repr вложенного объекта кода содержит адрес в памяти, поэтому хешируем его содержимое
+        if hasattr(const, 'co_code'):
+            _hash_code(h, const)
+        else:
+            h.update(repr(const).encode('utf-8'))
+
+
+def function_digest(func, *params):
+    """Хеш кода функции и её параметров: при их изменении старые записи не используются"""
+    h = hashlib.sha256(func.__qualname__.encode('utf-8'))
+    _hash_code(h, func.__code__)
+    h.update(repr(params).encode('utf-8'))
+    return h.hexdigest()
+
+
+class StageCache:
+    """Кеш результатов этапа на диске: ключ - хеш входной порции и хеш функции этапа.
+
+    Записи, не понадобившиеся в текущем запуске, удаляет prune(): после него в
+    каталоге остаются только порции последнего входа, и кеш не растёт от запуска к запуску.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+        # Ключи, прочитанные или записанные в этом запуске
+        self._used = set()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(chunk, stage_digest):
+        h = hashlib.sha256(stage_digest.encode('ascii'))
+        h.update(json.dumps(chunk, ensure_ascii=False).encode('utf-8'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.add(key)
+        return result
+
+    def put(self, key, result):
+        # Запись через временный файл: прерванный запуск не оставит испорченную запись
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._used.add(key)
+
+    def prune(self):
+        """Удалить записи, которые не читались и не записывались в этом запуске.
+
+        Вызывать после завершённого запуска: прерванный удалил бы ещё нужные записи.
+        Другие файлы каталога не трогаются. Возвращает число удалённых записей.
+        """
+        removed = 0
+        for name in os.listdir(self.directory):
+            key, ext = os.path.splitext(name)
+            if ext != '.json' or len(key) != 64 or key in self._used:
+                continue
+            try:
+                int(key, 16)
+                os.remove(os.path.join(self.directory, name))
+            except (ValueError, OSError):
+                continue
+            removed += 1
+        self.pruned += removed
+        return removed
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return (f"cache: {self.hits} из {total} порций взято из кеша ({rate:.1f}%), пересчитано {self.misses}, "
+                f"удалено устаревших {self.pruned}")
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from . import binary_cache
+from .binary_cache import cache_path_for, iter_field
+
+
+def no_json(*args, **kwargs):
+    raise AssertionError("файл разбирается заново, хотя кеш актуален")
+
+
+class TestBinaryCache(unittest.TestCase):
+    """Тесты для двоичного кеша разобранного файла"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'data.json')
+        self.names = ['Программист', 'Водитель', '', 'врач ☃', 'Программист']
+        self.write(self.names)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, names):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([{'job-name': name, 'salary': i} for i, name in enumerate(names)], f, ensure_ascii=False)
+
+    def test_second_read_uses_cache(self):
+        """Тест 1: Первое чтение строит кеш, второе берёт значения из него"""
+        self.assertEqual(list(iter_field(self.path, 'job-name')), self.names)
+        self.assertTrue(os.path.exists(cache_path_for(self.path, 'job-name')))
+
+        with mock.patch.object(binary_cache, 'iter_json_array', no_json):
+            self.assertEqual(list(iter_field(self.path, 'job-name')), self.names)
+
+    def test_changed_file_rebuilds_cache(self):
+        """Тест 2: Изменение размера или времени файла делает кеш неактуальным"""
+        list(iter_field(self.path, 'job-name'))
+
+        # Другой размер
+        self.write(self.names + ['Новая'])
+        self.assertEqual(list(iter_field(self.path, 'job-name')), self.names + ['Новая'])
+
+        # Тот же размер, другое время изменения
+        self.write(['Водитель', 'Программист', '', 'врач ☃', 'Программист', 'Новая'])
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(list(iter_field(self.path, 'job-name')),
+                         ['Водитель', 'Программист', '', 'врач ☃', 'Программист', 'Новая'])
+
+    def test_corrupt_cache_is_rebuilt(self):
+        """Тест 3: Обрезанный или чужой файл кеша не используется"""
+        cache_path = cache_path_for(self.path, 'job-name')
+        list(iter_field(self.path, 'job-name'))
+        damages = {'обрезан': lambda data: data[:-3], 'чужой заголовок': lambda data: b'X' + data[1:],
+                   'пустой': lambda data: b''}
+        for name, damage in damages.items():
+            with self.subTest(name):
+                with open(cache_path, 'rb') as f:
+                    data = f.read()
+                with open(cache_path, 'wb') as f:
+                    f.write(damage(data))
+                self.assertEqual(list(iter_field(self.path, 'job-name')), self.names)
+
+    def test_interrupted_read_leaves_no_cache(self):
+        """Дополнительный тест: прерванное чтение не оставляет кеш и временные файлы"""
+        values = iter_field(self.path, 'job-name')
+        next(values)
+        values.close()
+        self.assertEqual(os.listdir(self.directory.name), ['data.json'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
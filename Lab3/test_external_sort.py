@@ -0,0 +1,52 @@
+import io
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from . import external_sort
+from .external_sort import sorted_unique
+from .process_data import f1, f2, f3, f4, f1_stream, f2_stream, f3_stream, f4_stream
+
+
+class TestSortedUnique(unittest.TestCase):
+    """Тесты для сортировки с выгрузкой на диск"""
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.items = [rng.choice(['Программист', 'водитель', 'ВРАЧ']) + f" {rng.randint(1, 300)}"
+                      for _ in range(2000)]
+
+    def test_matches_sorted_set(self):
+        """Тест 1: Результат совпадает с sorted(set(...)) при любом размере прогона"""
+        expected = sorted(set(item.lower() for item in self.items))
+        for run_size in (1, 2, 7, 100, 10 ** 6):
+            with self.subTest(run_size=run_size):
+                self.assertEqual(list(sorted_unique(self.items, key=str.lower, run_size=run_size)), expected)
+
+    def test_spills_and_cleans_up(self):
+        """Тест 2: Прогоны сбрасываются на диск, а после слияния файлы удаляются"""
+        # Arrange
+        with mock.patch.object(external_sort, '_write_run', wraps=external_sort._write_run) as write_run:
+            # Act
+            result = list(sorted_unique(self.items, run_size=50))
+
+        # Assert
+        self.assertEqual(result, sorted(set(self.items)))
+        self.assertGreater(write_run.call_count, 1)
+        directory = write_run.call_args.args[0]
+        self.assertFalse(os.path.exists(directory))
+
+    def test_stream_pipeline_matches_serial(self):
+        """Тест 3: Потоковая цепочка f1-f4 даёт тот же итог, что и последовательная"""
+        with redirect_stdout(io.StringIO()):
+            random.seed(1)
+            expected = f4(f3(f2(f1(self.items))))
+            random.seed(1)
+            result = list(f4_stream(f3_stream(f2_stream(f1_stream(iter(self.items), run_size=30)))))
+        self.assertEqual(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+from .json_stream import iter_json_array
+
+DATA = [
+    {'job-name': 'Программист', 'salary': 12345, 'rate': -3.5e10},
+    {'job-name': 'Водитель "такси"\n', 'salary': 0, 'rate': 0.25},
+    [1, 2.0, -30000000000000000000000],
+    'строка с \\ и ☃',
+    12345678,
+    3.14159,
+    True,
+    None,
+    {'вложенный': {'список': [{'a': []}, {}]}},
+]
+
+
+class TestJsonStream(unittest.TestCase):
+    """Тесты для потокового чтения JSON-массива"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, text):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_every_chunk_boundary(self):
+        """Тест 1: Результат совпадает с json.load при любой границе блока"""
+        for text in (json.dumps(DATA, ensure_ascii=False), json.dumps(DATA, indent=2)):
+            self.write(text)
+            for chunk_size in range(1, len(text) + 2):
+                with self.subTest(chunk_size=chunk_size):
+                    self.assertEqual(list(iter_json_array(self.path, chunk_size=chunk_size)), DATA)
+
+    def test_numbers_split_at_block_end(self):
+        """Тест 2: Число, оборванное на границе блока, читается целиком"""
+        self.write('[1234567, 3.25e-7, 98765]')
+        for chunk_size in range(1, 12):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(iter_json_array(self.path, chunk_size=chunk_size)), [1234567, 3.25e-7, 98765])
+
+    def test_fields(self):
+        """Тест 3: От записей остаются только нужные поля"""
+        self.write(json.dumps(DATA[:2], ensure_ascii=False))
+        result = list(iter_json_array(self.path, fields=['job-name'], chunk_size=5))
+        self.assertEqual(result, [{'job-name': item['job-name']} for item in DATA[:2]])
+
+    def test_empty_array(self):
+        """Дополнительный тест: пустой массив"""
+        self.write(' [ \n ] ')
+        self.assertEqual(list(iter_json_array(self.path, chunk_size=1)), [])
+
+    def test_invalid_files(self):
+        """Дополнительный тест: не массив и оборванный файл - ошибка"""
+        for text in ('{"a": 1}', '[1, 2', '[{"a": 1}, {"b"', ''):
+            with self.subTest(text=text):
+                self.write(text)
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(self.path, chunk_size=3))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
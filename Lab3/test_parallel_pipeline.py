@@ -0,0 +1,62 @@
+import random
+import tempfile
+import unittest
+
+from .parallel_pipeline import _RunningMerge, run_stages
+from .stage_cache import StageCache
+
+PREFIX = 'программист'
+SUFFIX = ' с опытом Python'
+WORDS = ['Программист', 'программист 1С', 'Водитель', 'ПРОГРАММИСТ C++', 'врач', 'Программист Python']
+
+
+def serial_stages(names):
+    """Этапы f1-f3 последовательного запуска"""
+    unique = sorted(set(name.lower() for name in names))
+    matched = [name for name in unique if name.startswith(PREFIX)]
+    return unique, matched, [name + SUFFIX for name in matched]
+
+
+class TestParallelPipeline(unittest.TestCase):
+    """Тесты для параллельного выполнения f1-f3"""
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.names = [f"{rng.choice(WORDS)} {rng.randint(1, 50)}" for _ in range(2000)]
+
+    def test_matches_serial_run(self):
+        """Тест 1: Результат совпадает с последовательным запуском при любом размере порции"""
+        expected = serial_stages(self.names)
+        for chunk_size in (1, 7, 300, 10000):
+            with self.subTest(chunk_size=chunk_size):
+                result = run_stages(iter(self.names), PREFIX, SUFFIX, workers=2, chunk_size=chunk_size)
+                self.assertEqual(result, expected)
+
+    def test_cached_portions(self):
+        """Тест 2: Повторный запуск с кешем берёт все порции из кеша и даёт тот же результат"""
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            first = StageCache(directory)
+            expected = run_stages(self.names, PREFIX, SUFFIX, workers=1, chunk_size=200, cache=first)
+
+            # Act
+            second = StageCache(directory)
+            result = run_stages(self.names, PREFIX, SUFFIX, workers=1, chunk_size=200, cache=second)
+
+            # Assert
+            self.assertEqual(result, expected)
+            self.assertEqual(result, serial_stages(self.names))
+            self.assertEqual(second.misses, 0)
+            self.assertGreater(second.hits, 0)
+
+    def test_running_merge_keeps_only_distinct(self):
+        """Дополнительный тест: накопленный список не хранит повторы между частями"""
+        merge = _RunningMerge()
+        for part in ([1, 3, 5], [1, 2, 3], [5, 6], [2, 6, 7], [1]):
+            merge.add(part)
+            self.assertLessEqual(len(merge.merged), 7)
+        self.assertEqual(merge.flush(), [1, 2, 3, 5, 6, 7])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,55 @@
+import pickle
+import random
+import unittest
+
+from .parallel_unique import ParallelUnique
+from .unique import Unique
+
+
+class TestParallelUnique(unittest.TestCase):
+    """Тесты для Unique с множеством, разделённым между процессами"""
+
+    def setUp(self):
+        rng = random.Random(4)
+        self.items = [rng.choice(['a', 'B', 'c', 'D']) * rng.randint(1, 40) for _ in range(3000)]
+
+    def test_ordered_matches_unique(self):
+        """Тест 1: С ordered=True порядок тот же, что у Unique"""
+        for workers, chunk_size in ((1, 100), (3, 7), (2, 10000)):
+            with self.subTest(workers=workers, chunk_size=chunk_size):
+                for ignore_case in (False, True):
+                    result = list(ParallelUnique(self.items, workers, ignore_case, chunk_size=chunk_size))
+                    self.assertEqual(result, list(Unique(self.items, ignore_case=ignore_case)))
+
+    def test_unordered_has_same_items(self):
+        """Тест 2: С ordered=False те же элементы без повторов"""
+        result = list(ParallelUnique(self.items, workers=3, ordered=False, chunk_size=50))
+        self.assertEqual(len(result), len(set(result)))
+        self.assertEqual(set(result), set(Unique(self.items)))
+
+    def test_unpicklable_items_raise(self):
+        """Тест 3: Несериализуемый элемент - ошибка у вызывающего, а не зависание"""
+        f = lambda: 1
+        with self.assertRaises((pickle.PicklingError, AttributeError, TypeError)):
+            list(ParallelUnique([f, f, 2], workers=2))
+
+    def test_dead_worker_raises(self):
+        """Тест 4: Завершившийся процесс - RuntimeError; ordered=False отдаёт ответы живых частей"""
+        # Arrange: целые числа попадают в часть по своему значению, нечётные - в часть 1
+        unique = ParallelUnique([1, 2, 3, 4, 5, 3], workers=2, ordered=False)
+        process = unique._shards[0][0]
+        process.terminate()
+        process.join()
+
+        # Act
+        received = []
+        with self.assertRaises(RuntimeError):
+            for item in unique:
+                received.append(item)
+
+        # Assert
+        self.assertEqual(received, [1, 3, 5])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
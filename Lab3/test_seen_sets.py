@@ -0,0 +1,112 @@
+import unittest
+
+from .seen_sets import BloomFilter, SlidingWindowSet
+from .unique import Unique
+
+
+class FakeClock:
+    """Часы, которые двигает тест"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Тесты для фильтра Блума"""
+
+    def test_no_false_negatives_and_bounded_error(self):
+        """Тест 1: Добавленные элементы всегда найдены, ложных срабатываний около error_rate"""
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"вакансия {i}")
+
+        self.assertTrue(all(f"вакансия {i}" in bloom for i in range(5000)))
+        false_positives = sum(f"другая {i}" in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+    def test_size_does_not_grow(self):
+        """Тест 2: Размер фильтра не зависит от числа добавленных элементов"""
+        bloom = BloomFilter(capacity=100, error_rate=0.05)
+        size = len(bloom.bits)
+        for i in range(10000):
+            bloom.add(i)
+        self.assertEqual(len(bloom.bits), size)
+
+    def test_invalid_parameters(self):
+        """Дополнительный тест: некорректные параметры"""
+        for capacity, error_rate in ((0, 0.01), (10, 0), (10, 1)):
+            with self.subTest(capacity=capacity, error_rate=error_rate):
+                with self.assertRaises(ValueError):
+                    BloomFilter(capacity, error_rate)
+
+
+class TestSlidingWindowSet(unittest.TestCase):
+    """Тесты для множества последних элементов"""
+
+    def test_max_items_evicts_least_recent(self):
+        """Тест 3: При переполнении вытесняется элемент, который дольше всех не встречался"""
+        window = SlidingWindowSet(max_items=2)
+        window.add('a')
+        window.add('b')
+        self.assertIn('a', window)  # 'a' теперь новее, чем 'b'
+
+        window.add('c')
+
+        self.assertEqual(len(window), 2)
+        self.assertNotIn('b', window)
+        self.assertIn('a', window)
+        self.assertIn('c', window)
+
+    def test_max_age_expires_items(self):
+        """Тест 4: Элементы старше max_age забываются, проверка продлевает срок"""
+        # Arrange
+        clock = FakeClock()
+        window = SlidingWindowSet(max_age=10, clock=clock)
+        window.add('a')
+        window.add('b')
+
+        # Act
+        clock.now = 8
+        refreshed = 'a' in window
+        clock.now = 15
+
+        # Assert
+        self.assertTrue(refreshed)
+        self.assertIn('a', window)
+        self.assertNotIn('b', window)
+        self.assertEqual(len(window), 1)
+
+    def test_requires_a_limit(self):
+        """Дополнительный тест: без ограничений окно не создаётся"""
+        with self.assertRaises(ValueError):
+            SlidingWindowSet()
+
+
+class TestApproximateUnique(unittest.TestCase):
+    """Тесты для Unique в приближённых режимах"""
+
+    def setUp(self):
+        self.items = [i % 50 for i in range(1000)]
+
+    def test_bloom_mode(self):
+        """Тест 5: Без переполнения фильтра результат как в точном режиме"""
+        self.assertEqual(list(Unique(self.items, mode='bloom', capacity=1000, error_rate=0.001)),
+                         list(Unique(self.items)))
+
+    def test_window_mode_repeats_after_eviction(self):
+        """Тест 6: Элемент, вытесненный из окна, выдаётся снова"""
+        self.assertEqual(list(Unique(['a', 'b', 'a', 'c', 'd', 'a'], mode='window', window_size=2)),
+                         ['a', 'b', 'c', 'd', 'a'])
+        self.assertEqual(list(Unique(self.items, mode='window', window_size=50)), list(range(50)))
+
+    def test_unknown_mode(self):
+        """Дополнительный тест: неизвестный режим"""
+        with self.assertRaises(ValueError):
+            Unique([], mode='lru')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
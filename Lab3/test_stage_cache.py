@@ -0,0 +1,117 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from . import parallel_pipeline
+from .parallel_pipeline import run_stages
+from .stage_cache import StageCache, content_chunks, function_digest
+
+PREFIX = 'программист'
+SUFFIX = ' с опытом Python'
+
+
+def stage(names):
+    return sorted(set(names))
+
+
+def other_stage(names):
+    return sorted(set(names), reverse=True)
+
+
+class TestStageCache(unittest.TestCase):
+    """Тесты для кеша этапов по хешу содержимого"""
+
+    def setUp(self):
+        rng = random.Random(6)
+        self.names = [f"{rng.choice(['Программист', 'Водитель'])} {rng.randint(1, 10 ** 6)}" for _ in range(3000)]
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_insert_changes_only_nearby_chunks(self):
+        """Тест 1: Вставка строки меняет только порцию, в которую она попала"""
+        before = list(content_chunks(self.names, 50))
+        names = self.names[:1500] + ['Новая вакансия'] + self.names[1500:]
+
+        after = list(content_chunks(names, 50))
+
+        self.assertEqual(sum(before, []), self.names)
+        changed = [chunk for chunk in after if chunk not in before]
+        self.assertLessEqual(len(changed), 2)
+
+    def test_digest_follows_code_and_params(self):
+        """Тест 2: Хеш этапа меняется вместе с кодом функции и параметрами"""
+        self.assertEqual(function_digest(stage, 'a'), function_digest(stage, 'a'))
+        self.assertNotEqual(function_digest(stage, 'a'), function_digest(stage, 'b'))
+        self.assertNotEqual(function_digest(stage), function_digest(other_stage))
+
+    def test_changed_stage_or_corrupt_entry_is_a_miss(self):
+        """Тест 3: Записи другого этапа и испорченные файлы не используются"""
+        # Arrange
+        cache = StageCache(self.directory.name)
+        chunk = self.names[:10]
+        key = cache.key(chunk, function_digest(stage))
+        cache.put(key, stage(chunk))
+        corrupt = cache.key(chunk, 'corrupt')
+        with open(os.path.join(self.directory.name, corrupt + '.json'), 'w', encoding='utf-8') as f:
+            f.write('[1, 2')
+
+        # Act
+        hit = cache.get(key)
+        other = cache.get(cache.key(chunk, function_digest(other_stage)))
+        broken = cache.get(corrupt)
+
+        # Assert
+        self.assertEqual(hit, stage(chunk))
+        self.assertIsNone(other)
+        self.assertIsNone(broken)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_edited_input_recomputes_few_chunks(self):
+        """Тест 4: После правки входа пересчитываются немногие порции, итог как без кеша"""
+        run_stages(self.names, PREFIX, SUFFIX, workers=1, chunk_size=100, cache=StageCache(self.directory.name))
+        names = self.names[:]
+        names[1000] = 'Программист Python'
+
+        cache = StageCache(self.directory.name)
+        result = run_stages(names, PREFIX, SUFFIX, workers=1, chunk_size=100, cache=cache)
+
+        self.assertEqual(result, run_stages(names, PREFIX, SUFFIX, workers=1, chunk_size=100))
+        self.assertLessEqual(cache.misses, 2)
+        self.assertGreater(cache.hits, cache.misses)
+
+    def test_prune_keeps_only_current_run(self):
+        """Тест 5: prune удаляет записи прошлых запусков, не нужные текущему, и не трогает чужие файлы"""
+        # Arrange
+        run_stages(self.names, PREFIX, SUFFIX, workers=1, chunk_size=100, cache=StageCache(self.directory.name))
+        foreign = os.path.join(self.directory.name, 'заметки.json')
+        with open(foreign, 'w', encoding='utf-8') as f:
+            f.write('[]')
+        names = self.names[:2000]
+
+        # Act
+        cache = StageCache(self.directory.name)
+        run_stages(names, PREFIX, SUFFIX, workers=1, chunk_size=100, cache=cache)
+        removed = cache.prune()
+
+        # Assert
+        self.assertGreater(removed, 0)
+        self.assertTrue(os.path.exists(foreign))
+        again = StageCache(self.directory.name)
+        run_stages(names, PREFIX, SUFFIX, workers=1, chunk_size=100, cache=again)
+        self.assertEqual(again.misses, 0)
+        self.assertEqual(again.prune(), 0)
+
+    def test_single_worker_runs_without_pool(self):
+        """Дополнительный тест: при workers=1 пул процессов не создаётся"""
+        with mock.patch.object(parallel_pipeline, 'ProcessPoolExecutor', side_effect=AssertionError("создан пул")):
+            result = run_stages(self.names, PREFIX, SUFFIX, workers=1, chunk_size=100,
+                                cache=StageCache(self.directory.name))
+        self.assertEqual(result, run_stages(self.names, PREFIX, SUFFIX, workers=2, chunk_size=100))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,103 @@
+import random
+import unittest
+
+from .unique import Unique
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def batched(unique, chunks):
+    """Пропустить порции через unique_batch и склеить результат в один список"""
+    result = []
+    for chunk in chunks:
+        result.extend(unique.unique_batch(chunk))
+    return result
+
+
+class TestUniqueBatch(unittest.TestCase):
+    """Тесты для порционного удаления повторов"""
+
+    def test_lists_match_streaming(self):
+        """Тест 1: Порции списков дают то же, что поэлементный перебор"""
+        rng = random.Random(1)
+        items = [rng.choice('aAbBcCdD') + str(rng.randint(1, 30)) for _ in range(3000)]
+        chunks = [items[i:i + 250] for i in range(0, len(items), 250)]
+        for ignore_case in (False, True):
+            with self.subTest(ignore_case=ignore_case):
+                expected = list(Unique(items, ignore_case=ignore_case))
+                self.assertEqual(batched(Unique([], ignore_case=ignore_case), chunks), expected)
+                self.assertEqual(list(Unique([], ignore_case=ignore_case).iter_chunks(chunks)), expected)
+
+    def test_approximate_modes_match_streaming(self):
+        """Тест 2: В режимах bloom и window порции проверяются по одному элементу"""
+        items = [i % 7 for i in range(100)]
+        chunks = [items[i:i + 9] for i in range(0, len(items), 9)]
+        for kwargs in ({'mode': 'bloom', 'capacity': 100}, {'mode': 'window', 'window_size': 3}):
+            with self.subTest(**kwargs):
+                self.assertEqual(batched(Unique([], **kwargs), chunks), list(Unique(items, **kwargs)))
+
+
+@unittest.skipIf(np is None, "нужен numpy")
+class TestUniqueArrays(unittest.TestCase):
+    """Тесты для удаления повторов в массивах numpy"""
+
+    def assertArrayBatches(self, chunks, **kwargs):
+        """Результат по массивам совпадает с поэлементным перебором тех же массивов"""
+        expected = list(Unique((item for chunk in chunks for item in chunk), **kwargs))
+        result = batched(Unique([], **kwargs), chunks)
+        self.assertEqual(len(result), len(expected))
+        for got, want in zip(result, expected):
+            if want != want:
+                self.assertNotEqual(got, got)
+            else:
+                self.assertEqual(got, want)
+
+    def test_integer_arrays(self):
+        """Тест 3: Целочисленные массивы, малый и большой диапазон значений"""
+        rng = np.random.default_rng(2)
+        self.assertArrayBatches([rng.integers(0, 100, 500) for _ in range(6)])
+        self.assertArrayBatches([rng.integers(-2 ** 40, 2 ** 40, 500) for _ in range(4)])
+
+    def test_string_arrays_of_different_width(self):
+        """Тест 4: Строки разной длины и без учёта регистра"""
+        chunks = [np.array(['ab', 'C', 'ab']), np.array(['abcdef', 'c', 'AB']), np.array(['x', 'ABCDEF'])]
+        self.assertArrayBatches(chunks)
+        self.assertArrayBatches(chunks, ignore_case=True)
+
+    def test_lowercase_longer_than_width(self):
+        """Дополнительный тест: строка, удлиняющаяся в нижнем регистре, не обрезается"""
+        self.assertEqual(Unique([], ignore_case=True).unique_batch(np.array(['İ', 'A', 'a'])).tolist(),
+                         list(Unique(['İ', 'A', 'a'], ignore_case=True)))
+        self.assertArrayBatches([np.array(['İ', 'A', 'a']), np.array(['i̇', 'ab'])], ignore_case=True)
+
+    def test_int_and_float_are_not_mixed(self):
+        """Тест 5: Большое целое и близкое к нему дробное - разные элементы"""
+        # Arrange
+        unique = Unique([])
+        unique.unique_batch(np.array([2 ** 53 + 1]))
+
+        # Act
+        result = unique.unique_batch(np.array([float(2 ** 53)]))
+
+        # Assert
+        self.assertEqual(result.tolist(), [float(2 ** 53)])
+        # 2 ** 53 равно уже встреченному float(2 ** 53)
+        self.assertEqual(unique.unique_batch(np.array([2 ** 53 + 1, 2 ** 53, 7])).tolist(), [7])
+
+    def test_nan_is_never_a_repeat(self):
+        """Тест 6: Каждый NaN уникален, как при поэлементном переборе"""
+        chunks = [np.array([1.0, np.nan, np.nan, 1.0]), np.array([np.nan, 2.0, 1.0])]
+        self.assertArrayBatches(chunks)
+        self.assertEqual(len(batched(Unique([]), chunks)), 5)
+
+    def test_mixed_with_lists(self):
+        """Дополнительный тест: массивы и списки в одном потоке"""
+        chunks = [np.array([3, 1, 2]), [2, 4, 'a'], np.array([4, 5, 1]), np.array([0.5, 5.0])]
+        self.assertArrayBatches(chunks)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,11 +1,56 @@
 from .gen_random import gen_random
+from .seen_sets import BloomFilter, SlidingWindowSet
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Типы элементов множества, которые можно без потери точности сравнивать
+# с массивом numpy данного вида
+_ARRAY_ITEM_TYPES = {}
+if np is not None:
+    _ARRAY_ITEM_TYPES = {'i': (int, np.integer), 'u': (int, np.integer), 'f': (float, np.floating),
+                         'U': str, 'S': bytes}
+
+def _in_sorted(values, sorted_array):
+    """Маска: есть ли каждый элемент values в отсортированном массиве без повторов"""
+    if values.dtype.kind in 'iu' and sorted_array.dtype.kind in 'iu' and len(values):
+        low = min(values.min(), sorted_array[0])
+        high = max(values.max(), sorted_array[-1])
+        # Небольшой диапазон целых - таблица вместо двоичного поиска
+        if int(high) - int(low) <= 6 * (len(values) + len(sorted_array)):
+            return np.isin(values, sorted_array, kind='table')
+    pos = np.searchsorted(sorted_array, values)
+    pos[pos == len(sorted_array)] = 0
+    return sorted_array[pos] == values
 
 class Unique(object):
+    """Итератор по элементам без повторов.
+
+    mode='exact' (по умолчанию) помнит все встреченные элементы.
+    mode='bloom' - фильтр Блума фиксированного размера (capacity, error_rate):
+    память не растёт, но элемент изредка может быть ошибочно принят за повтор.
+    mode='window' - повторы ищутся только среди последних window_size элементов
+    и/или за последние window_seconds секунд.
+    """
+
     def __init__(self, items, **kwargs):
         self.items = iter(items)
         self.ignore_case = kwargs.get('ignore_case', False)
 
-        self.unique_items = set()
+        # Встреченные элементы отсортированным массивом numpy (см. unique_batch)
+        self._sorted_seen = None
+
+        mode = kwargs.get('mode', 'exact')
+        if mode == 'exact':
+            self.unique_items = set()
+        elif mode == 'bloom':
+            self.unique_items = BloomFilter(kwargs.get('capacity', 1000000), kwargs.get('error_rate', 0.01))
+        elif mode == 'window':
+            self.unique_items = SlidingWindowSet(kwargs.get('window_size'), kwargs.get('window_seconds'))
+        else:
+            raise ValueError(f"Неизвестный режим: {mode}")
 
     def __next__(self):
         while True:
@@ -19,6 +64,104 @@ class Unique(object):
     def __iter__(self):
         return self
 
+    def unique_batch(self, chunk):
+        """Вернуть ещё не встречавшиеся элементы порции в порядке первого появления.
+
+        Результат тот же, что у поэлементного перебора, но в точном режиме
+        повторы убираются для всей порции сразу: для массивов numpy - поиском
+        в отсортированном массиве встреченных и np.unique, для остальных -
+        dict.fromkeys и разностью множеств.
+        Для массива numpy возвращается массив numpy, иначе список.
+        """
+        seen = self.unique_items
+        if not isinstance(seen, set):
+            # Приближённые режимы зависят от порядка проверок - по одному элементу
+            result = []
+            for item in chunk:
+                item = item.lower() if self.ignore_case else item
+                if item not in seen:
+                    seen.add(item)
+                    result.append(item)
+            return result
+
+        if np is not None and isinstance(chunk, np.ndarray):
+            return self._unique_array(chunk)
+
+        if self.ignore_case:
+            chunk = [item.lower() for item in chunk]
+        first = dict.fromkeys(chunk)
+        new = first.keys() - seen
+        if 2 * len(new) < len(first):
+            first = [item for item in first if item in new]
+        elif len(new) < len(first):
+            for item in first.keys() - new:
+                del first[item]
+        seen.update(new)
+        return list(first)
+
+    def _seen_array(self, dtype):
+        """Встреченные элементы отсортированным массивом numpy или None,
+        если их нельзя сравнивать с массивом типа dtype"""
+        types = _ARRAY_ITEM_TYPES.get(dtype.kind)
+        if types is None:
+            return None
+        array = self._sorted_seen
+        # Числа сравниваются только в одном dtype: иначе приведение к общему
+        # типу (например, int64 и float64) теряет точность. Строки можно расширять.
+        same_type = array is not None and (array.dtype == dtype or array.dtype.kind == dtype.kind in 'US')
+        # Массив перестраивается, если множество пополнялось не через массивы
+        if not same_type or len(array) != len(self.unique_items):
+            if not all(isinstance(item, types) for item in self.unique_items):
+                return None
+            try:
+                array = np.array(list(self.unique_items),
+                                 dtype=dtype if dtype.kind in 'iuf' or not self.unique_items else None)
+            except (OverflowError, ValueError):
+                return None
+            array.sort()
+            self._sorted_seen = array
+        return array
+
+    def _unique_array(self, chunk):
+        chunk = chunk.ravel()
+        if self.ignore_case and chunk.dtype.kind in 'US':
+            # np.char.lower сохраняет ширину <U n и обрезает строки, которые при переводе
+            # в нижний регистр удлиняются ('İ' -> 'i̇'); str.lower не медленнее
+            chunk = np.array([item.lower() for item in chunk.tolist()], dtype=chunk.dtype.kind)
+        if chunk.dtype.kind in 'fc' and np.isnan(chunk).any():
+            # np.unique считает NaN одинаковыми, а поэлементный перебор - разными
+            return np.array(self.unique_batch(chunk.tolist()), dtype=chunk.dtype)
+
+        seen_array = self._seen_array(chunk.dtype)
+        if seen_array is not None and len(seen_array):
+            # Сначала отбрасываются уже встреченные: дальше сортируется только остаток
+            chunk = chunk[~_in_sorted(chunk, seen_array)]
+        try:
+            _, index = np.unique(chunk, return_index=True)
+        except TypeError:
+            # Несравнимые объекты - без сортировки
+            return np.array(self.unique_batch(chunk.tolist()), dtype=chunk.dtype)
+        new = chunk[np.sort(index)]
+
+        if seen_array is None:
+            values = new.tolist()
+            mask = np.fromiter((value not in self.unique_items for value in values), dtype=bool, count=len(values))
+            self.unique_items.update(values)
+            return new[mask]
+
+        new_sorted = np.sort(new)
+        if seen_array.dtype != new.dtype:
+            # Только строки разной длины: числа сюда приходят в том же dtype
+            seen_array = seen_array.astype(np.result_type(seen_array, new))
+        self._sorted_seen = np.insert(seen_array, np.searchsorted(seen_array, new_sorted), new_sorted)
+        self.unique_items.update(new.tolist())
+        return new
+
+    def iter_chunks(self, chunks):
+        """Перебрать уникальные элементы потока порций (тот же результат, что у __next__)"""
+        for chunk in chunks:
+            yield from self.unique_batch(chunk)
+
 if __name__ == '__main__':
     data = [1, 1, 1, 1, 1, 2, 2, 2, 2, 2]
     unique_data = Unique(data)
@@ -34,3 +177,6 @@ if __name__ == '__main__':
 
     unique_data_ignore_case = Unique(data, ignore_case=True)
     print(list(unique_data_ignore_case))
+
+    print(list(Unique(data, ignore_case=True, mode='bloom', capacity=100)))
+    print(list(Unique(['a', 'b', 'c', 'a', 'c', 'b'], mode='window', window_size=2)))
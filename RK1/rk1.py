@@ -1,5 +1,9 @@
+import argparse
+import csv
+import json
+import sys
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set, TextIO
 
 @dataclass
 class Library:
@@ -48,57 +52,142 @@ library_books = [
     LibraryBook(2, 1),
 ]
 
-print("Библиотеки:")
-for lib in libraries:
-    print(f"  {lib.id}. {lib.name}")
-
-print("Книги:")
-for book in books:
-    print(f"  {book.id}. '{book.title}' - {book.author} ({book.pages} стр.)")
-
-print("Связи книг с библиотеками:")
-for lb in library_books:
-    lib_name = next((lib.name for lib in libraries if lib.id == lb.library_id), "Неизвестно")
-    book_title = next((book.title for book in books if book.id == lb.book_id), "Неизвестно")
-    print(f"  Библиотека '{lib_name}' -> Книга '{book_title}'")
-
-print("ЗАПРОС 1: Книги, названия которых заканчиваются на 'А'")
-
-books_ending_with_a = [book for book in books if book.title.endswith('а')]
-for book in books_ending_with_a:
-    library_name = next((lib.name for lib in libraries if lib.id == book.library_id), "Неизвестная библиотека")
-    print(f"  '{book.title}' - {book.author} ({book.pages} стр.)")
-    print(f"    Находится в: {library_name}")
-
-print("ЗАПРОС 2: Библиотеки со средним количеством страниц в книгах")
-
-library_avg_pages = []
-for library in libraries:
-    library_books_list = [book for book in books if book.library_id == library.id]
-    if library_books_list:
-        total_pages = sum(book.pages for book in library_books_list)
-        avg_pages = total_pages / len(library_books_list)
-        library_avg_pages.append((library.name, avg_pages, len(library_books_list)))
-
-library_avg_pages_sorted = sorted(library_avg_pages, key=lambda x: x[1])
-
-for lib_name, avg_pages, book_count in library_avg_pages_sorted:
-    print(f"  {lib_name}:")
-    print(f"    Среднее количество страниц: {avg_pages:.1f}")
-    print(f"    Количество книг: {book_count}")
-
-print("ЗАПРОС 3: Библиотеки с названием на 'А' и их книги")
-
-libraries_starting_with_a = [lib for lib in libraries if lib.name.startswith('А')]
-
-for library in libraries_starting_with_a:
-    print(f"\n  Библиотека: {library.name}")
-
-    library_book_ids = [lb.book_id for lb in library_books if lb.library_id == library.id]
-    library_books_list = [book for book in books if book.id in library_book_ids]
-
-    if library_books_list:
-        for book in library_books_list:
-            print(f"    - '{book.title}' - {book.author} ({book.pages} стр.)")
-    else:
-        print("    В этой библиотеке пока нет книг")
+CSV_COLUMNS = ["section", "library_id", "library_name", "book_id", "title", "author", "pages"]
+
+
+class BufferedLineWriter:
+    """Копит строки и пишет их в файл крупными блоками вместо print на каждую строку"""
+
+    def __init__(self, out: TextIO, buffer_size: int = 1 << 16):
+        self.out = out
+        self.buffer_size = buffer_size
+        self._lines: List[str] = []
+        self._size = 0
+
+    def write_line(self, line: str):
+        self._lines.append(line)
+        self._size += len(line) + 1
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self.out.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+            self._size = 0
+
+
+def render_report(libraries: List[Library], books: List[Book], library_books: Iterable[LibraryBook],
+                  out: TextIO, csv_out: Optional[TextIO] = None, jsonl_out: Optional[TextIO] = None):
+    """Вывести данные и результаты запросов в out блоками по мере формирования.
+
+    Дополнительно можно в том же проходе записать библиотеки, книги и связи в CSV и/или JSONL.
+    """
+    writer = BufferedLineWriter(out)
+    csv_writer = csv.writer(csv_out, lineterminator="\n") if csv_out is not None else None
+    jsonl_writer = BufferedLineWriter(jsonl_out) if jsonl_out is not None else None
+    if csv_writer:
+        csv_writer.writerow(CSV_COLUMNS)
+
+    def emit(record: Dict[str, object]):
+        if csv_writer:
+            csv_writer.writerow([record.get(column, "") for column in CSV_COLUMNS])
+        if jsonl_writer:
+            jsonl_writer.write_line(json.dumps(record, ensure_ascii=False))
+
+    # Словари для поиска по ID вместо перебора списков (при повторе ID берётся первая запись)
+    library_names: Dict[int, str] = {}
+    writer.write_line("Библиотеки:")
+    for lib in libraries:
+        library_names.setdefault(lib.id, lib.name)
+        writer.write_line(f"  {lib.id}. {lib.name}")
+        emit({"section": "library", "library_id": lib.id, "library_name": lib.name})
+
+    book_titles: Dict[int, str] = {}
+    writer.write_line("Книги:")
+    for book in books:
+        book_titles.setdefault(book.id, book.title)
+        writer.write_line(f"  {book.id}. '{book.title}' - {book.author} ({book.pages} стр.)")
+        emit({"section": "book", "book_id": book.id, "title": book.title,
+              "author": book.author, "pages": book.pages, "library_id": book.library_id})
+
+    # book_id -> ID библиотек, где есть книга; собирается в том же проходе по связям
+    library_ids_by_book: Dict[int, Set[int]] = {}
+    writer.write_line("Связи книг с библиотеками:")
+    for lb in library_books:
+        library_ids_by_book.setdefault(lb.book_id, set()).add(lb.library_id)
+        lib_name = library_names.get(lb.library_id, "Неизвестно")
+        book_title = book_titles.get(lb.book_id, "Неизвестно")
+        writer.write_line(f"  Библиотека '{lib_name}' -> Книга '{book_title}'")
+        emit({"section": "relation", "library_id": lb.library_id, "library_name": lib_name,
+              "book_id": lb.book_id, "title": book_title})
+
+    writer.write_line("ЗАПРОС 1: Книги, названия которых заканчиваются на 'А'")
+    for book in books:
+        if book.title.endswith('а'):
+            library_name = library_names.get(book.library_id, "Неизвестная библиотека")
+            writer.write_line(f"  '{book.title}' - {book.author} ({book.pages} стр.)")
+            writer.write_line(f"    Находится в: {library_name}")
+
+    writer.write_line("ЗАПРОС 2: Библиотеки со средним количеством страниц в книгах")
+    # library_id -> [сумма страниц, количество книг]
+    page_totals: Dict[int, List[int]] = {}
+    for book in books:
+        totals = page_totals.setdefault(book.library_id, [0, 0])
+        totals[0] += book.pages
+        totals[1] += 1
+
+    library_avg_pages = []
+    for library in libraries:
+        totals = page_totals.get(library.id)
+        if totals:
+            library_avg_pages.append((library.name, totals[0] / totals[1], totals[1]))
+
+    for lib_name, avg_pages, book_count in sorted(library_avg_pages, key=lambda x: x[1]):
+        writer.write_line(f"  {lib_name}:")
+        writer.write_line(f"    Среднее количество страниц: {avg_pages:.1f}")
+        writer.write_line(f"    Количество книг: {book_count}")
+
+    writer.write_line("ЗАПРОС 3: Библиотеки с названием на 'А' и их книги")
+    libraries_starting_with_a = [lib for lib in libraries if lib.name.startswith('А')]
+
+    # Книги раскладываются по библиотекам за один проход по books, порядок книг сохраняется
+    books_by_library: Dict[int, List[Book]] = {lib.id: [] for lib in libraries_starting_with_a}
+    for book in books:
+        for library_id in library_ids_by_book.get(book.id, ()):
+            library_books_list = books_by_library.get(library_id)
+            if library_books_list is not None:
+                library_books_list.append(book)
+
+    for library in libraries_starting_with_a:
+        writer.write_line(f"\n  Библиотека: {library.name}")
+        library_books_list = books_by_library[library.id]
+        if library_books_list:
+            for book in library_books_list:
+                writer.write_line(f"    - '{book.title}' - {book.author} ({book.pages} стр.)")
+        else:
+            writer.write_line("    В этой библиотеке пока нет книг")
+
+    writer.flush()
+    if jsonl_writer:
+        jsonl_writer.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Отчёт по библиотекам и книгам")
+    parser.add_argument("--csv", help="дополнительно записать данные в CSV-файл")
+    parser.add_argument("--jsonl", help="дополнительно записать данные в JSONL-файл")
+    args = parser.parse_args()
+
+    csv_out = open(args.csv, "w", encoding="utf-8", newline="") if args.csv else None
+    jsonl_out = open(args.jsonl, "w", encoding="utf-8") if args.jsonl else None
+    try:
+        render_report(libraries, books, library_books, sys.stdout, csv_out, jsonl_out)
+    finally:
+        for f in (csv_out, jsonl_out):
+            if f is not None:
+                f.close()
+
+
+if __name__ == "__main__":
+    main()
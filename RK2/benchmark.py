@@ -0,0 +1,182 @@
+"""Замеры скорости и памяти LibrarySystem на синтетических данных.
+
+Запуск:
+    python benchmark.py --sizes 1000 10000 --save-baseline baseline.json
+    python benchmark.py --sizes 1000 10000 --baseline baseline.json --threshold 0.2
+    python benchmark.py --sizes 1000000 --workers 1 2 4
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Tuple
+
+from bitmap import BitmapRelationStore
+from library_system import Library, Book, LibraryBook, LibrarySystem, RelationList
+
+LIBRARY_PREFIXES = ["Академическая", "Абонемент", "Городская", "Районная", "Научная"]
+TITLE_WORDS = ["война", "мир", "анна", "каренина", "мастер", "маргарита", "физика", "химия", "история"]
+AUTHORS = ["Л. Толстой", "А. Пушкин", "М. Булгаков", "Ф. Достоевский", "А. Эйнштейн", "Д. Менделеев"]
+
+# {размер: {запрос: секунды, "peak_memory": байты}}
+Results = Dict[str, Dict[str, float]]
+
+
+def generate_data(n_books: int, seed: int = 0) -> Tuple[List[Library], List[Book], List[LibraryBook]]:
+    """Детерминированно сгенерировать библиотеки, книги и связи для n_books книг"""
+    rng = random.Random(seed)
+    n_libraries = max(1, n_books // 100)
+
+    libraries = [Library(i, f"{LIBRARY_PREFIXES[i % len(LIBRARY_PREFIXES)]} библиотека {i}")
+                 for i in range(1, n_libraries + 1)]
+    books = []
+    for i in range(1, n_books + 1):
+        title = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 3))).capitalize()
+        books.append(Book(i, title, rng.choice(AUTHORS), rng.randint(50, 1500), rng.randint(1, n_libraries)))
+
+    # Каждая книга в своей библиотеке и в среднем ещё в половине случаев в другой
+    library_books = [LibraryBook(book.library_id, book.id) for book in books]
+    library_books += [LibraryBook(rng.randint(1, n_libraries), rng.randint(1, n_books))
+                      for _ in range(n_books // 2)]
+    return libraries, books, library_books
+
+
+def _timed(func: Callable[[], object], repeat: int) -> float:
+    """Лучшее время из repeat запусков"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(n_books: int, repeat: int = 3, seed: int = 0) -> Dict[str, float]:
+    """Замерить все публичные запросы на данных размера n_books"""
+    libraries, books, library_books = generate_data(n_books, seed)
+    rng = random.Random(seed)
+    library_ids = [rng.choice(libraries).id for _ in range(100)]
+    book_ids = [rng.choice(books).id for _ in range(100)]
+
+    start = time.perf_counter()
+    # Кэш отключён, чтобы мерить сами запросы
+    system = LibrarySystem(libraries, books, library_books, cache_size=0)
+    results = {"build": time.perf_counter() - start}
+
+    def print_all_data():
+        with redirect_stdout(io.StringIO()):
+            system.print_all_data()
+
+    queries = {
+        "get_books_ending_with_a": system.get_books_ending_with_a,
+        "get_library_avg_pages": system.get_library_avg_pages,
+        "get_libraries_starting_with_a_with_books": system.get_libraries_starting_with_a_with_books,
+        "_get_books_by_library": lambda: [system._get_books_by_library(i) for i in library_ids],
+        "get_library_by_id": lambda: [system.get_library_by_id(i) for i in library_ids],
+        "get_book_by_id": lambda: [system.get_book_by_id(i) for i in book_ids],
+        "print_all_data": print_all_data,
+    }
+    for name, query in queries.items():
+        results[name] = _timed(query, repeat)
+
+    # Память меряется отдельным проходом: tracemalloc сильно замедляет код
+    del system, queries
+    tracemalloc.start()
+    system = LibrarySystem(libraries, books, library_books, cache_size=0)
+    system.get_library_avg_pages()
+    system.get_libraries_starting_with_a_with_books()
+    results["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # Байт на связь: столбцы связей с битовыми картами против списка объектов LibraryBook
+    pairs = [(lb.library_id, lb.book_id) for lb in library_books]
+    del system
+    tracemalloc.start()
+    relations, store = RelationList(library_books), BitmapRelationStore()
+    for library_id, book_id in pairs:
+        store.add(library_id, book_id)
+    store.compact()
+    results["relation_bytes"] = tracemalloc.get_traced_memory()[0] / max(1, len(pairs))
+    del relations, store
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    objects = [LibraryBook(library_id, book_id) for library_id, book_id in pairs]
+    results["library_book_bytes"] = (tracemalloc.get_traced_memory()[0] - start_memory) / max(1, len(pairs))
+    tracemalloc.stop()
+    del objects
+    return results
+
+
+def run_parallel_benchmark(n_books: int, workers: List[int], repeat: int = 3, seed: int = 0) -> Dict[str, float]:
+    """Замерить расчёт агрегатов страниц: столбцовый в одном процессе и в пуле из N процессов"""
+    # Импорт здесь: пул процессов и numpy нужны только для этого замера
+    from columnar_store import ColumnarLibrarySystem
+    from parallel import ParallelLibraryQueries
+
+    libraries, books, library_books = generate_data(n_books, seed)
+    system = LibrarySystem(libraries, books, library_books, cache_size=0)
+    results = {"serial_page_stats": _timed(ColumnarLibrarySystem(libraries, books, library_books)
+                                           .get_library_page_stats, repeat)}
+    for n in workers:
+        with ParallelLibraryQueries(system, n) as queries:
+            queries.library_page_stats()  # запуск процессов пула не входит в замер
+            results[f"parallel_page_stats_{n}"] = _timed(queries.library_page_stats, repeat)
+    return results
+
+
+def find_regressions(results: Results, baseline: Results, threshold: float) -> List[str]:
+    """Найти замеры, которые хуже базовых более чем на threshold (доля)"""
+    regressions = []
+    for size, metrics in results.items():
+        for name, value in metrics.items():
+            base = baseline.get(size, {}).get(name)
+            if base and value > base * (1 + threshold):
+                regressions.append(f"{size} {name}: {value:.6g} против {base:.6g}")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры LibrarySystem")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 3, 10 ** 4, 10 ** 5],
+                        help="количество книг, например 1000 ... 10000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="JSON с базовыми замерами для сравнения")
+    parser.add_argument("--save-baseline", help="сохранить замеры в JSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимое ухудшение, доля от базового значения")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="замерить агрегаты страниц в пуле из указанного числа процессов")
+    args = parser.parse_args(argv)
+
+    results: Results = {}
+    for size in args.sizes:
+        if args.workers:
+            results[str(size)] = run_parallel_benchmark(size, args.workers, args.repeat, args.seed)
+        else:
+            results[str(size)] = run_benchmark(size, args.repeat, args.seed)
+        print(f"{size}:")
+        for name, value in results[str(size)].items():
+            print(f"  {name}: {value:.6g}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        if regressions:
+            print("\nУхудшения:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
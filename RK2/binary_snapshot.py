@@ -0,0 +1,268 @@
+"""Двоичный снимок данных LibrarySystem с фиксированной раскладкой для mmap.
+
+Файл: заголовок, затем секции массивов int64 в фиксированном порядке и в конце
+UTF-8 данные строк. Строки хранятся один раз, записи ссылаются на них номером
+в таблице смещений. Размеры секций вычисляются по числам из заголовка.
+
+    libraries        n_libraries x (id, name_ref)
+    library_index    n_libraries ID по возрастанию, затем n_libraries номеров записей
+    books            n_books x (id, title_ref, author_ref, pages, library_id)
+    book_index       n_books ID по возрастанию, затем n_books номеров записей
+    library_books    n_relations x (library_id, book_id)
+    relation_index   n_relations library_id по возрастанию, затем n_relations book_id
+    string_offsets   n_strings + 1 смещений в string_data
+    string_data      UTF-8
+"""
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from library_system import Library, Book, LibraryBook, LibrarySystem
+from report import render_all_data
+
+MAGIC = b'LIBSNAP\0'
+FORMAT_VERSION = 1
+# magic, версия, порядок байт (0 - little, 1 - big), резерв, n_libraries, n_books, n_relations, n_strings
+HEADER = struct.Struct('<8sIBxxxQQQQ')
+_ITEM_SIZE = 8
+
+
+class _StringTableWriter:
+    def __init__(self):
+        self.refs: Dict[str, int] = {}
+        self.offsets = array('q', [0])
+        self.data = bytearray()
+
+    def add(self, value: str) -> int:
+        ref = self.refs.get(value)
+        if ref is None:
+            ref = self.refs[value] = len(self.refs)
+            self.data += value.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return ref
+
+
+def _sorted_index(keys: Sequence[int]) -> array:
+    """Ключи по возрастанию и номера соответствующих записей (устойчивая сортировка)"""
+    rows = sorted(range(len(keys)), key=keys.__getitem__)
+    return array('q', (keys[row] for row in rows)) + array('q', rows)
+
+
+def save_snapshot(path: str, libraries: Iterable[Library], books: Iterable[Book],
+                  library_books: Iterable[LibraryBook]):
+    """Сохранить библиотеки, книги и связи в двоичный снимок"""
+    strings = _StringTableWriter()
+    library_rows, book_rows, relation_rows = array('q'), array('q'), array('q')
+    for lib in libraries:
+        library_rows.extend((lib.id, strings.add(lib.name)))
+    for book in books:
+        book_rows.extend((book.id, strings.add(book.title), strings.add(book.author), book.pages, book.library_id))
+    for lb in library_books:
+        relation_rows.extend((lb.library_id, lb.book_id))
+
+    relation_index = _sorted_index(relation_rows[::2])
+    n_relations = len(relation_rows) // 2
+    # Вместо номеров записей связей храним сразу book_id в порядке library_id
+    relation_index[n_relations:] = array('q', (relation_rows[2 * row + 1] for row in relation_index[n_relations:]))
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0 if sys.byteorder == 'little' else 1,
+                         len(library_rows) // 2, len(book_rows) // 5, n_relations, len(strings.refs))
+    with open(path, 'wb') as f:
+        f.write(header)
+        for section in (library_rows, _sorted_index(library_rows[::2]),
+                        book_rows, _sorted_index(book_rows[::5]),
+                        relation_rows, relation_index, strings.offsets):
+            f.write(section.tobytes())
+        f.write(strings.data)
+
+
+class _LazyRecords(Sequence):
+    """Последовательность записей, создающая объекты только при обращении"""
+
+    def __init__(self, make, count: int):
+        self._make = make
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self._make(i) for i in range(*row.indices(self._count))]
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return self._make(row)
+
+
+class MappedLibrarySystem:
+    """Данные LibrarySystem, отображённые из двоичного снимка через mmap.
+
+    Открытие файла не читает записи: объекты создаются при обращении, а страницы
+    файла разделяются между всеми процессами, открывшими тот же снимок.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{path}: это не снимок LibrarySystem")
+        magic, version, byteorder, n_libraries, n_books, n_relations, n_strings = \
+            HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path}: это не снимок LibrarySystem")
+        if version != FORMAT_VERSION or byteorder != (0 if sys.byteorder == 'little' else 1):
+            self._mmap.close()
+            raise ValueError(f"{path}: неподдерживаемая версия {version} или порядок байт снимка")
+
+        self.n_libraries, self.n_books, self.n_relations = n_libraries, n_books, n_relations
+        self._views: List[memoryview] = []
+        offset = HEADER.size
+        sections = {}
+        for name, length in (('libraries', 2 * n_libraries), ('library_index', 2 * n_libraries),
+                             ('books', 5 * n_books), ('book_index', 2 * n_books),
+                             ('library_books', 2 * n_relations), ('relation_index', 2 * n_relations),
+                             ('string_offsets', n_strings + 1)):
+            if offset + length * _ITEM_SIZE > len(self._mmap):
+                self.close()
+                raise ValueError(f"{path}: снимок обрезан, секция {name} не помещается в файл")
+            sections[name] = self._view(offset, length)
+            offset += length * _ITEM_SIZE
+        self._data_offset = offset
+        # Строки занимают остаток файла целиком: иначе файл обрезан или дописан
+        string_offsets = sections['string_offsets']
+        if string_offsets[0] != 0 or len(self._mmap) != self._data_offset + string_offsets[-1]:
+            self.close()
+            raise ValueError(f"{path}: размер снимка не совпадает с заголовком")
+
+        self._libraries = sections['libraries']
+        self._library_ids, self._library_rows = self._split(sections['library_index'], n_libraries)
+        self._books = sections['books']
+        self._book_ids, self._book_rows = self._split(sections['book_index'], n_books)
+        self._relations = sections['library_books']
+        self._relation_library_ids, self._relation_book_ids = self._split(sections['relation_index'], n_relations)
+        self._string_offsets = sections['string_offsets']
+
+        self.libraries = _LazyRecords(self._library, n_libraries)
+        self.books = _LazyRecords(self._book, n_books)
+        self.library_books = _LazyRecords(self._relation, n_relations)
+
+    def _view(self, offset: int, length: int) -> memoryview:
+        view = memoryview(self._mmap)[offset:offset + length * _ITEM_SIZE].cast('q')
+        self._views.append(view)
+        return view
+
+    def _split(self, view: memoryview, n: int) -> Tuple[memoryview, memoryview]:
+        first, second = view[:n], view[n:]
+        self._views.extend((first, second))
+        return first, second
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _string(self, ref: int) -> str:
+        start = self._data_offset + self._string_offsets[ref]
+        end = self._data_offset + self._string_offsets[ref + 1]
+        return self._mmap[start:end].decode('utf-8')
+
+    def _library(self, row: int) -> Library:
+        return Library(self._libraries[2 * row], self._string(self._libraries[2 * row + 1]))
+
+    def _book(self, row: int) -> Book:
+        b = 5 * row
+        return Book(self._books[b], self._string(self._books[b + 1]), self._string(self._books[b + 2]),
+                    self._books[b + 3], self._books[b + 4])
+
+    def _relation(self, row: int) -> LibraryBook:
+        return LibraryBook(self._relations[2 * row], self._relations[2 * row + 1])
+
+    @staticmethod
+    def _find_row(ids: memoryview, rows: memoryview, item_id: int) -> Optional[int]:
+        # При повторе ID возвращается первая запись, как в индексах LibrarySystem
+        pos = bisect_left(ids, item_id)
+        if pos < len(ids) and ids[pos] == item_id:
+            return rows[pos]
+        return None
+
+    def get_all_libraries(self) -> Sequence[Library]:
+        """Получить список всех библиотек"""
+        return self.libraries
+
+    def get_all_books(self) -> Sequence[Book]:
+        """Получить список всех книг"""
+        return self.books
+
+    def get_library_books_relations(self) -> Sequence[LibraryBook]:
+        """Получить все связи библиотек с книгами"""
+        return self.library_books
+
+    def get_library_by_id(self, library_id: int) -> Optional[Library]:
+        """Получить библиотеку по ID"""
+        row = self._find_row(self._library_ids, self._library_rows, library_id)
+        return self._library(row) if row is not None else None
+
+    def get_book_by_id(self, book_id: int) -> Optional[Book]:
+        """Получить книгу по ID"""
+        row = self._find_row(self._book_ids, self._book_rows, book_id)
+        return self._book(row) if row is not None else None
+
+    def _book_rows_by_library(self, library_id: int) -> List[int]:
+        lo = bisect_left(self._relation_library_ids, library_id)
+        hi = bisect_right(self._relation_library_ids, library_id)
+        rows = {self._find_row(self._book_ids, self._book_rows, self._relation_book_ids[i]) for i in range(lo, hi)}
+        rows.discard(None)
+        return sorted(rows)
+
+    def _get_books_by_library(self, library_id: int) -> List[Book]:
+        """Вспомогательный метод: получить книги по ID библиотеки"""
+        return [self._book(row) for row in self._book_rows_by_library(library_id)]
+
+    def get_books_ending_with_a(self) -> List[Book]:
+        """Найти книги, названия которых заканчиваются на 'А'"""
+        return [self._book(row) for row in range(self.n_books)
+                if self._string(self._books[5 * row + 1]).endswith('а')]
+
+    def _unique_libraries(self) -> List[Library]:
+        return [self._library(row) for row in range(self.n_libraries)
+                if self._find_row(self._library_ids, self._library_rows, self._libraries[2 * row]) == row]
+
+    def get_library_avg_pages(self) -> List[Tuple[str, float, int]]:
+        """Рассчитать среднее количество страниц в книгах по библиотекам"""
+        result = []
+        for library in self._unique_libraries():
+            rows = self._book_rows_by_library(library.id)
+            if rows:
+                total_pages = sum(self._books[5 * row + 3] for row in rows)
+                result.append((library.name, total_pages / len(rows), len(rows)))
+
+        # Сортировка по среднему количеству страниц
+        return sorted(result, key=lambda x: x[1])
+
+    def get_libraries_starting_with_a_with_books(self) -> List[Tuple[Library, List[Book]]]:
+        """Найти библиотеки с названием на 'А' и их книги"""
+        return [(library, self._get_books_by_library(library.id))
+                for library in self._unique_libraries() if library.name.startswith('А')]
+
+    def print_all_data(self, out: Optional[TextIO] = None):
+        """Вывести все данные"""
+        render_all_data(self.libraries, self.books, self.library_books,
+                        out if out is not None else sys.stdout)
+
+    def to_library_system(self, cache_size: int = 128) -> LibrarySystem:
+        """Загрузить все записи в обычный LibrarySystem"""
+        return LibrarySystem(list(self.libraries), list(self.books), list(self.library_books), cache_size)
@@ -0,0 +1,317 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+# Контейнер хранит 2**16 значений с общими старшими битами:
+# разреженный - отсортированный array('H'), плотный - битовая маска в int
+Container = Union[array, int]
+
+_CHUNK_BITS = 16
+_LOW_MASK = (1 << _CHUNK_BITS) - 1
+# Больше этого числа элементов битовая маска (8 КБ) компактнее массива
+_ARRAY_LIMIT = 4096
+
+
+def _to_int(container: Container) -> int:
+    if isinstance(container, int):
+        return container
+    bits = bytearray(1 << (_CHUNK_BITS - 3))
+    for low in container:
+        bits[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _to_array(container: Container) -> array:
+    if isinstance(container, array):
+        return container
+    return array('H', [i for i, bit in enumerate(reversed(bin(container)[2:])) if bit == '1'])
+
+
+def _size(container: Container) -> int:
+    return container.bit_count() if isinstance(container, int) else len(container)
+
+
+def _normalize(container: Container) -> Container:
+    """Выбрать более компактное представление контейнера"""
+    size = _size(container)
+    if size > _ARRAY_LIMIT:
+        return _to_int(container)
+    return _to_array(container)
+
+
+class RoaringBitmap:
+    """Сжатое множество неотрицательных целых в духе Roaring bitmap"""
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._containers: Dict[int, Container] = {}
+        for value in values:
+            self.add(value)
+
+    @staticmethod
+    def _split(value: int):
+        if value < 0:
+            raise ValueError(f"RoaringBitmap хранит только неотрицательные числа: {value}")
+        return value >> _CHUNK_BITS, value & _LOW_MASK
+
+    def add(self, value: int):
+        high, low = self._split(value)
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = array('H', [low])
+        elif isinstance(container, int):
+            self._containers[high] = container | (1 << low)
+        else:
+            i = bisect_left(container, low)
+            if i == len(container) or container[i] != low:
+                container.insert(i, low)
+                if len(container) > _ARRAY_LIMIT:
+                    self._containers[high] = _to_int(container)
+
+    def discard(self, value: int):
+        high, low = self._split(value)
+        container = self._containers.get(high)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container &= ~(1 << low)
+            self._containers[high] = _normalize(container)
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                del container[i]
+        if not _size(self._containers[high]):
+            del self._containers[high]
+
+    def __contains__(self, value: int) -> bool:
+        if value < 0:
+            return False
+        high, low = self._split(value)
+        container = self._containers.get(high)
+        if container is None:
+            return False
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    def __len__(self) -> int:
+        return sum(_size(container) for container in self._containers.values())
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._containers):
+            base = high << _CHUNK_BITS
+            for low in _to_array(self._containers[high]):
+                yield base | low
+
+    def __and__(self, other: 'RoaringBitmap') -> 'RoaringBitmap':
+        result = RoaringBitmap()
+        for high in self._containers.keys() & other._containers.keys():
+            a, b = self._containers[high], other._containers[high]
+            if isinstance(a, int) and isinstance(b, int):
+                container = _normalize(a & b)
+            else:
+                if isinstance(a, int):
+                    a, b = b, a
+                # a - разреженный массив, проверяем его элементы во втором контейнере
+                if isinstance(b, int):
+                    container = array('H', [low for low in a if b >> low & 1])
+                else:
+                    container = array('H', sorted(set(a).intersection(b)))
+            if _size(container):
+                result._containers[high] = container
+        return result
+
+    def __or__(self, other: 'RoaringBitmap') -> 'RoaringBitmap':
+        result = RoaringBitmap()
+        for high in self._containers.keys() | other._containers.keys():
+            a, b = self._containers.get(high), other._containers.get(high)
+            if a is None or b is None:
+                container = a if b is None else b
+                result._containers[high] = container if isinstance(container, int) else array('H', container)
+            elif isinstance(a, array) and isinstance(b, array):
+                result._containers[high] = _normalize(array('H', sorted(set(a).union(b))))
+            else:
+                result._containers[high] = _to_int(a) | _to_int(b)
+        return result
+
+    def copy(self) -> 'RoaringBitmap':
+        result = RoaringBitmap()
+        result._containers = {high: container if isinstance(container, int) else array('H', container)
+                              for high, container in self._containers.items()}
+        return result
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RoaringBitmap) and list(self) == list(other)
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+
+# Библиотеки одной книги в дельте обратной карты: одна - просто число, несколько -
+# отсортированный array('q'). Значения не изменяются на месте, а заменяются
+BookLibraries = Union[int, array]
+
+# Дельта обратной карты вливается в столбцы, когда становится больше их (но не меньше этого)
+_COMPACT_MIN = 1 << 14
+
+
+def _with_library(libraries: Optional[BookLibraries], library_id: int) -> BookLibraries:
+    if libraries is None:
+        return library_id
+    if isinstance(libraries, int):
+        return array('q', sorted((libraries, library_id)))
+    i = bisect_left(libraries, library_id)
+    return libraries[:i] + array('q', [library_id]) + libraries[i:]
+
+
+def _without_library(libraries: BookLibraries, library_id: int) -> Optional[BookLibraries]:
+    if isinstance(libraries, int):
+        return None
+    i = bisect_left(libraries, library_id)
+    rest = libraries[:i] + libraries[i + 1:]
+    return rest[0] if len(rest) == 1 else rest
+
+
+def _as_sequence(libraries: Optional[BookLibraries]) -> Sequence[int]:
+    if libraries is None:
+        return ()
+    return (libraries,) if isinstance(libraries, int) else libraries
+
+
+class BitmapRelationStore:
+    """Связи библиотек с книгами: битовая карта книг на библиотеку и обратная карта.
+
+    Обратная карта (книга -> библиотеки) - пары (book_id, library_id) по
+    возрастанию в двух столбцах array('q'), около 16 байт на связь. Изменения
+    копятся в небольшой дельте (добавленные пары и удалённые из столбцов) и
+    вливаются в столбцы, когда дельта перерастает их: каждое вливание удваивает
+    столбцы, поэтому на связь приходится O(1) перезаписей.
+    """
+
+    def __init__(self):
+        self._books_by_library: Dict[int, RoaringBitmap] = {}
+        # Столбцы обратной карты не изменяются на месте, а заменяются: их можно делить между копиями
+        self._reverse_books = array('q')
+        self._reverse_libraries = array('q')
+        self._added: Dict[int, BookLibraries] = {}
+        self._removed: Set[Tuple[int, int]] = set()
+        self._delta_size = 0
+        # После copy() битовые карты общие с копией: перед изменением карта копируется (copy-on-write)
+        self._shared = False
+        self._owned: Set[int] = set()
+
+    def copy(self) -> 'BitmapRelationStore':
+        """Копия, разделяющая неизменённые битовые карты и столбцы с исходным хранилищем"""
+        result = BitmapRelationStore()
+        result._books_by_library = dict(self._books_by_library)
+        result._reverse_books = self._reverse_books
+        result._reverse_libraries = self._reverse_libraries
+        result._added = dict(self._added)
+        result._removed = set(self._removed)
+        result._delta_size = self._delta_size
+        result._shared = self._shared = True
+        self._owned = set()
+        return result
+
+    def _bitmap_for_update(self, library_id: int) -> RoaringBitmap:
+        bitmap = self._books_by_library.get(library_id)
+        if bitmap is None:
+            bitmap = self._books_by_library[library_id] = RoaringBitmap()
+        elif self._shared and library_id not in self._owned:
+            bitmap = self._books_by_library[library_id] = bitmap.copy()
+        else:
+            return bitmap
+        if self._shared:
+            self._owned.add(library_id)
+        return bitmap
+
+    def add(self, library_id: int, book_id: int) -> bool:
+        """Добавить связь; False, если она уже была"""
+        bitmap = self._books_by_library.get(library_id)
+        if bitmap is not None and book_id in bitmap:
+            return False
+        self._bitmap_for_update(library_id).add(book_id)
+        if (book_id, library_id) in self._removed:
+            self._removed.discard((book_id, library_id))
+            self._delta_size -= 1
+        else:
+            self._added[book_id] = _with_library(self._added.get(book_id), library_id)
+            self._delta_size += 1
+            self._compact_if_needed()
+        return True
+
+    def remove(self, library_id: int, book_id: int):
+        bitmap = self._books_by_library.get(library_id)
+        if bitmap is None or book_id not in bitmap:
+            return
+        bitmap = self._bitmap_for_update(library_id)
+        bitmap.discard(book_id)
+        if not len(bitmap):
+            del self._books_by_library[library_id]
+
+        added = self._added.get(book_id)
+        if library_id in _as_sequence(added):
+            rest = _without_library(added, library_id)
+            if rest is None:
+                del self._added[book_id]
+            else:
+                self._added[book_id] = rest
+            self._delta_size -= 1
+        else:
+            self._removed.add((book_id, library_id))
+            self._delta_size += 1
+            self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self._delta_size > max(_COMPACT_MIN, len(self._reverse_books)):
+            self.compact()
+
+    def compact(self):
+        """Влить дельту обратной карты в отсортированные столбцы"""
+        if not self._delta_size:
+            return
+        base = zip(self._reverse_books, self._reverse_libraries)
+        if self._removed:
+            removed = self._removed
+            base = (pair for pair in base if pair not in removed)
+        added = sorted((book_id, library_id) for book_id, libraries in self._added.items()
+                       for library_id in _as_sequence(libraries))
+        books, libraries = array('q'), array('q')
+        for book_id, library_id in heapq.merge(base, added):
+            books.append(book_id)
+            libraries.append(library_id)
+        self._reverse_books, self._reverse_libraries = books, libraries
+        self._added, self._removed, self._delta_size = {}, set(), 0
+
+    def books_of(self, library_id: int) -> RoaringBitmap:
+        return self._books_by_library.get(library_id, RoaringBitmap())
+
+    def libraries_of(self, book_id: int) -> Sequence[int]:
+        """ID библиотек книги по возрастанию"""
+        lo = bisect_left(self._reverse_books, book_id)
+        hi = bisect_right(self._reverse_books, book_id, lo)
+        result: Sequence[int] = self._reverse_libraries[lo:hi]
+        if self._removed and hi > lo:
+            result = [library_id for library_id in result if (book_id, library_id) not in self._removed]
+        added = self._added.get(book_id)
+        if added is not None:
+            result = sorted([*result, *_as_sequence(added)])
+        return result
+
+    def books_in_all(self, library_ids: Iterable[int]) -> RoaringBitmap:
+        """Книги, которые есть во всех перечисленных библиотеках"""
+        bitmaps = sorted((self.books_of(library_id) for library_id in library_ids), key=len)
+        if not bitmaps:
+            return RoaringBitmap()
+        result = RoaringBitmap() | bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap
+        return result
+
+    def books_in_any(self, library_ids: Iterable[int]) -> RoaringBitmap:
+        """Книги, которые есть хотя бы в одной из библиотек"""
+        result = RoaringBitmap()
+        for library_id in library_ids:
+            result = result | self.books_of(library_id)
+        return result
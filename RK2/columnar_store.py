@@ -0,0 +1,253 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from library_system import Library, Book, LibraryBook
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (сумма, количество, минимум, максимум) страниц
+PageStats = Tuple[int, int, int, int]
+# Сколько строк, добавленных после построения индекса ID, ищется перебором
+_UNINDEXED_MAX = 64
+
+
+def _sorted_index(keys: array) -> Tuple[array, array]:
+    """Ключи по возрастанию и номера соответствующих строк (устойчивая сортировка)"""
+    if np is not None and len(keys):
+        values = np.frombuffer(keys, dtype=np.int64)
+        order = np.argsort(values, kind='stable')
+        return array('q', values[order].tobytes()), array('q', order.astype(np.int64).tobytes())
+    rows = array('q', sorted(range(len(keys)), key=keys.__getitem__))
+    return array('q', (keys[row] for row in rows)), rows
+
+
+class StringTable:
+    """Компактная таблица строк: все строки хранятся подряд в одном буфере UTF-8"""
+
+    def __init__(self, dedupe: bool = False):
+        self._data = bytearray()
+        self._offsets = array('q', [0])
+        # Для часто повторяющихся строк (авторы) храним каждую строку один раз
+        self._refs: Optional[Dict[str, int]] = {} if dedupe else None
+
+    def add(self, value: str) -> int:
+        """Добавить строку и вернуть её номер"""
+        if self._refs is not None and value in self._refs:
+            return self._refs[value]
+
+        self._data += value.encode('utf-8')
+        self._offsets.append(len(self._data))
+        ref = len(self._offsets) - 2
+        if self._refs is not None:
+            self._refs[value] = ref
+        return ref
+
+    def get(self, ref: int) -> str:
+        """Получить строку по номеру"""
+        return self._data[self._offsets[ref]:self._offsets[ref + 1]].decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class ColumnarBookStore:
+    """Хранилище книг по столбцам вместо списка объектов Book"""
+
+    def __init__(self, books: Iterable[Book] = ()):
+        self.ids = array('q')
+        self.pages = array('q')
+        self.library_ids = array('q')
+        self.title_refs = array('q')
+        self.author_refs = array('q')
+        self.titles = StringTable()
+        self.authors = StringTable(dedupe=True)
+        # ID по возрастанию и номера их строк вместо словаря ID -> строка:
+        # 16 байт на книгу, поиск бинарный. Строки после построения ищутся перебором
+        self._sorted_ids = array('q')
+        self._sorted_rows = array('q')
+        for book in books:
+            self.append(book)
+        self.sorted_index()
+
+    def append(self, book: Book):
+        """Добавить книгу в конец хранилища"""
+        row = len(self.ids)
+        self.ids.append(book.id)
+        self.pages.append(book.pages)
+        self.library_ids.append(book.library_id)
+        self.title_refs.append(self.titles.add(book.title))
+        self.author_refs.append(self.authors.add(book.author))
+
+    def sorted_index(self) -> Tuple[array, array]:
+        """ID книг по возрастанию и номера их строк; при повторе ID первой идёт первая книга"""
+        if len(self._sorted_ids) != len(self.ids):
+            self._sorted_ids, self._sorted_rows = _sorted_index(self.ids)
+        return self._sorted_ids, self._sorted_rows
+
+    def row_of(self, book_id: int) -> Optional[int]:
+        """Номер строки книги по её ID"""
+        if len(self.ids) - len(self._sorted_ids) > _UNINDEXED_MAX:
+            self.sorted_index()
+        ids = self._sorted_ids
+        pos = bisect_left(ids, book_id)
+        if pos < len(ids) and ids[pos] == book_id:
+            return self._sorted_rows[pos]
+        for row in range(len(ids), len(self.ids)):
+            if self.ids[row] == book_id:
+                return row
+        return None
+
+    def title(self, row: int) -> str:
+        return self.titles.get(self.title_refs[row])
+
+    def book(self, row: int) -> Book:
+        """Собрать объект Book из строки хранилища"""
+        return Book(self.ids[row], self.title(row), self.authors.get(self.author_refs[row]),
+                    self.pages[row], self.library_ids[row])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class ColumnarLibrarySystem:
+    """Вариант LibrarySystem, хранящий книги и связи в столбцах"""
+
+    def __init__(self, libraries: List[Library], books: Iterable[Book], library_books: Iterable[LibraryBook]):
+        self.libraries = libraries
+        self._libraries_by_id: Dict[int, Library] = {}
+        for lib in libraries:
+            self._libraries_by_id.setdefault(lib.id, lib)
+
+        self.store = ColumnarBookStore(books)
+        self.relation_library_ids = array('q')
+        self.relation_book_ids = array('q')
+        # Связи, сгруппированные по library_id; строится при первом запросе
+        self._relations_by_library: Optional[Tuple[array, array]] = None
+        for lb in library_books:
+            self.add_library_book(lb)
+
+    def add_library(self, library: Library):
+        """Добавить библиотеку"""
+        self.libraries.append(library)
+        self._libraries_by_id.setdefault(library.id, library)
+
+    def add_book(self, book: Book):
+        """Добавить книгу"""
+        self.store.append(book)
+
+    def add_library_book(self, library_book: LibraryBook):
+        """Добавить связь библиотеки с книгой"""
+        self.relation_library_ids.append(library_book.library_id)
+        self.relation_book_ids.append(library_book.book_id)
+        self._relations_by_library = None
+
+    def get_library_by_id(self, library_id: int) -> Optional[Library]:
+        """Получить библиотеку по ID"""
+        return self._libraries_by_id.get(library_id)
+
+    def get_book_by_id(self, book_id: int) -> Optional[Book]:
+        """Получить книгу по ID"""
+        row = self.store.row_of(book_id)
+        return self.store.book(row) if row is not None else None
+
+    def get_books_ending_with_a(self) -> List[Book]:
+        """Найти книги, названия которых заканчиваются на 'А'"""
+        return [self.store.book(row) for row in range(len(self.store))
+                if self.store.title(row).endswith('а')]
+
+    def _get_books_by_library(self, library_id: int) -> List[Book]:
+        """Вспомогательный метод: получить книги по ID библиотеки"""
+        library_ids, book_ids = self._group_relations()
+        lo = bisect_left(library_ids, library_id)
+        hi = bisect_right(library_ids, library_id)
+        rows = {self.store.row_of(book_ids[i]) for i in range(lo, hi)}
+        rows.discard(None)
+        return [self.store.book(row) for row in sorted(rows)]
+
+    def _group_relations(self) -> Tuple[array, array]:
+        """library_id связей по возрастанию и book_id в том же порядке"""
+        if self._relations_by_library is None:
+            library_ids, rows = _sorted_index(self.relation_library_ids)
+            book_ids = self.relation_book_ids
+            self._relations_by_library = library_ids, array('q', (book_ids[row] for row in rows))
+        return self._relations_by_library
+
+    def get_library_page_stats(self) -> Dict[int, PageStats]:
+        """Сумма, количество, минимум и максимум страниц по библиотекам за один проход"""
+        if np is not None:
+            return self._page_stats_numpy()
+        return self._page_stats_python()
+
+    def _page_stats_python(self) -> Dict[int, PageStats]:
+        stats: Dict[int, List[int]] = {}
+        seen = set()
+        pages = self.store.pages
+        for lib_id, book_id in zip(self.relation_library_ids, self.relation_book_ids):
+            row = self.store.row_of(book_id)
+            if row is None or (lib_id, row) in seen:
+                continue
+            seen.add((lib_id, row))
+            p = pages[row]
+            s = stats.get(lib_id)
+            if s is None:
+                stats[lib_id] = [p, 1, p, p]
+            else:
+                s[0] += p
+                s[1] += 1
+                if p < s[2]:
+                    s[2] = p
+                if p > s[3]:
+                    s[3] = p
+        return {lib_id: tuple(s) for lib_id, s in stats.items()}
+
+    def _page_stats_numpy(self) -> Dict[int, PageStats]:
+        if not len(self.store) or not len(self.relation_book_ids):
+            return {}
+
+        sorted_ids, order = (np.frombuffer(column, dtype=np.int64) for column in self.store.sorted_index())
+        pages = np.frombuffer(self.store.pages, dtype=np.int64)
+        rel_libs = np.frombuffer(self.relation_library_ids, dtype=np.int64)
+        rel_books = np.frombuffer(self.relation_book_ids, dtype=np.int64)
+
+        # ID книги -> номер строки; при повторах ID берётся первая книга, как в row_of
+        pos = np.minimum(np.searchsorted(sorted_ids, rel_books), len(sorted_ids) - 1)
+        found = sorted_ids[pos] == rel_books
+        rows = order[pos[found]]
+        rel_libs = rel_libs[found]
+
+        # Повторяющиеся связи библиотеки с одной книгой учитываются один раз
+        pairs = np.unique(np.stack([rel_libs, rows], axis=1), axis=0)
+        lib_keys, groups = np.unique(pairs[:, 0], return_inverse=True)
+        groups = groups.ravel()
+        values = pages[pairs[:, 1]]
+
+        counts = np.bincount(groups, minlength=len(lib_keys))
+        sums = np.bincount(groups, weights=values, minlength=len(lib_keys))
+        mins = np.full(len(lib_keys), np.iinfo(np.int64).max)
+        maxs = np.full(len(lib_keys), np.iinfo(np.int64).min)
+        np.minimum.at(mins, groups, values)
+        np.maximum.at(maxs, groups, values)
+
+        return {int(lib_id): (int(s), int(c), int(lo), int(hi))
+                for lib_id, s, c, lo, hi in zip(lib_keys, sums, counts, mins, maxs)}
+
+    def get_library_avg_pages(self) -> List[Tuple[str, float, int]]:
+        """Рассчитать среднее количество страниц в книгах по библиотекам"""
+        stats = self.get_library_page_stats()
+        result = []
+        for library in self.libraries:
+            if library.id in stats:
+                total_pages, count = stats[library.id][:2]
+                result.append((library.name, total_pages / count, count))
+
+        # Сортировка по среднему количеству страниц
+        return sorted(result, key=lambda x: x[1])
+
+    def get_libraries_starting_with_a_with_books(self) -> List[Tuple[Library, List[Book]]]:
+        """Найти библиотеки с названием на 'А' и их книги"""
+        return [(library, self._get_books_by_library(library.id))
+                for library in self.libraries if library.name.startswith('А')]
@@ -1,5 +1,22 @@
+import heapq
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, TextIO, Tuple, TypeVar, Optional
+
+from bitmap import BitmapRelationStore, RoaringBitmap
+from report import render_all_data
+from query_cache import QueryCache, cached_query
+from string_index import SortedKeyIndex
+from text_index import InvertedIndex
+
+T = TypeVar('T')
+
+def _page(items: Iterable[T], offset: int = 0, limit: Optional[int] = None) -> Iterator[T]:
+    """Пропустить offset элементов и выдать не больше limit"""
+    return islice(items, offset, None if limit is None else offset + limit)
 
 @dataclass
 class Library:
@@ -19,11 +36,344 @@ class LibraryBook:
     library_id: int
     book_id: int
 
+class RelationList(Sequence):
+    """Связи библиотек с книгами в порядке добавления, двумя столбцами array('q').
+
+    Занимает 16 байт на связь вместо объекта LibraryBook (около 100 байт):
+    записи LibraryBook создаются только при обращении.
+    """
+
+    def __init__(self, library_books: Iterable[LibraryBook] = ()):
+        self.library_ids = array('q')
+        self.book_ids = array('q')
+        for lb in library_books:
+            self.append(lb)
+
+    def copy(self) -> 'RelationList':
+        result = RelationList()
+        result.library_ids = array('q', self.library_ids)
+        result.book_ids = array('q', self.book_ids)
+        return result
+
+    def append(self, library_book: LibraryBook):
+        self.library_ids.append(library_book.library_id)
+        self.book_ids.append(library_book.book_id)
+
+    def remove_pair(self, library_id: int, book_id: int) -> bool:
+        """Удалить первую связь (library_id, book_id); False, если её нет"""
+        library_ids, book_ids = self.library_ids, self.book_ids
+        i = -1
+        while True:
+            try:
+                # Поиск по столбцу идёт в C, сравнение book_id - только для совпавших library_id
+                i = library_ids.index(library_id, i + 1)
+            except ValueError:
+                return False
+            if book_ids[i] == book_id:
+                del library_ids[i]
+                del book_ids[i]
+                return True
+
+    def __len__(self) -> int:
+        return len(self.library_ids)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [LibraryBook(library_id, book_id)
+                    for library_id, book_id in zip(self.library_ids[row], self.book_ids[row])]
+        return LibraryBook(self.library_ids[row], self.book_ids[row])
+
+    def __iter__(self) -> Iterator[LibraryBook]:
+        return map(LibraryBook, self.library_ids, self.book_ids)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RelationList):
+            return self.library_ids == other.library_ids and self.book_ids == other.book_ids
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RelationList({list(self)!r})"
+
 class LibrarySystem:
-    def __init__(self, libraries: List[Library], books: List[Book], library_books: List[LibraryBook]):
+    def __init__(self, libraries: List[Library], books: List[Book], library_books: Iterable[LibraryBook],
+                 cache_size: int = 128):
         self.libraries = libraries
         self.books = books
-        self.library_books = library_books
+        # Связи хранятся столбцами: список LibraryBook после создания системы не нужен
+        self.library_books = RelationList(library_books)
+        self._build_indexes()
+        # Изменять данные нужно через методы add_*/remove_*, иначе индексы и кэш устареют
+        self._cache = QueryCache(cache_size)
+        # Увеличивается при каждом изменении: по нему внешние структуры понимают, что устарели
+        self.revision = 0
+        # Замороженную систему изменить нельзя, только её копию
+        self.frozen = False
+
+    def _build_indexes(self):
+        """Построить индексы id -> объект и library_id -> id книг"""
+        # Связи без повторов в виде сжатых битовых карт
+        self._relations = BitmapRelationStore()
+        # (library_id, book_id) -> число повторов связи сверх первой; обычно пусто
+        self._duplicate_relations: Dict[Tuple[int, int], int] = {}
+        # library_id -> (сумма страниц, количество книг), обновляется при каждом изменении
+        self._page_totals: Dict[int, Tuple[int, int]] = {}
+        # Отсортированные (среднее, порядковый номер библиотеки, library_id)
+        self._avg_pages_view: List[Tuple[float, int, int]] = []
+        self._avg_pages_keys: Dict[int, Tuple[float, int, int]] = {}
+
+        self._libraries_by_id: Dict[int, Library] = {}
+        self._library_order: Dict[int, int] = {}
+        self._next_library_order = 0
+        self._library_names = SortedKeyIndex()
+        for lib in self.libraries:
+            self._index_library(lib, update_names=False)
+        self._library_names.extend((self._libraries_by_id[library_id].name, order, library_id)
+                                   for library_id, order in self._library_order.items())
+
+        self._books_by_id: Dict[int, Book] = {}
+        # Порядковый номер книги нужен, чтобы выдавать книги в порядке списка books
+        self._book_order: Dict[int, int] = {}
+        self._next_book_order = 0
+        self._book_titles = SortedKeyIndex(reverse=True)
+        self._book_text = InvertedIndex()
+        for book in self.books:
+            self._index_book(book, update_titles=False)
+        self._book_titles.extend((self._books_by_id[book_id].title, order, book_id)
+                                 for book_id, order in self._book_order.items())
+
+        for library_id, book_id in zip(self.library_books.library_ids, self.library_books.book_ids):
+            self._index_relation(library_id, book_id, update_view=False)
+        self._relations.compact()
+        self._rebuild_avg_pages_view()
+
+    def _index_library(self, library: Library, update_names: bool = True, update_view: bool = True):
+        if library.id not in self._libraries_by_id:
+            self._libraries_by_id[library.id] = library
+            self._library_order[library.id] = self._next_library_order
+            if update_names:
+                self._library_names.add(library.name, self._next_library_order, library.id)
+            self._next_library_order += 1
+            if update_view:
+                self._update_avg_pages_view(library.id)
+
+    def _index_book(self, book: Book, update_titles: bool = True, update_view: bool = True):
+        if book.id not in self._books_by_id:
+            self._books_by_id[book.id] = book
+            self._book_order[book.id] = self._next_book_order
+            if update_titles:
+                self._book_titles.add(book.title, self._next_book_order, book.id)
+            self._book_text.add(self._next_book_order, book.id, f"{book.title} {book.author}")
+            self._next_book_order += 1
+            for library_id in self._relations.libraries_of(book.id):
+                self._add_pages(library_id, book.pages, 1, update_view)
+
+    def _index_relation(self, library_id: int, book_id: int, update_view: bool = True):
+        if self._relations.add(library_id, book_id):
+            book = self._books_by_id.get(book_id)
+            if book is not None:
+                self._add_pages(library_id, book.pages, 1, update_view)
+        else:
+            key = (library_id, book_id)
+            self._duplicate_relations[key] = self._duplicate_relations.get(key, 0) + 1
+
+    def _add_pages(self, library_id: int, pages: int, count: int, update_view: bool = True):
+        """Изменить сумму страниц и число книг библиотеки"""
+        # Кортеж заменяется целиком: словарь может быть общим с копией (см. copy)
+        total_pages, total_count = self._page_totals.get(library_id, (0, 0))
+        if total_count + count:
+            self._page_totals[library_id] = (total_pages + pages, total_count + count)
+        else:
+            self._page_totals.pop(library_id, None)
+        if update_view:
+            self._update_avg_pages_view(library_id)
+
+    def _rebuild_avg_pages_view(self):
+        """Построить отсортированный по среднему список заново"""
+        self._avg_pages_view = sorted(
+            (totals[0] / totals[1], self._library_order[library_id], library_id)
+            for library_id, totals in self._page_totals.items() if library_id in self._libraries_by_id)
+        self._avg_pages_keys = {key[2]: key for key in self._avg_pages_view}
+
+    def _refresh_avg_pages_view(self, library_ids: Set[int]):
+        """Обновить список по среднему для изменившихся библиотек: по одной или,
+        если их много, одной сортировкой"""
+        if len(library_ids) > len(self._avg_pages_view) // 8:
+            self._rebuild_avg_pages_view()
+        else:
+            for library_id in library_ids:
+                self._update_avg_pages_view(library_id)
+
+    def _update_avg_pages_view(self, library_id: int):
+        """Переставить библиотеку в отсортированном по среднему списке"""
+        old_key = self._avg_pages_keys.pop(library_id, None)
+        if old_key is not None:
+            del self._avg_pages_view[bisect_left(self._avg_pages_view, old_key)]
+
+        totals = self._page_totals.get(library_id)
+        if totals and library_id in self._libraries_by_id:
+            key = (totals[0] / totals[1], self._library_order[library_id], library_id)
+            insort(self._avg_pages_view, key)
+            self._avg_pages_keys[library_id] = key
+
+    def copy(self, cache_size: Optional[int] = None) -> 'LibrarySystem':
+        """Независимая копия системы без перестроения индексов.
+
+        Словари и списки верхнего уровня копируются, а битовые карты связей и
+        массивы текстового индекса остаются общими, пока одна из сторон их не
+        изменит (copy-on-write). Записи Library/Book общие, столбцы связей копируются.
+        """
+        result = LibrarySystem.__new__(LibrarySystem)
+        result.libraries = list(self.libraries)
+        result.books = list(self.books)
+        result.library_books = self.library_books.copy()
+        for name in ('_libraries_by_id', '_library_order', '_books_by_id', '_book_order',
+                     '_duplicate_relations', '_page_totals', '_avg_pages_keys'):
+            setattr(result, name, dict(getattr(self, name)))
+        result._avg_pages_view = list(self._avg_pages_view)
+        result._next_library_order = self._next_library_order
+        result._next_book_order = self._next_book_order
+        result.revision = self.revision
+        result.frozen = False
+        result._relations = self._relations.copy()
+        result._library_names = self._library_names.copy()
+        result._book_titles = self._book_titles.copy()
+        result._book_text = self._book_text.copy()
+        result._cache = QueryCache(self._cache.maxsize if cache_size is None else cache_size)
+        return result
+
+    def freeze(self):
+        """Запретить изменения: методы add_*/remove_*/move_*/bulk_load будут бросать RuntimeError"""
+        self.frozen = True
+
+    def _check_not_frozen(self):
+        if self.frozen:
+            raise RuntimeError("Система заморожена: изменяйте её копию (copy())")
+
+    def bulk_load(self, libraries: Iterable[Library], books: Iterable[Book],
+                  library_books: Iterable[LibraryBook]):
+        """Добавить пачку библиотек, книг и связей.
+
+        Пачка индексируется целиком: названия попадают в индексы одной сортировкой
+        порции, список по среднему обновляется один раз, кэш сбрасывается и
+        revision увеличивается один раз на вызов, а не на каждую запись.
+        """
+        self._check_not_frozen()
+        changed: Set[str] = set()
+        # Библиотеки, у которых могли измениться суммы страниц
+        affected: Set[int] = set()
+
+        new_libraries = []
+        for library in libraries:
+            self.libraries.append(library)
+            changed.add('libraries')
+            if library.id not in self._libraries_by_id:
+                self._index_library(library, update_names=False, update_view=False)
+                new_libraries.append(library)
+                affected.add(library.id)
+        self._library_names.extend((library.name, self._library_order[library.id], library.id)
+                                   for library in new_libraries)
+
+        new_books = []
+        for book in books:
+            self.books.append(book)
+            changed.add('books')
+            if book.id not in self._books_by_id:
+                self._index_book(book, update_titles=False, update_view=False)
+                new_books.append(book)
+                affected.update(self._relations.libraries_of(book.id))
+        self._book_titles.extend((book.title, self._book_order[book.id], book.id) for book in new_books)
+
+        for library_book in library_books:
+            self.library_books.append(library_book)
+            changed.add('library_books')
+            self._index_relation(library_book.library_id, library_book.book_id, update_view=False)
+            affected.add(library_book.library_id)
+
+        self._refresh_avg_pages_view(affected)
+        for collection in changed:
+            self._cache.invalidate(collection)
+        if changed:
+            self.revision += 1
+
+    def add_library(self, library: Library):
+        """Добавить библиотеку"""
+        self._check_not_frozen()
+        self.libraries.append(library)
+        self._index_library(library)
+        self._cache.invalidate('libraries')
+        self.revision += 1
+
+    def remove_library(self, library_id: int):
+        """Удалить библиотеку по ID"""
+        self._check_not_frozen()
+        self.libraries = [lib for lib in self.libraries if lib.id != library_id]
+        library = self._libraries_by_id.pop(library_id, None)
+        if library is not None:
+            self._update_avg_pages_view(library_id)
+            self._library_names.remove(library.name, self._library_order.pop(library_id), library_id)
+        self._cache.invalidate('libraries')
+        self.revision += 1
+
+    def add_book(self, book: Book):
+        """Добавить книгу"""
+        self._check_not_frozen()
+        self.books.append(book)
+        self._index_book(book)
+        self._cache.invalidate('books')
+        self.revision += 1
+
+    def remove_book(self, book_id: int):
+        """Удалить книгу по ID"""
+        self._check_not_frozen()
+        self.books = [book for book in self.books if book.id != book_id]
+        book = self._books_by_id.pop(book_id, None)
+        if book is not None:
+            order = self._book_order.pop(book_id)
+            self._book_titles.remove(book.title, order, book_id)
+            self._book_text.remove(order, f"{book.title} {book.author}")
+            for library_id in self._relations.libraries_of(book_id):
+                self._add_pages(library_id, -book.pages, -1)
+        self._cache.invalidate('books')
+        self.revision += 1
+
+    def add_library_book(self, library_book: LibraryBook):
+        """Добавить связь библиотеки с книгой"""
+        self._check_not_frozen()
+        self.library_books.append(library_book)
+        self._index_relation(library_book.library_id, library_book.book_id)
+        self._cache.invalidate('library_books')
+        self.revision += 1
+
+    def remove_library_book(self, library_id: int, book_id: int):
+        """Удалить связь библиотеки с книгой"""
+        self._check_not_frozen()
+        if not self.library_books.remove_pair(library_id, book_id):
+            return
+
+        key = (library_id, book_id)
+        duplicates = self._duplicate_relations.get(key)
+        if duplicates:
+            if duplicates == 1:
+                del self._duplicate_relations[key]
+            else:
+                self._duplicate_relations[key] = duplicates - 1
+        else:
+            self._relations.remove(library_id, book_id)
+            book = self._books_by_id.get(book_id)
+            if book is not None:
+                self._add_pages(library_id, -book.pages, -1)
+        self._cache.invalidate('library_books')
+        self.revision += 1
+
+    def move_library_book(self, book_id: int, from_library_id: int, to_library_id: int):
+        """Перенести книгу из одной библиотеки в другую"""
+        self._check_not_frozen()
+        if book_id not in self._relations.books_of(from_library_id):
+            raise ValueError(f"Книги {book_id} нет в библиотеке {from_library_id}")
+        self.remove_library_book(from_library_id, book_id)
+        self.add_library_book(LibraryBook(to_library_id, book_id))
 
     def get_all_libraries(self) -> List[Library]:
         """Получить список всех библиотек"""
@@ -33,30 +383,59 @@ class LibrarySystem:
         """Получить список всех книг"""
         return self.books
 
-    def get_library_books_relations(self) -> List[LibraryBook]:
+    def get_library_books_relations(self) -> Sequence[LibraryBook]:
         """Получить все связи библиотек с книгами"""
         return self.library_books
 
-    def get_books_ending_with_a(self) -> List[Book]:
-        """Найти книги, названия которых заканчиваются на 'А'"""
-        return [book for book in self.books if book.title.endswith('а')]
+    def cache_info(self) -> Dict[str, int]:
+        """Статистика кэша запросов"""
+        return self._cache.info()
 
-    def get_library_avg_pages(self) -> List[Tuple[str, float, int]]:
+    def get_books_ending_with_a(self) -> Sequence[Book]:
+        """Найти книги, названия которых заканчиваются на 'А'"""
+        return self.books_with_title_suffix('а')
+
+    @cached_query('books')
+    def books_with_title_suffix(self, suffix: str, ignore_case: bool = False) -> Sequence[Book]:
+        """Найти книги, названия которых заканчиваются на suffix"""
+        return [self._books_by_id[book_id]
+                for book_id in self._book_titles.search(suffix, ignore_case)]
+
+    @cached_query('libraries')
+    def libraries_with_name_prefix(self, prefix: str, ignore_case: bool = False) -> Sequence[Library]:
+        """Найти библиотеки, названия которых начинаются с prefix"""
+        return [self._libraries_by_id[library_id]
+                for library_id in self._library_names.search(prefix, ignore_case)]
+
+    @cached_query('books', 'library_books')
+    def search_books(self, query: str, mode: str = 'and', library_id: Optional[int] = None) -> Sequence[Book]:
+        """Найти книги по словам из названия и автора.
+
+        mode='and' - нужны все слова, mode='or' - хотя бы одно.
+        library_id ограничивает поиск книгами одной библиотеки.
+        """
+        allowed = self._relations.books_of(library_id) if library_id is not None else None
+        return [self._books_by_id[book_id] for book_id in self._book_text.search(query, mode, allowed)]
+
+    @cached_query('libraries', 'books', 'library_books')
+    def get_library_avg_pages(self) -> Sequence[Tuple[str, float, int]]:
         """Рассчитать среднее количество страниц в книгах по библиотекам"""
-        result = []
-        for library in self.libraries:
-            library_books_list = self._get_books_by_library(library.id)
-            if library_books_list:
-                total_pages = sum(book.pages for book in library_books_list)
-                avg_pages = total_pages / len(library_books_list)
-                result.append((library.name, avg_pages, len(library_books_list)))
+        # Суммы и порядок по среднему поддерживаются при изменениях, пересчёт не нужен
+        return [self._avg_pages_row(library_id) for _, _, library_id in self._avg_pages_view]
+
+    def top_libraries_by_avg_pages(self, n: int) -> List[Tuple[str, float, int]]:
+        """Получить n библиотек с наибольшим средним количеством страниц"""
+        top = self._avg_pages_view[-n:] if n > 0 else []
+        return [self._avg_pages_row(library_id) for _, _, library_id in reversed(top)]
 
-        # Сортировка по среднему количеству страниц
-        return sorted(result, key=lambda x: x[1])
+    def _avg_pages_row(self, library_id: int) -> Tuple[str, float, int]:
+        total_pages, count = self._page_totals[library_id]
+        return self._libraries_by_id[library_id].name, total_pages / count, count
 
-    def get_libraries_starting_with_a_with_books(self) -> List[Tuple[Library, List[Book]]]:
+    @cached_query('libraries', 'books', 'library_books')
+    def get_libraries_starting_with_a_with_books(self) -> Sequence[Tuple[Library, Sequence[Book]]]:
         """Найти библиотеки с названием на 'А' и их книги"""
-        libraries_a = [lib for lib in self.libraries if lib.name.startswith('А')]
+        libraries_a = self.libraries_with_name_prefix('А')
         result = []
 
         for library in libraries_a:
@@ -67,40 +446,126 @@ class LibrarySystem:
 
     def _get_books_by_library(self, library_id: int) -> List[Book]:
         """Вспомогательный метод: получить книги по ID библиотеки"""
-        library_book_ids = [lb.book_id for lb in self.library_books if lb.library_id == library_id]
-        return [book for book in self.books if book.id in library_book_ids]
+        book_ids = [book_id for book_id in self._relations.books_of(library_id)
+                    if book_id in self._books_by_id]
+        book_ids.sort(key=self._book_order.__getitem__)
+        return [self._books_by_id[book_id] for book_id in book_ids]
+
+    def _books_from_bitmap(self, book_ids: RoaringBitmap) -> List[Book]:
+        """Книги из битовой карты ID в порядке списка books"""
+        ids = [book_id for book_id in book_ids if book_id in self._books_by_id]
+        ids.sort(key=self._book_order.__getitem__)
+        return [self._books_by_id[book_id] for book_id in ids]
+
+    def books_in_all_libraries(self, library_ids: Iterable[int]) -> List[Book]:
+        """Найти книги, которые есть во всех указанных библиотеках"""
+        return self._books_from_bitmap(self._relations.books_in_all(library_ids))
+
+    def books_in_any_library(self, library_ids: Iterable[int]) -> List[Book]:
+        """Найти книги, которые есть хотя бы в одной из указанных библиотек"""
+        return self._books_from_bitmap(self._relations.books_in_any(library_ids))
+
+    def libraries_with_book(self, book_id: int) -> List[Library]:
+        """Найти библиотеки, в которых есть книга"""
+        ids = [library_id for library_id in self._relations.libraries_of(book_id)
+               if library_id in self._libraries_by_id]
+        ids.sort(key=self._library_order.__getitem__)
+        return [self._libraries_by_id[library_id] for library_id in ids]
+
+    # Ленивые варианты запросов с постраничной выдачей.
+    # offset/limit - обычная пагинация, after - курсор (keyset): порядковый номер
+    # последнего элемента предыдущей страницы из book_cursor/library_cursor/
+    # avg_pages_cursor. Выдача продолжается сразу за ним, даже если этот элемент
+    # уже удалён. Для страницы с limit в памяти держится не больше offset + limit
+    # элементов: индекс просматривается лениво, полный результат не строится.
+
+    def book_cursor(self, book_id: int) -> int:
+        """Курсор для продолжения выдачи книг после данной книги"""
+        return self._book_order[book_id]
+
+    def library_cursor(self, library_id: int) -> int:
+        """Курсор для продолжения выдачи библиотек после данной библиотеки"""
+        return self._library_order[library_id]
+
+    def avg_pages_cursor(self, library_id: int) -> Tuple[float, int, int]:
+        """Курсор для продолжения iter_library_avg_pages после данной библиотеки"""
+        return self._avg_pages_keys[library_id]
+
+    @staticmethod
+    def _ordered_page(matches: Iterable[Tuple[int, int]], after: Optional[int], offset: int,
+                      limit: Optional[int]) -> Iterator[int]:
+        """ID из пар (порядковый номер, id), идущих не по порядку, - в порядке номеров,
+        после курсора after; для страницы хранятся только offset + limit лучших"""
+        if after is not None:
+            matches = ((order, item_id) for order, item_id in matches if order > after)
+        if limit is None:
+            page = sorted(matches)[offset:]
+        else:
+            page = heapq.nsmallest(offset + limit, matches)[offset:]
+        return (item_id for _, item_id in page)
+
+    def iter_books_with_title_suffix(self, suffix: str, ignore_case: bool = False, offset: int = 0,
+                                     limit: Optional[int] = None, after: Optional[int] = None) -> Iterator[Book]:
+        """Лениво перебрать книги, названия которых заканчиваются на suffix"""
+        matches = self._book_titles.iter_matches(suffix, ignore_case)
+        for book_id in self._ordered_page(matches, after, offset, limit):
+            yield self._books_by_id[book_id]
+
+    def iter_books_ending_with_a(self, offset: int = 0, limit: Optional[int] = None,
+                                 after: Optional[int] = None) -> Iterator[Book]:
+        """Лениво перебрать книги, названия которых заканчиваются на 'А'"""
+        return self.iter_books_with_title_suffix('а', offset=offset, limit=limit, after=after)
+
+    def iter_libraries_with_name_prefix(self, prefix: str, ignore_case: bool = False, offset: int = 0,
+                                        limit: Optional[int] = None, after: Optional[int] = None) -> Iterator[Library]:
+        """Лениво перебрать библиотеки, названия которых начинаются с prefix"""
+        matches = self._library_names.iter_matches(prefix, ignore_case)
+        for library_id in self._ordered_page(matches, after, offset, limit):
+            yield self._libraries_by_id[library_id]
+
+    def iter_search_books(self, query: str, mode: str = 'and', library_id: Optional[int] = None, offset: int = 0,
+                          limit: Optional[int] = None, after: Optional[int] = None) -> Iterator[Book]:
+        """Лениво перебрать книги, найденные по словам из названия и автора"""
+        allowed = self._relations.books_of(library_id) if library_id is not None else None
+        # Номер документа в текстовом индексе - порядковый номер книги, поэтому курсор ищется в индексе
+        ids = self._book_text.iter_search(query, mode, allowed, after)
+        return (self._books_by_id[book_id] for book_id in _page(ids, offset, limit))
+
+    def iter_books_by_library(self, library_id: int, offset: int = 0, limit: Optional[int] = None,
+                              after: Optional[int] = None) -> Iterator[Book]:
+        """Лениво перебрать книги библиотеки в порядке списка книг"""
+        matches = ((self._book_order[book_id], book_id) for book_id in self._relations.books_of(library_id)
+                   if book_id in self._books_by_id)
+        for book_id in self._ordered_page(matches, after, offset, limit):
+            yield self._books_by_id[book_id]
+
+    def iter_library_avg_pages(self, offset: int = 0, limit: Optional[int] = None,
+                               after: Optional[Tuple[float, int, int]] = None) -> Iterator[Tuple[str, float, int]]:
+        """Лениво перебрать средние по библиотекам; after - курсор из avg_pages_cursor"""
+        start = 0 if after is None else bisect_right(self._avg_pages_view, tuple(after))
+        keys = islice(self._avg_pages_view, start, None)
+        return (self._avg_pages_row(library_id) for _, _, library_id in _page(keys, offset, limit))
+
+    def iter_libraries_starting_with_a_with_books(
+            self, offset: int = 0, limit: Optional[int] = None,
+            after: Optional[int] = None) -> Iterator[Tuple[Library, Iterator[Book]]]:
+        """Лениво перебрать библиотеки на 'А'; книги каждой тоже выдаются лениво"""
+        for library in self.iter_libraries_with_name_prefix('А', offset=offset, limit=limit, after=after):
+            yield library, self.iter_books_by_library(library.id)
 
     def get_library_by_id(self, library_id: int) -> Optional[Library]:
         """Получить библиотеку по ID"""
-        for lib in self.libraries:
-            if lib.id == library_id:
-                return lib
-        return None
+        return self._libraries_by_id.get(library_id)
 
     def get_book_by_id(self, book_id: int) -> Optional[Book]:
         """Получить книгу по ID"""
-        for book in self.books:
-            if book.id == book_id:
-                return book
-        return None
+        return self._books_by_id.get(book_id)
 
-    def print_all_data(self):
-        """Вывести все данные"""
-        print("Библиотеки:")
-        for lib in self.libraries:
-            print(f"  {lib.id}. {lib.name}")
-
-        print("\nКниги:")
-        for book in self.books:
-            print(f"  {book.id}. '{book.title}' - {book.author} ({book.pages} стр.)")
-
-        print("\nСвязи книг с библиотеками:")
-        for lb in self.library_books:
-            lib = self.get_library_by_id(lb.library_id)
-            book = self.get_book_by_id(lb.book_id)
-            lib_name = lib.name if lib else "Неизвестно"
-            book_title = book.title if book else "Неизвестно"
-            print(f"  Библиотека '{lib_name}' -> Книга '{book_title}'")
+    def print_all_data(self, out: Optional[TextIO] = None, csv_out: Optional[TextIO] = None,
+                       jsonl_out: Optional[TextIO] = None):
+        """Вывести все данные (по умолчанию в stdout), при желании также в CSV/JSONL"""
+        render_all_data(self.libraries, self.books, self.library_books,
+                        out if out is not None else sys.stdout, csv_out, jsonl_out)
 
 # Инициализация данных
 def create_sample_data() -> LibrarySystem:
@@ -0,0 +1,108 @@
+import csv
+import json
+from dataclasses import fields
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Set, Type, TypeVar
+
+from library_system import Library, Book, LibraryBook
+
+T = TypeVar('T', Library, Book, LibraryBook)
+
+# progress(имя файла, сколько записей уже загружено)
+ProgressCallback = Callable[[str, int], None]
+
+
+def _read_rows(path: str) -> Iterator[dict]:
+    """Построчно читать словари из CSV (с заголовком) или JSONL"""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif path.endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            raise ValueError(f"{path}: поддерживаются только файлы .csv и .jsonl")
+
+
+def read_records(path: str, record_type: Type[T]) -> Iterator[T]:
+    """Читать записи заданного типа с проверкой типов полей"""
+    record_fields = [(field.name, field.type) for field in fields(record_type)]
+    from_csv = path.endswith('.csv')
+    for line_no, row in enumerate(_read_rows(path), start=1):
+        values = []
+        for name, field_type in record_fields:
+            if name not in row:
+                raise ValueError(f"{path}:{line_no}: нет поля '{name}'")
+            value = row[name]
+            try:
+                # В CSV все значения строки, в JSONL числа должны быть целыми числами
+                if field_type is int and from_csv and isinstance(value, str):
+                    value = int(value)
+                elif field_type is int and isinstance(value, int) and not isinstance(value, bool):
+                    pass
+                elif field_type is str and isinstance(value, str):
+                    pass
+                else:
+                    raise TypeError
+            except (TypeError, ValueError):
+                raise ValueError(f"{path}:{line_no}: поле '{name}' должно быть {field_type.__name__}, "
+                                 f"получено {value!r}") from None
+            values.append(value)
+        yield record_type(*values)
+
+
+def read_chunks(path: str, record_type: Type[T], chunk_size: int = 10000) -> Iterator[List[T]]:
+    """Читать записи порциями не больше chunk_size"""
+    records = read_records(path, record_type)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_library_system(system, libraries_path: str, books_path: str, relations_path: str,
+                        chunk_size: int = 10000, progress: Optional[ProgressCallback] = None):
+    """Загрузить библиотеки, книги и связи из файлов в систему порциями.
+
+    system должна поддерживать bulk_load (LibrarySystem, SqliteLibrarySystem).
+    В памяти кроме текущей порции держатся только множества ID библиотек и книг
+    для проверки внешних ключей, поэтому размер файла связей не влияет на память.
+    """
+    library_ids: Set[int] = set()
+    book_ids: Set[int] = set()
+
+    def check(path: str, kind: str, value: int, known: Set[int]):
+        if value not in known:
+            raise ValueError(f"{path}: {kind} {value} не найдена")
+
+    loaded = 0
+    for chunk in read_chunks(libraries_path, Library, chunk_size):
+        library_ids.update(lib.id for lib in chunk)
+        system.bulk_load(chunk, [], [])
+        loaded += len(chunk)
+        if progress:
+            progress(libraries_path, loaded)
+
+    loaded = 0
+    for chunk in read_chunks(books_path, Book, chunk_size):
+        for book in chunk:
+            check(books_path, "библиотека", book.library_id, library_ids)
+            book_ids.add(book.id)
+        system.bulk_load([], chunk, [])
+        loaded += len(chunk)
+        if progress:
+            progress(books_path, loaded)
+
+    loaded = 0
+    for chunk in read_chunks(relations_path, LibraryBook, chunk_size):
+        for lb in chunk:
+            check(relations_path, "библиотека", lb.library_id, library_ids)
+            check(relations_path, "книга", lb.book_id, book_ids)
+        system.bulk_load([], [], chunk)
+        loaded += len(chunk)
+        if progress:
+            progress(relations_path, loaded)
+
+    return system
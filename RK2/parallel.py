@@ -0,0 +1,134 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from columnar_store import PageStats
+from library_system import LibrarySystem
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_ITEM_SIZE = array('q').itemsize
+
+
+def _to_shared(values: array) -> shared_memory.SharedMemory:
+    """Скопировать массив 'q' в разделяемую память"""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(values) * _ITEM_SIZE))
+    shm.buf[:len(values) * _ITEM_SIZE] = values.tobytes()
+    return shm
+
+
+def _shard_page_stats(shard_name: str, n_relations: int) -> Dict[int, PageStats]:
+    """Посчитать агрегаты страниц для одной группы библиотек (выполняется в процессе пула).
+
+    Группа - столбцы library_id и pages уникальных связей, отсортированные по library_id.
+    """
+    if not n_relations:
+        return {}
+    shard_shm = shared_memory.SharedMemory(name=shard_name)
+    try:
+        if np is not None:
+            library_ids, pages = np.ndarray((2, n_relations), dtype=np.int64, buffer=shard_shm.buf)
+            # Начала отрезков с одинаковым library_id; дальше всё считается векторно
+            starts = np.flatnonzero(np.r_[True, library_ids[1:] != library_ids[:-1]])
+            counts = np.diff(np.r_[starts, n_relations])
+            stats = list(zip(library_ids[starts].tolist(), np.add.reduceat(pages, starts).tolist(), counts.tolist(),
+                             np.minimum.reduceat(pages, starts).tolist(),
+                             np.maximum.reduceat(pages, starts).tolist()))
+            # Массивы ссылаются на разделяемую память: их нужно освободить до close()
+            del library_ids, pages
+        else:
+            columns = array('q')
+            columns.frombytes(shard_shm.buf[:2 * n_relations * _ITEM_SIZE])
+            stats = []
+            pairs = zip(columns[:n_relations], columns[n_relations:])
+            for library_id, group in groupby(pairs, key=lambda pair: pair[0]):
+                values = [p for _, p in group]
+                stats.append((library_id, sum(values), len(values), min(values), max(values)))
+        return {library_id: (total, count, low, high) for library_id, total, count, low, high in stats}
+    finally:
+        shard_shm.close()
+
+
+class ParallelLibraryQueries:
+    """Параллельный расчёт агрегатов LibrarySystem в пуле процессов.
+
+    Уникальные связи вместе со страницами книг один раз раскладываются по группам
+    (library_id % workers) в разделяемую память; каждый запрос только раздаёт
+    группы процессам пула и объединяет частичные результаты. Если система
+    изменилась (system.revision), группы перестраиваются перед следующим запросом.
+    """
+
+    def __init__(self, system: LibrarySystem, workers: Optional[int] = None):
+        self.system = system
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(self.workers)
+        self._shards: List[Tuple[shared_memory.SharedMemory, int]] = []
+        self._revision: Optional[int] = None
+        self._build_shards()
+
+    def close(self):
+        self._executor.shutdown()
+        self._release_shards()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _release_shards(self):
+        for shm, _ in self._shards:
+            shm.close()
+            shm.unlink()
+        self._shards = []
+
+    def _build_shards(self):
+        """Разложить уникальные связи с существующими книгами по группам в разделяемой памяти"""
+        system = self.system
+        groups: List[List[Tuple[int, int]]] = [[] for _ in range(self.workers)]
+        books_by_id = system._books_by_id
+        for library_id, book_ids in system._relations._books_by_library.items():
+            group = groups[library_id % self.workers]
+            for book_id in book_ids:
+                book = books_by_id.get(book_id)
+                if book is not None:
+                    group.append((library_id, book.pages))
+
+        self._release_shards()
+        for group in groups:
+            group.sort(key=lambda pair: pair[0])
+            columns = array('q', (library_id for library_id, _ in group))
+            columns.extend(pages for _, pages in group)
+            self._shards.append((_to_shared(columns), len(group)))
+        self._revision = system.revision
+
+    def library_page_stats(self) -> Dict[int, PageStats]:
+        """Сумма, количество, минимум и максимум страниц по библиотекам"""
+        if self._revision != self.system.revision:
+            self._build_shards()
+        futures = [self._executor.submit(_shard_page_stats, shm.name, n) for shm, n in self._shards if n]
+        stats: Dict[int, PageStats] = {}
+        # Группы не пересекаются по library_id, поэтому объединение - простое слияние словарей
+        for future in futures:
+            stats.update(future.result())
+        return stats
+
+    def get_library_avg_pages(self) -> List[Tuple[str, float, int]]:
+        """Рассчитать среднее количество страниц, как LibrarySystem.get_library_avg_pages"""
+        stats = self.library_page_stats()
+        result = []
+        seen = set()
+        for library in self.system.libraries:
+            if library.id in stats and library.id not in seen:
+                seen.add(library.id)
+                total_pages, count = stats[library.id][:2]
+                result.append((library.name, total_pages / count, count))
+
+        # Сортировка по среднему количеству страниц
+        return sorted(result, key=lambda x: x[1])
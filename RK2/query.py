@@ -0,0 +1,269 @@
+"""Небольшой декларативный слой запросов над коллекциями записей.
+
+Строка результата соединения - словарь {псевдоним: запись}. Колонки задаются как
+'псевдоним.поле' (например 'b.pages') или просто 'псевдоним' для всей записи.
+Соединения выполняются хешированием (hash join): по меньшему входу строится
+словарь, второй вход просматривается один раз. Условия where на одну таблицу
+переносятся к её чтению (predicate pushdown), чтобы соединять меньше строк.
+
+    Query(books, 'b').where('b', lambda b: b.title.endswith('а')).select('b')
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+Row = Dict[str, Any]
+Column = Union[str, Callable[[Row], Any]]
+
+
+def _value(row: Row, column: Column) -> Any:
+    if callable(column):
+        return column(row)
+    if column in row:
+        return row[column]
+    alias, _, field = column.partition('.')
+    record = row.get(alias)
+    return None if record is None else getattr(record, field)
+
+
+def _avg(values: List[Any]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+AGGREGATES: Dict[str, Callable[[List[Any]], Any]] = {
+    'count': len,
+    'sum': sum,
+    'avg': _avg,
+    'min': lambda values: min(values) if values else None,
+    'max': lambda values: max(values) if values else None,
+    'first': lambda values: values[0] if values else None,
+    'collect': list,
+}
+
+
+class _Scan:
+    def __init__(self, records: Iterable[Any], alias: str):
+        self.records = records
+        self.alias = alias
+        self.predicates: List[Callable[[Any], bool]] = []
+
+    def aliases(self) -> List[str]:
+        return [self.alias]
+
+    def find_scan(self, alias: str, nullable: bool = False) -> Optional[Tuple['_Scan', bool]]:
+        return (self, nullable) if alias == self.alias else None
+
+    def execute(self) -> List[Row]:
+        records = self.records
+        for predicate in self.predicates:
+            records = filter(predicate, records)
+        return [{self.alias: record} for record in records]
+
+    def explain(self, indent: str = '') -> str:
+        where = f" where x{len(self.predicates)}" if self.predicates else ""
+        return f"{indent}Scan {self.alias}{where}"
+
+
+class _HashJoin:
+    def __init__(self, left, right, left_column: str, right_column: str, kind: str):
+        self.left = left
+        self.right = right
+        self.left_column = left_column
+        self.right_column = right_column
+        self.kind = kind
+
+    def aliases(self) -> List[str]:
+        return self.left.aliases() + self.right.aliases()
+
+    def find_scan(self, alias: str, nullable: bool = False):
+        found = self.left.find_scan(alias, nullable)
+        if found is None:
+            # Правая сторона левого соединения может дополняться пустыми строками
+            found = self.right.find_scan(alias, nullable or self.kind == 'left')
+        return found
+
+    def execute(self) -> List[Row]:
+        left_rows = self.left.execute()
+        right_rows = self.right.execute()
+
+        # Для внутреннего соединения словарь строится по меньшему входу.
+        # Порядок результата всегда как у вложенных циклов: сначала по левым строкам.
+        if self.kind == 'inner' and len(left_rows) < len(right_rows):
+            table: Dict[Any, List[int]] = {}
+            for i, row in enumerate(left_rows):
+                table.setdefault(_value(row, self.left_column), []).append(i)
+            pairs = []
+            for j, row in enumerate(right_rows):
+                for i in table.get(_value(row, self.right_column), ()):
+                    pairs.append((i, j))
+            pairs.sort()
+            return [{**left_rows[i], **right_rows[j]} for i, j in pairs]
+
+        table = {}
+        for row in right_rows:
+            table.setdefault(_value(row, self.right_column), []).append(row)
+        empty = {alias: None for alias in self.right.aliases()}
+        result = []
+        for row in left_rows:
+            matches = table.get(_value(row, self.left_column))
+            if matches:
+                result.extend({**row, **match} for match in matches)
+            elif self.kind == 'left':
+                result.append({**row, **empty})
+        return result
+
+    def explain(self, indent: str = '') -> str:
+        return (f"{indent}HashJoin {self.kind} {self.left_column} = {self.right_column}\n"
+                f"{self.left.explain(indent + '  ')}\n{self.right.explain(indent + '  ')}")
+
+
+class Query:
+    """Запрос: чтение, соединения, фильтры, группировка и сортировка"""
+
+    def __init__(self, records: Iterable[Any], alias: str):
+        self._plan = _Scan(records, alias)
+        self._post_filters: List[Callable[[Row], bool]] = []
+        self._distinct: Optional[Tuple[Column, ...]] = None
+        self._group_by: Optional[Tuple[Column, ...]] = None
+        self._aggregates: Dict[str, Tuple[str, Optional[Column]]] = {}
+        self._order_by: List[Tuple[Column, bool]] = []
+
+    def where(self, alias: str, predicate: Callable[[Any], bool]) -> 'Query':
+        """Оставить строки, где predicate(запись псевдонима alias) истинно"""
+        found = self._plan.find_scan(alias)
+        if found is None:
+            raise ValueError(f"Неизвестный псевдоним: {alias}")
+        scan, nullable = found
+        if nullable:
+            # Фильтр по дополняемой стороне левого соединения нельзя выполнить до соединения
+            self._post_filters.append(lambda row: row[alias] is not None and predicate(row[alias]))
+        else:
+            scan.predicates.append(predicate)
+        return self
+
+    def _join(self, other: 'Query', on: Tuple[str, str], kind: str) -> 'Query':
+        if other._post_filters or other._distinct or other._group_by or other._order_by:
+            raise ValueError("Присоединять можно только запрос из чтений, соединений и where")
+        self._plan = _HashJoin(self._plan, other._plan, on[0], on[1], kind)
+        return self
+
+    def join(self, other: 'Query', on: Tuple[str, str]) -> 'Query':
+        """Внутреннее соединение по равенству колонок on=(левая, правая)"""
+        return self._join(other, on, 'inner')
+
+    def left_join(self, other: 'Query', on: Tuple[str, str]) -> 'Query':
+        """Левое соединение: строки без пары дополняются None"""
+        return self._join(other, on, 'left')
+
+    def distinct(self, *columns: Column) -> 'Query':
+        """Убрать повторы по значениям колонок (остаётся первая строка)"""
+        self._distinct = columns
+        return self
+
+    def group_by(self, *columns: Column, **aggregates: Tuple[str, Optional[Column]]) -> 'Query':
+        """Сгруппировать строки; aggregates: имя=(функция, колонка), функции из AGGREGATES"""
+        for name, (func, _) in aggregates.items():
+            if func not in AGGREGATES:
+                raise ValueError(f"Неизвестная агрегатная функция: {func}")
+        self._group_by = columns
+        self._aggregates = aggregates
+        return self
+
+    def order_by(self, column: Column, reverse: bool = False) -> 'Query':
+        """Отсортировать (устойчиво) по колонке; несколько вызовов - несколько ключей"""
+        self._order_by.append((column, reverse))
+        return self
+
+    def explain(self) -> str:
+        return self._plan.explain()
+
+    def execute(self) -> List[Row]:
+        rows = self._plan.execute()
+        for predicate in self._post_filters:
+            rows = [row for row in rows if predicate(row)]
+
+        if self._distinct is not None:
+            seen = set()
+            unique = []
+            for row in rows:
+                key = tuple(_value(row, column) for column in self._distinct)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(row)
+            rows = unique
+
+        if self._group_by is not None:
+            rows = self._group(rows)
+
+        # Сортировка от последнего ключа к первому даёт многоключевой порядок
+        for column, reverse in reversed(self._order_by):
+            rows.sort(key=lambda row: _value(row, column), reverse=reverse)
+        return rows
+
+    def _group(self, rows: List[Row]) -> List[Row]:
+        groups: Dict[Tuple, Dict[str, List[Any]]] = {}
+        for row in rows:
+            key = tuple(_value(row, column) for column in self._group_by)
+            values = groups.get(key)
+            if values is None:
+                values = groups[key] = {name: [] for name in self._aggregates}
+            for name, (_, column) in self._aggregates.items():
+                value = row if column is None else _value(row, column)
+                if value is not None:
+                    values[name].append(value)
+
+        result = []
+        for key, values in groups.items():
+            group_row: Row = {str(column): value for column, value in zip(self._group_by, key)}
+            for name, (func, _) in self._aggregates.items():
+                group_row[name] = AGGREGATES[func](values[name])
+            result.append(group_row)
+        return result
+
+    def select(self, *columns: Column) -> List[Any]:
+        """Выполнить запрос и вернуть значения колонок (одна колонка - без кортежа)"""
+        rows = self.execute()
+        if len(columns) == 1:
+            return [_value(row, columns[0]) for row in rows]
+        return [tuple(_value(row, column) for column in columns) for row in rows]
+
+
+# Запросы RK1/RK2, записанные через Query
+
+def _books_in_libraries(books: Iterable[Any], library_books: Iterable[Any]) -> Query:
+    """Книги со связями, в порядке списка книг"""
+    return Query(books, 'b').join(Query(library_books, 'lb'), on=('b.id', 'lb.book_id'))
+
+
+def books_ending_with_a(books: Iterable[Any]) -> List[Any]:
+    """Книги, названия которых заканчиваются на 'а'"""
+    return Query(books, 'b').where('b', lambda b: b.title.endswith('а')).select('b')
+
+
+def library_avg_pages(libraries: Iterable[Any], books: Iterable[Any],
+                      library_books: Iterable[Any]) -> List[Tuple[str, float, int]]:
+    """Среднее количество страниц по библиотекам (через связи), по возрастанию"""
+    return (Query(libraries, 'l')
+            .join(_books_in_libraries(books, library_books), on=('l.id', 'lb.library_id'))
+            .distinct('l.id', 'b.id')
+            .group_by('l.id', 'l.name', avg=('avg', 'b.pages'), count=('count', 'b.id'))
+            .order_by('avg')
+            .select('l.name', 'avg', 'count'))
+
+
+def library_avg_pages_by_book_library(libraries: Iterable[Any], books: Iterable[Any]) -> List[Tuple[str, float, int]]:
+    """Вариант RK1: книги относятся к библиотеке по полю Book.library_id"""
+    return (Query(libraries, 'l')
+            .join(Query(books, 'b'), on=('l.id', 'b.library_id'))
+            .group_by('l.id', 'l.name', avg=('avg', 'b.pages'), count=('count', 'b.id'))
+            .order_by('avg')
+            .select('l.name', 'avg', 'count'))
+
+
+def libraries_starting_with_a_with_books(libraries: Iterable[Any], books: Iterable[Any],
+                                         library_books: Iterable[Any]) -> List[Tuple[Any, List[Any]]]:
+    """Библиотеки с названием на 'А' и их книги (в порядке списка книг)"""
+    return (Query(libraries, 'l')
+            .where('l', lambda l: l.name.startswith('А'))
+            .left_join(_books_in_libraries(books, library_books), on=('l.id', 'lb.library_id'))
+            .distinct('l.id', 'b.id')
+            .group_by('l.id', library=('first', 'l'), books=('collect', 'b'))
+            .select('library', 'books'))
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Set
+
+
+class QueryCache:
+    """LRU-кэш результатов запросов с удалением по изменённой коллекции"""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._depends_on: Dict[Hashable, Iterable[str]] = {}
+        # коллекция -> ключи запросов, которые от неё зависят
+        self._keys_by_collection: Dict[str, Set[Hashable]] = {}
+        # Короткая блокировка только на учёт записей: снимок читают несколько потоков
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, depends_on: Iterable[str], compute: Callable[[], Any]) -> Any:
+        """Вернуть результат из кэша или вычислить и запомнить его"""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        # Вычисление идёт без блокировки, поэтому другие запросы не ждут
+        result = compute()
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = result
+                self._depends_on[key] = depends_on
+                for collection in depends_on:
+                    self._keys_by_collection.setdefault(collection, set()).add(key)
+                if len(self._entries) > self.maxsize:
+                    self._discard(next(iter(self._entries)))
+        return result
+
+    def invalidate(self, collection: str):
+        """Удалить результаты, зависящие от изменённой коллекции"""
+        with self._lock:
+            for key in self._keys_by_collection.pop(collection, ()):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._depends_on.clear()
+            self._keys_by_collection.clear()
+
+    def _discard(self, key: Hashable):
+        if key not in self._entries:
+            return
+        del self._entries[key]
+        for collection in self._depends_on.pop(key):
+            keys = self._keys_by_collection.get(collection)
+            if keys is not None:
+                keys.discard(key)
+
+    def info(self) -> Dict[str, int]:
+        """Статистика кэша: попадания, промахи, размер"""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+def _freeze(value: Any) -> Any:
+    """Списки и кортежи на всех уровнях превращаются в кортежи; записи (Book, Library) остаются"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def cached_query(*depends_on: str):
+    """Декоратор: кэшировать результат метода в self._cache.
+
+    depends_on - имена коллекций, при изменении которых результат устаревает.
+    Результат один раз при вычислении превращается в кортежи (включая вложенные,
+    например списки книг библиотек) и при попадании возвращается без копирования:
+    испортить кэш через него нельзя.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__,) + args + tuple(sorted(kwargs.items()))
+            return self._cache.get_or_compute(key, depends_on, lambda: _freeze(method(self, *args, **kwargs)))
+
+        return wrapper
+
+    return decorator
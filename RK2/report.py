@@ -0,0 +1,75 @@
+import csv
+import json
+from typing import Dict, Iterable, List, Optional, TextIO
+
+CSV_COLUMNS = ["section", "library_id", "library_name", "book_id", "title", "author", "pages"]
+
+
+class BufferedLineWriter:
+    """Копит строки и пишет их в файл крупными блоками вместо print на каждую строку"""
+
+    def __init__(self, out: TextIO, buffer_size: int = 1 << 16):
+        self.out = out
+        self.buffer_size = buffer_size
+        self._lines: List[str] = []
+        self._size = 0
+
+    def write_line(self, line: str):
+        self._lines.append(line)
+        self._size += len(line) + 1
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self.out.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+            self._size = 0
+
+
+def render_all_data(libraries: Iterable, books: Iterable, library_books: Iterable, out: TextIO,
+                    csv_out: Optional[TextIO] = None, jsonl_out: Optional[TextIO] = None):
+    """Вывести все данные так же, как LibrarySystem.print_all_data, за один проход.
+
+    libraries, books, library_books - записи Library, Book, LibraryBook.
+    Дополнительно можно в том же проходе записать те же записи в CSV и/или JSONL.
+    """
+    writer = BufferedLineWriter(out)
+    csv_writer = csv.writer(csv_out, lineterminator="\n") if csv_out is not None else None
+    jsonl_writer = BufferedLineWriter(jsonl_out) if jsonl_out is not None else None
+    if csv_writer:
+        csv_writer.writerow(CSV_COLUMNS)
+
+    def emit(record: Dict[str, object]):
+        if csv_writer:
+            csv_writer.writerow([record.get(column, "") for column in CSV_COLUMNS])
+        if jsonl_writer:
+            jsonl_writer.write_line(json.dumps(record, ensure_ascii=False))
+
+    # При повторе ID берётся первая запись, как в get_library_by_id / get_book_by_id
+    library_names: Dict[int, str] = {}
+    writer.write_line("Библиотеки:")
+    for lib in libraries:
+        library_names.setdefault(lib.id, lib.name)
+        writer.write_line(f"  {lib.id}. {lib.name}")
+        emit({"section": "library", "library_id": lib.id, "library_name": lib.name})
+
+    book_titles: Dict[int, str] = {}
+    writer.write_line("\nКниги:")
+    for book in books:
+        book_titles.setdefault(book.id, book.title)
+        writer.write_line(f"  {book.id}. '{book.title}' - {book.author} ({book.pages} стр.)")
+        emit({"section": "book", "book_id": book.id, "title": book.title,
+              "author": book.author, "pages": book.pages, "library_id": book.library_id})
+
+    writer.write_line("\nСвязи книг с библиотеками:")
+    for lb in library_books:
+        lib_name = library_names.get(lb.library_id, "Неизвестно")
+        book_title = book_titles.get(lb.book_id, "Неизвестно")
+        writer.write_line(f"  Библиотека '{lib_name}' -> Книга '{book_title}'")
+        emit({"section": "relation", "library_id": lb.library_id, "library_name": lib_name,
+              "book_id": lb.book_id, "title": book_title})
+
+    writer.flush()
+    if jsonl_writer:
+        jsonl_writer.flush()
@@ -0,0 +1,179 @@
+"""HTTP/JSON сервис запросов LibrarySystem на asyncio (только стандартная библиотека).
+
+Запуск:
+    python service.py --port 8080
+
+    GET /libraries/avg-pages?offset=0&limit=10
+    GET /libraries/starting-with-a
+    GET /libraries/{id}
+    GET /libraries/{id}/books?offset=0&limit=10
+    GET /books/ending-with-a?offset=0&limit=10
+    GET /books/search?q=толстой&mode=and&library_id=1
+    GET /books/{id}
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import asdict
+from functools import partial
+from http import HTTPStatus
+from itertools import islice
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from library_system import LibrarySystem, create_sample_data
+
+Response = Tuple[HTTPStatus, Any]
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(params: Dict[str, str], name: str, default: Optional[int] = None) -> Optional[int]:
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Параметр {name} должен быть целым числом") from None
+
+
+class LibraryService:
+    """Обработчик HTTP-запросов к LibrarySystem.
+
+    Поиск по ID выполняется прямо в цикле событий, запросы, которые перебирают
+    много данных, - в пуле executor, чтобы не блокировать другие соединения.
+    system может быть LibrarySystem или VersionedLibrarySystem.
+    """
+
+    def __init__(self, system: LibrarySystem, executor: Optional[Executor] = None):
+        self.system = system
+        self.executor = executor or ThreadPoolExecutor()
+
+    async def _offload(self, func: Callable[[], Any]) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func)
+
+    @staticmethod
+    def _page(items, params: Dict[str, str]):
+        offset = _int_param(params, 'offset', 0)
+        limit = _int_param(params, 'limit')
+        return list(islice(items, offset, None if limit is None else offset + limit))
+
+    async def route(self, method: str, path: str, params: Dict[str, str]) -> Response:
+        """Выполнить запрос и вернуть (статус, данные для JSON)"""
+        if method != 'GET':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Поддерживается только GET")
+        parts = [part for part in path.split('/') if part]
+        system = self.system
+
+        if parts == ['libraries', 'avg-pages']:
+            rows = await self._offload(lambda: self._page(system.iter_library_avg_pages(), params))
+            return HTTPStatus.OK, [{'name': name, 'avg_pages': avg, 'count': count} for name, avg, count in rows]
+
+        if parts == ['libraries', 'starting-with-a']:
+            rows = await self._offload(lambda: self._page(system.get_libraries_starting_with_a_with_books(), params))
+            return HTTPStatus.OK, [{'library': asdict(library), 'books': [asdict(book) for book in books]}
+                                   for library, books in rows]
+
+        if parts == ['books', 'ending-with-a']:
+            books = await self._offload(lambda: self._page(system.iter_books_ending_with_a(), params))
+            return HTTPStatus.OK, [asdict(book) for book in books]
+
+        if parts == ['books', 'search']:
+            query = params.get('q', '')
+            search = partial(system.iter_search_books, query, params.get('mode', 'and'),
+                             _int_param(params, 'library_id'))
+            try:
+                books = await self._offload(lambda: self._page(search(), params))
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e)) from None
+            return HTTPStatus.OK, [asdict(book) for book in books]
+
+        if len(parts) == 3 and parts[0] == 'libraries' and parts[2] == 'books':
+            library_id = _int_param({'id': parts[1]}, 'id')
+            books = await self._offload(lambda: self._page(system.iter_books_by_library(library_id), params))
+            return HTTPStatus.OK, [asdict(book) for book in books]
+
+        if len(parts) == 2 and parts[0] in ('libraries', 'books'):
+            item_id = _int_param({'id': parts[1]}, 'id')
+            lookup = system.get_library_by_id if parts[0] == 'libraries' else system.get_book_by_id
+            item = lookup(item_id)
+            if item is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Не найдено")
+            return HTTPStatus.OK, asdict(item)
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Неизвестный адрес")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обслужить соединение; поддерживается keep-alive HTTP/1.1"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    content_length = int(headers.get('content-length', 0) or 0)
+                    if content_length < 0:
+                        raise ValueError(content_length)
+                    if content_length:
+                        await reader.readexactly(content_length)
+                    method, target, version = request_line.decode('latin-1').split()
+                    url = urlsplit(target)
+                    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                    status, payload = await self.route(method, url.path, params)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except ValueError:
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': "Некорректный запрос"}
+                    version = 'HTTP/1.0'
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.AbstractServer:
+        """Запустить сервер и вернуть его (для остановки - server.close())"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+async def _run(host: str, port: int):
+    service = LibraryService(create_sample_data())
+    server = await service.serve(host, port)
+    print(f"Сервис запущен на http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP сервис LibrarySystem")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    asyncio.run(_run(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
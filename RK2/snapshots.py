@@ -0,0 +1,65 @@
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from library_system import Library, Book, LibraryBook, LibrarySystem
+
+# Методы LibrarySystem, изменяющие данные: через VersionedLibrarySystem доступны только в write()
+MUTATORS = frozenset(('add_library', 'remove_library', 'add_book', 'remove_book', 'add_library_book',
+                      'remove_library_book', 'move_library_book', 'bulk_load'))
+
+
+class VersionedLibrarySystem:
+    """LibrarySystem с изоляцией снимков для многопоточного чтения.
+
+    Опубликованная версия (снимок) больше не изменяется, поэтому читатели работают
+    с ней без блокировок. Писатель получает копию, меняет её и публикует как новую
+    версию; читатели, начавшие раньше, продолжают видеть свою версию целиком.
+    Старая версия освобождается сборщиком мусора, как только её никто не держит.
+    Объекты Library/Book/LibraryBook общие для версий и не должны изменяться на месте.
+    """
+
+    def __init__(self, libraries: List[Library], books: List[Book], library_books: List[LibraryBook],
+                 cache_size: int = 128):
+        self.cache_size = cache_size
+        self.version = 0
+        self._write_lock = threading.Lock()
+        self._live_versions: "weakref.WeakValueDictionary[int, LibrarySystem]" = weakref.WeakValueDictionary()
+        self._publish(LibrarySystem(list(libraries), list(books), list(library_books), cache_size))
+
+    def _publish(self, system: LibrarySystem):
+        # Опубликованную версию не изменить даже через ссылку из snapshot() или write()
+        system.freeze()
+        self._live_versions[self.version] = system
+        # Присваивание атрибута атомарно: читатель видит либо старую, либо новую версию
+        self._current = system
+
+    def snapshot(self) -> LibrarySystem:
+        """Текущая версия; её можно читать сколько угодно долго, она не изменится"""
+        return self._current
+
+    @contextmanager
+    def write(self) -> Iterator[LibrarySystem]:
+        """Изменить данные: все изменения в блоке публикуются одной новой версией.
+
+        Если в блоке возникло исключение, версия не публикуется.
+        """
+        with self._write_lock:
+            # Копия разделяет с опубликованной версией всё, что блок не изменит
+            draft = self._current.copy(self.cache_size)
+            yield draft
+            self.version += 1
+            self._publish(draft)
+
+    def live_versions(self) -> List[int]:
+        """Номера версий, которые ещё кем-то используются"""
+        return sorted(self._live_versions.keys())
+
+    def __getattr__(self, name: str):
+        # Запросы без явного снимка выполняются на текущей версии
+        if name == '_current':
+            raise AttributeError(name)
+        if name in MUTATORS:
+            raise AttributeError(f"{name}: опубликованная версия не изменяется, используйте write()")
+        return getattr(self._current, name)
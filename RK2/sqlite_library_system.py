@@ -0,0 +1,178 @@
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+from library_system import Library, Book, LibraryBook
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS libraries (
+    id INTEGER NOT NULL UNIQUE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    pages INTEGER NOT NULL,
+    library_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS library_books (
+    library_id INTEGER NOT NULL,
+    book_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_library_books_library ON library_books (library_id, book_id);
+CREATE INDEX IF NOT EXISTS idx_library_books_book ON library_books (book_id);
+"""
+
+# id не является псевдонимом rowid, поэтому rowid хранит порядок вставки, как в исходных списках
+BOOK_COLUMNS = "b.id, b.title, b.author, b.pages, b.library_id"
+
+
+class SqliteLibrarySystem:
+    """LibrarySystem, хранящий данные в файле SQLite"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def bulk_load(self, libraries: Iterable[Library], books: Iterable[Book],
+                  library_books: Iterable[LibraryBook]):
+        """Загрузить данные одной транзакцией"""
+        with self.connection:
+            # При повторе ID остаётся первая запись, как в индексах LibrarySystem
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO libraries (id, name) VALUES (?, ?)",
+                ((lib.id, lib.name) for lib in libraries))
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO books (id, title, author, pages, library_id) VALUES (?, ?, ?, ?, ?)",
+                ((b.id, b.title, b.author, b.pages, b.library_id) for b in books))
+            self.connection.executemany(
+                "INSERT INTO library_books (library_id, book_id) VALUES (?, ?)",
+                ((lb.library_id, lb.book_id) for lb in library_books))
+
+    def add_library(self, library: Library):
+        """Добавить библиотеку"""
+        self.bulk_load([library], [], [])
+
+    def remove_library(self, library_id: int):
+        """Удалить библиотеку по ID"""
+        with self.connection:
+            self.connection.execute("DELETE FROM libraries WHERE id = ?", (library_id,))
+
+    def add_book(self, book: Book):
+        """Добавить книгу"""
+        self.bulk_load([], [book], [])
+
+    def remove_book(self, book_id: int):
+        """Удалить книгу по ID"""
+        with self.connection:
+            self.connection.execute("DELETE FROM books WHERE id = ?", (book_id,))
+
+    def add_library_book(self, library_book: LibraryBook):
+        """Добавить связь библиотеки с книгой"""
+        self.bulk_load([], [], [library_book])
+
+    def remove_library_book(self, library_id: int, book_id: int):
+        """Удалить связь библиотеки с книгой"""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM library_books WHERE rowid = "
+                "(SELECT rowid FROM library_books WHERE library_id = ? AND book_id = ? ORDER BY rowid LIMIT 1)",
+                (library_id, book_id))
+
+    def get_all_libraries(self) -> List[Library]:
+        """Получить список всех библиотек"""
+        rows = self.connection.execute("SELECT id, name FROM libraries ORDER BY rowid")
+        return [Library(*row) for row in rows]
+
+    def get_all_books(self) -> List[Book]:
+        """Получить список всех книг"""
+        rows = self.connection.execute(f"SELECT {BOOK_COLUMNS} FROM books b ORDER BY b.rowid")
+        return [Book(*row) for row in rows]
+
+    def get_library_books_relations(self) -> List[LibraryBook]:
+        """Получить все связи библиотек с книгами"""
+        rows = self.connection.execute("SELECT library_id, book_id FROM library_books ORDER BY rowid")
+        return [LibraryBook(*row) for row in rows]
+
+    def get_books_ending_with_a(self) -> List[Book]:
+        """Найти книги, названия которых заканчиваются на 'А'"""
+        rows = self.connection.execute(
+            f"SELECT {BOOK_COLUMNS} FROM books b WHERE substr(b.title, -1) = 'а' ORDER BY b.rowid")
+        return [Book(*row) for row in rows]
+
+    def get_library_avg_pages(self) -> List[Tuple[str, float, int]]:
+        """Рассчитать среднее количество страниц в книгах по библиотекам"""
+        rows = self.connection.execute("""
+            SELECT l.name, SUM(b.pages), COUNT(*)
+            FROM libraries l
+            JOIN (SELECT DISTINCT library_id, book_id FROM library_books) lb ON lb.library_id = l.id
+            JOIN books b ON b.id = lb.book_id
+            GROUP BY l.id
+            ORDER BY l.rowid
+        """)
+        result = [(name, total_pages / count, count) for name, total_pages, count in rows]
+
+        # Сортировка по среднему количеству страниц
+        return sorted(result, key=lambda x: x[1])
+
+    def get_libraries_starting_with_a_with_books(self) -> List[Tuple[Library, List[Book]]]:
+        """Найти библиотеки с названием на 'А' и их книги"""
+        libraries_a = [Library(*row) for row in self.connection.execute(
+            "SELECT id, name FROM libraries WHERE substr(name, 1, 1) = 'А' ORDER BY rowid")]
+        books_by_library = {library.id: [] for library in libraries_a}
+
+        rows = self.connection.execute(f"""
+            SELECT DISTINCT lb.library_id, {BOOK_COLUMNS}, b.rowid
+            FROM libraries l
+            JOIN library_books lb ON lb.library_id = l.id
+            JOIN books b ON b.id = lb.book_id
+            WHERE substr(l.name, 1, 1) = 'А'
+            ORDER BY b.rowid
+        """)
+        for library_id, *book, _ in rows:
+            books_by_library[library_id].append(Book(*book))
+
+        return [(library, books_by_library[library.id]) for library in libraries_a]
+
+    def _get_books_by_library(self, library_id: int) -> List[Book]:
+        """Вспомогательный метод: получить книги по ID библиотеки"""
+        rows = self.connection.execute(f"""
+            SELECT {BOOK_COLUMNS} FROM books b
+            WHERE b.id IN (SELECT book_id FROM library_books WHERE library_id = ?)
+            ORDER BY b.rowid
+        """, (library_id,))
+        return [Book(*row) for row in rows]
+
+    def get_library_by_id(self, library_id: int) -> Optional[Library]:
+        """Получить библиотеку по ID"""
+        row = self.connection.execute("SELECT id, name FROM libraries WHERE id = ?", (library_id,)).fetchone()
+        return Library(*row) if row else None
+
+    def get_book_by_id(self, book_id: int) -> Optional[Book]:
+        """Получить книгу по ID"""
+        row = self.connection.execute(f"SELECT {BOOK_COLUMNS} FROM books b WHERE b.id = ?", (book_id,)).fetchone()
+        return Book(*row) if row else None
+
+    def print_all_data(self):
+        """Вывести все данные"""
+        print("Библиотеки:")
+        for lib in self.get_all_libraries():
+            print(f"  {lib.id}. {lib.name}")
+
+        print("\nКниги:")
+        for book in self.get_all_books():
+            print(f"  {book.id}. '{book.title}' - {book.author} ({book.pages} стр.)")
+
+        print("\nСвязи книг с библиотеками:")
+        rows = self.connection.execute("""
+            SELECT COALESCE(l.name, 'Неизвестно'), COALESCE(b.title, 'Неизвестно')
+            FROM library_books lb
+            LEFT JOIN libraries l ON l.id = lb.library_id
+            LEFT JOIN books b ON b.id = lb.book_id
+            ORDER BY lb.rowid
+        """)
+        for lib_name, book_title in rows:
+            print(f"  Библиотека '{lib_name}' -> Книга '{book_title}'")
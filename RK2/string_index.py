@@ -0,0 +1,87 @@
+from bisect import bisect_left
+from typing import Hashable, Iterable, Iterator, List, Tuple
+
+# Символ больше любого другого: граница диапазона ключей с общим префиксом
+_MAX_CHAR = '\U0010ffff'
+
+
+class SortedKeyIndex:
+    """Отсортированный индекс строк для поиска по префиксу или суффиксу.
+
+    Хранит записи (ключ без учёта регистра, порядковый номер, id, исходная строка).
+    Поиск - два бинарных поиска и срез, т.е. время пропорционально размеру ответа.
+    Для поиска по суффиксу строки хранятся развёрнутыми (reverse=True).
+
+    Записи лежат в нескольких отсортированных прогонах, размеры которых убывают
+    не медленнее, чем вдвое (как разряды двоичного счётчика). Новые записи
+    становятся отдельным прогоном, а прогоны не больше него сливаются с ним,
+    поэтому каждая запись участвует в O(log n) слияниях, и добавление порции
+    не пересортирует весь индекс. Поиск просматривает O(log n) прогонов.
+    """
+
+    def __init__(self, reverse: bool = False):
+        self.reverse = reverse
+        self._runs: List[List[Tuple[str, int, Hashable, str]]] = []
+
+    def copy(self) -> 'SortedKeyIndex':
+        """Копия индекса (записи - неизменяемые кортежи, копируются только списки)"""
+        result = SortedKeyIndex(self.reverse)
+        result._runs = [list(run) for run in self._runs]
+        return result
+
+    def _key(self, value: str) -> str:
+        return value[::-1] if self.reverse else value
+
+    def _entry(self, value: str, order: int, item_id: Hashable) -> Tuple[str, int, Hashable, str]:
+        key = self._key(value)
+        return (key.casefold(), order, item_id, key)
+
+    def _add_run(self, run: List[Tuple[str, int, Hashable, str]]):
+        # Сливаем с меньшими или равными прогонами: sort() находит в сумме два готовых отрезка
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = self._runs.pop() + run
+            run.sort()
+        if run:
+            self._runs.append(run)
+
+    def add(self, value: str, order: int, item_id: Hashable):
+        """Добавить строку; order задаёт порядок выдачи результатов"""
+        self._add_run([self._entry(value, order, item_id)])
+
+    def extend(self, items: Iterable[Tuple[str, int, Hashable]]):
+        """Добавить много строк сразу: одна сортировка порции и слияние прогонов"""
+        run = [self._entry(value, order, item_id) for value, order, item_id in items]
+        run.sort()
+        self._add_run(run)
+
+    def remove(self, value: str, order: int, item_id: Hashable):
+        """Удалить ранее добавленную строку"""
+        entry = self._entry(value, order, item_id)
+        for run in self._runs:
+            i = bisect_left(run, entry)
+            if i < len(run) and run[i] == entry:
+                del run[i]
+                if not run:
+                    self._runs.remove(run)
+                return
+
+    def iter_matches(self, part: str, ignore_case: bool = False) -> Iterator[Tuple[int, Hashable]]:
+        """Лениво перебрать (порядковый номер, id) строк с данным префиксом
+        (или суффиксом при reverse=True), без копирования диапазонов.
+        Порядковые номера идут по возрастанию только внутри прогона."""
+        key = self._key(part)
+        folded = key.casefold()
+        for run in self._runs:
+            lo = bisect_left(run, (folded,))
+            hi = bisect_left(run, (folded + _MAX_CHAR,))
+            for i in range(lo, hi):
+                entry = run[i]
+                if ignore_case or entry[3].startswith(key):
+                    yield entry[1], entry[2]
+
+    def search(self, part: str, ignore_case: bool = False) -> List[Hashable]:
+        """Найти id строк с данным префиксом (или суффиксом при reverse=True)"""
+        return [item_id for _, item_id in sorted(self.iter_matches(part, ignore_case), key=lambda match: match[0])]
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
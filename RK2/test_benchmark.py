@@ -0,0 +1,35 @@
+import unittest
+from benchmark import find_regressions, generate_data, run_benchmark, run_parallel_benchmark
+
+class TestBenchmark(unittest.TestCase):
+    """Тесты для замеров производительности"""
+
+    def test_generate_data_is_deterministic(self):
+        """Тест 1: Генератор выдаёт одинаковые данные для одного seed"""
+        self.assertEqual(generate_data(500, seed=1), generate_data(500, seed=1))
+        self.assertNotEqual(generate_data(500, seed=1), generate_data(500, seed=2))
+
+    def test_run_benchmark_measures_every_query(self):
+        """Тест 2: Замеряются все запросы и пиковая память"""
+        results = run_benchmark(200, repeat=1)
+        for name in ("get_library_avg_pages", "_get_books_by_library", "print_all_data",
+                     "get_library_by_id", "get_book_by_id", "peak_memory"):
+            self.assertIn(name, results)
+        self.assertGreater(results["peak_memory"], 0)
+        self.assertLess(results["relation_bytes"], results["library_book_bytes"])
+
+    def test_run_parallel_benchmark(self):
+        """Дополнительный тест: замер агрегатов для каждого числа процессов"""
+        results = run_parallel_benchmark(300, [1, 2], repeat=1)
+        self.assertEqual(set(results), {"serial_page_stats", "parallel_page_stats_1", "parallel_page_stats_2"})
+
+    def test_find_regressions(self):
+        """Тест 3: Ухудшение больше порога обнаруживается"""
+        baseline = {"1000": {"get_library_avg_pages": 1.0, "print_all_data": 1.0}}
+        results = {"1000": {"get_library_avg_pages": 1.1, "print_all_data": 1.5}}
+        regressions = find_regressions(results, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("print_all_data", regressions[0])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from benchmark import generate_data
+from library_system import Library, Book, LibraryBook, LibrarySystem, create_sample_data
+from binary_snapshot import MappedLibrarySystem, save_snapshot
+
+class TestBinarySnapshot(unittest.TestCase):
+    """Тесты для двоичного снимка"""
+
+    def setUp(self):
+        """Сохранить пример данных во временный файл"""
+        self.reference = create_sample_data()
+        self.reference.add_library_book(LibraryBook(9, 100))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "library.snap")
+        save_snapshot(self.path, self.reference.libraries, self.reference.books,
+                      self.reference.library_books)
+        self.snapshot = MappedLibrarySystem(self.path)
+
+    def tearDown(self):
+        self.snapshot.close()
+        self.tmp.cleanup()
+
+    def test_records_round_trip(self):
+        """Тест 1: Записи после загрузки совпадают с исходными"""
+        self.assertEqual(list(self.snapshot.libraries), self.reference.libraries)
+        self.assertEqual(list(self.snapshot.books), self.reference.books)
+        self.assertEqual(list(self.snapshot.library_books), self.reference.library_books)
+        self.assertEqual(self.snapshot.books[-1], self.reference.books[-1])
+
+    def test_queries_match_library_system(self):
+        """Тест 2: Запросы совпадают с LibrarySystem"""
+        self.assertEqual(self.snapshot.get_book_by_id(4), self.reference.get_book_by_id(4))
+        self.assertIsNone(self.snapshot.get_library_by_id(9))
+        self.assertEqual(self.snapshot.get_books_ending_with_a(), list(self.reference.get_books_ending_with_a()))
+        self.assertEqual(self.snapshot.get_library_avg_pages(), list(self.reference.get_library_avg_pages()))
+        self.assertEqual(self.snapshot.get_libraries_starting_with_a_with_books(),
+                         [(library, list(books)) for library, books in self.reference.get_libraries_starting_with_a_with_books()])
+
+        expected, actual = io.StringIO(), io.StringIO()
+        with redirect_stdout(expected):
+            self.reference.print_all_data()
+        self.snapshot.print_all_data(actual)
+        self.assertEqual(actual.getvalue(), expected.getvalue())
+
+    def test_generated_data_with_duplicates(self):
+        """Тест 3: Совпадение на сгенерированных данных и повторах ID"""
+        libraries, books, library_books = generate_data(2000, seed=5)
+        books.append(Book(1, "Дубликат", "Автор", 1, 1))
+        libraries.append(Library(1, "Дубликат"))
+        system = LibrarySystem(libraries, books, library_books)
+        path = os.path.join(self.tmp.name, "generated.snap")
+        save_snapshot(path, libraries, books, library_books)
+
+        with MappedLibrarySystem(path) as snapshot:
+            self.assertEqual(snapshot.get_library_avg_pages(), list(system.get_library_avg_pages()))
+            self.assertEqual(snapshot.get_book_by_id(1), system.get_book_by_id(1))
+            self.assertEqual(snapshot._get_books_by_library(7), system._get_books_by_library(7))
+            self.assertEqual(snapshot.to_library_system().get_library_avg_pages(),
+                             system.get_library_avg_pages())
+
+    def test_rejects_foreign_file(self):
+        """Дополнительный тест: файл другого формата не открывается"""
+        path = os.path.join(self.tmp.name, "other.bin")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            MappedLibrarySystem(path)
+
+    def test_rejects_truncated_file(self):
+        """Дополнительный тест: обрезанный или дописанный снимок не открывается"""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        damages = {"без последних 30 байт": data[:-30], "200 байт": data[:200],
+                   "только заголовок": data[:40], "лишние байты": data + b"\0"}
+        for name, damaged in damages.items():
+            with self.subTest(name):
+                path = os.path.join(self.tmp.name, "damaged.snap")
+                with open(path, "wb") as f:
+                    f.write(damaged)
+                with self.assertRaises(ValueError):
+                    MappedLibrarySystem(path)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
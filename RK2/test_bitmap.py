@@ -0,0 +1,82 @@
+import random
+import unittest
+from unittest import mock
+import bitmap
+from bitmap import BitmapRelationStore, RoaringBitmap
+
+class TestRoaringBitmap(unittest.TestCase):
+    """Тесты для сжатых битовых карт"""
+
+    def setUp(self):
+        """Случайные множества с разреженными и плотными контейнерами"""
+        rng = random.Random(1)
+        self.a = set(rng.randrange(0, 300000) for _ in range(20000))
+        self.b = set(rng.randrange(0, 300000) for _ in range(3000)) | set(range(70000))
+
+    def test_set_operations_match_python_sets(self):
+        """Тест 1: Пересечение и объединение совпадают с set"""
+        ra, rb = RoaringBitmap(self.a), RoaringBitmap(self.b)
+        self.assertEqual(list(ra & rb), sorted(self.a & self.b))
+        self.assertEqual(list(ra | rb), sorted(self.a | self.b))
+        self.assertEqual(len(ra), len(self.a))
+
+    def test_discard_and_contains(self):
+        """Тест 2: Удаление и проверка принадлежности"""
+        bitmap = RoaringBitmap(self.b)
+        removed = sorted(self.b)[::2]
+        for value in removed:
+            bitmap.discard(value)
+        self.assertEqual(list(bitmap), sorted(self.b - set(removed)))
+        self.assertNotIn(removed[0], bitmap)
+        self.assertNotIn(-1, bitmap)
+
+class TestBitmapRelationStore(unittest.TestCase):
+    """Тесты для хранилища связей"""
+
+    def test_reverse_map_matches_pairs(self):
+        """Тест 3: Обратная карта совпадает с множеством пар при добавлениях, удалениях и слияниях"""
+        rng = random.Random(2)
+        store = BitmapRelationStore()
+        pairs = set()
+        # Маленький порог, чтобы дельта много раз вливалась в столбцы
+        with mock.patch.object(bitmap, "_COMPACT_MIN", 8):
+            for _ in range(3000):
+                pair = (rng.randrange(20), rng.randrange(200))
+                if rng.random() < 0.3:
+                    store.remove(*pair)
+                    pairs.discard(pair)
+                else:
+                    store.add(*pair)
+                    pairs.add(pair)
+
+        for book_id in range(200):
+            expected = sorted(library_id for library_id, b in pairs if b == book_id)
+            self.assertEqual(list(store.libraries_of(book_id)), expected)
+        for library_id in range(20):
+            self.assertEqual(list(store.books_of(library_id)),
+                             sorted(b for l, b in pairs if l == library_id))
+
+    def test_copy_is_independent(self):
+        """Тест 4: Изменения копии не видны в исходном хранилище и наоборот"""
+        # Arrange
+        store = BitmapRelationStore()
+        for pair in ((1, 10), (2, 10), (1, 11)):
+            store.add(*pair)
+        store.compact()
+        copy = store.copy()
+
+        # Act
+        copy.remove(2, 10)
+        copy.add(3, 11)
+        store.add(4, 10)
+
+        # Assert
+        self.assertEqual(list(store.libraries_of(10)), [1, 2, 4])
+        self.assertEqual(list(store.libraries_of(11)), [1])
+        self.assertEqual(list(copy.libraries_of(10)), [1])
+        self.assertEqual(list(copy.libraries_of(11)), [1, 3])
+        self.assertIn(10, store.books_of(2))
+        self.assertNotIn(10, copy.books_of(2))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
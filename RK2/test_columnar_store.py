@@ -0,0 +1,81 @@
+import unittest
+from unittest import mock
+import columnar_store
+from benchmark import generate_data
+from library_system import Book, LibraryBook, LibrarySystem, create_sample_data
+from columnar_store import ColumnarLibrarySystem, StringTable
+
+class TestColumnarLibrarySystem(unittest.TestCase):
+    """Тесты для столбцового хранилища книг"""
+
+    def setUp(self):
+        """Настройка тестовых данных перед каждым тестом"""
+        self.reference = create_sample_data()
+        self.system = ColumnarLibrarySystem(self.reference.libraries,
+                                            self.reference.books,
+                                            self.reference.library_books)
+
+    def test_avg_pages_matches_library_system(self):
+        """Тест 1: Средние значения совпадают с LibrarySystem"""
+        self.assertEqual(self.system.get_library_avg_pages(),
+                         list(self.reference.get_library_avg_pages()))
+
+    def test_page_stats_python_and_vectorized_agree(self):
+        """Тест 2: Агрегаты одинаковы в чистом Python и векторизованном режиме"""
+        # Arrange
+        expected = {1: (1225 + 320 + 672, 3, 320, 1225)}
+
+        # Act
+        stats = self.system._page_stats_python()
+
+        # Assert
+        self.assertEqual(stats[1], expected[1])
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy не установлен")
+        self.assertEqual(self.system._page_stats_numpy(), stats)
+
+    def test_queries_match_library_system(self):
+        """Тест 3: Остальные запросы совпадают с LibrarySystem"""
+        self.assertEqual(self.system.get_books_ending_with_a(),
+                         list(self.reference.get_books_ending_with_a()))
+        self.assertEqual(self.system.get_libraries_starting_with_a_with_books(),
+                         [(library, list(books)) for library, books in self.reference.get_libraries_starting_with_a_with_books()])
+        self.assertEqual(self.system.get_book_by_id(4), self.reference.get_book_by_id(4))
+        self.assertIsNone(self.system.get_book_by_id(100))
+
+    def test_string_table_dedupe(self):
+        """Дополнительный тест: повторяющиеся строки хранятся один раз"""
+        table = StringTable(dedupe=True)
+        first = table.add("Л. Толстой")
+        self.assertEqual(table.add("Л. Толстой"), first)
+        self.assertEqual(table.get(first), "Л. Толстой")
+        self.assertEqual(len(table), 1)
+
+    def test_lookups_follow_appends(self):
+        """Дополнительный тест: поиск по ID и книги библиотеки после добавлений, с numpy и без"""
+        libraries, books, library_books = generate_data(500, seed=2)
+        for numpy_module in (columnar_store.np, None):
+            with self.subTest(numpy=numpy_module is not None), mock.patch.object(columnar_store, "np", numpy_module):
+                # Arrange
+                reference = LibrarySystem(list(libraries), books[:300], library_books[:400])
+                system = ColumnarLibrarySystem(list(libraries), books[:300], library_books[:400])
+
+                # Act: часть книг ищется в хвосте без индекса, часть - после перестроения
+                for book in books[300:] + [Book(books[0].id, "Дубль", "Автор", 1, 1)]:
+                    system.add_book(book)
+                    reference.add_book(book)
+                    self.assertEqual(system.get_book_by_id(book.id), reference.get_book_by_id(book.id))
+                system.add_library_book(LibraryBook(libraries[0].id, books[-1].id))
+                reference.add_library_book(LibraryBook(libraries[0].id, books[-1].id))
+
+                # Assert
+                for book_id in (books[0].id, books[350].id, books[-1].id, -1):
+                    self.assertEqual(system.get_book_by_id(book_id), reference.get_book_by_id(book_id))
+                for library in libraries:
+                    self.assertEqual(system._get_books_by_library(library.id),
+                                     reference._get_books_by_library(library.id))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -121,5 +121,251 @@ class TestLibrarySystem(unittest.TestCase):
         self.assertEqual(book.title, "Война и мир",
                         "Название книги должно быть 'Война и мир'")
 
+    def test_indexes_follow_mutations(self):
+        """Дополнительный тест: индексы обновляются при добавлении и удалении"""
+        # Arrange
+        self.system.add_library(Library(5, "Архив"))
+        self.system.add_book(Book(8, "Азбука", "В. Даль", 100, 5))
+
+        # Act
+        self.system.add_library_book(LibraryBook(5, 8))
+
+        # Assert
+        self.assertEqual(self.system.get_library_by_id(5).name, "Архив")
+        self.assertEqual(self.system.get_book_by_id(8).title, "Азбука")
+        self.assertEqual([b.id for b in self.system._get_books_by_library(5)], [8])
+
+        self.system.remove_library_book(5, 8)
+        self.assertEqual(self.system._get_books_by_library(5), [])
+
+        self.system.remove_book(8)
+        self.system.remove_library(5)
+        self.assertIsNone(self.system.get_book_by_id(8))
+        self.assertIsNone(self.system.get_library_by_id(5))
+
+    def test_duplicate_relation_needs_two_removals(self):
+        """Дополнительный тест: повтор связи учитывается, книга уходит после второго удаления"""
+        # Arrange
+        self.system.add_library_book(LibraryBook(3, 4))
+
+        # Act & Assert
+        self.system.remove_library_book(3, 4)
+        self.assertEqual([b.id for b in self.system._get_books_by_library(3)], [4])
+        self.assertEqual(self.system.search_books("мастер", library_id=3)[0].id, 4)
+
+        self.system.remove_library_book(3, 4)
+        self.assertEqual(self.system._get_books_by_library(3), [])
+        self.assertEqual(self.system.search_books("мастер", library_id=3), ())
+
+    def test_books_by_library_keep_books_order(self):
+        """Дополнительный тест: книги библиотеки идут в порядке списка книг"""
+        # Arrange & Act
+        books = self.system._get_books_by_library(2)
+
+        # Assert
+        self.assertEqual([book.id for book in books], [1, 2, 5])
+
+    def test_query_cache_hits_and_invalidation(self):
+        """Дополнительный тест: кэш запросов и его сброс при изменении данных"""
+        # Arrange & Act
+        first = self.system.get_library_avg_pages()
+        second = self.system.get_library_avg_pages()
+        self.system.get_books_ending_with_a()
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(self.system.cache_info()["hits"], 1)
+        self.assertEqual(self.system.cache_info()["misses"], 2)
+
+        # Новая связь сбрасывает только зависящие от связей запросы
+        self.system.add_library_book(LibraryBook(3, 7))
+        self.system.get_books_ending_with_a()
+        self.assertEqual(self.system.cache_info()["hits"], 2)
+
+        updated = dict((name, count) for name, _, count in self.system.get_library_avg_pages())
+        self.assertEqual(updated["Городская центральная библиотека"], 2)
+        self.assertEqual(self.system.cache_info()["misses"], 3)
+
+    def test_query_cache_result_is_immutable(self):
+        """Дополнительный тест: результат из кэша неизменяемый и отдаётся без копирования"""
+        # Arrange
+        result = self.system.get_libraries_starting_with_a_with_books()
+
+        # Act
+        again = self.system.get_libraries_starting_with_a_with_books()
+
+        # Assert
+        self.assertIs(again, result)
+        with self.assertRaises(TypeError):
+            result[0][1][0] = None
+        with self.assertRaises(AttributeError):
+            result.clear()
+        self.assertEqual([len(books) for _, books in again], [3, 3, 2])
+        self.assertEqual(self.system.cache_info()["hits"], 1)
+
+    def test_query_cache_is_bounded(self):
+        """Дополнительный тест: размер кэша ограничен"""
+        system = LibrarySystem(self.system.libraries, self.system.books,
+                               self.system.library_books, cache_size=1)
+        system.get_library_avg_pages()
+        system.get_books_ending_with_a()
+        system.get_library_avg_pages()
+        self.assertEqual(system.cache_info()["size"], 1)
+        self.assertEqual(system.cache_info()["hits"], 0)
+
+    def test_title_suffix_and_name_prefix(self):
+        """Дополнительный тест: поиск по суффиксу названия и префиксу имени"""
+        # Arrange & Act
+        books = self.system.books_with_title_suffix("ина")
+        libraries = self.system.libraries_with_name_prefix("абонемент", ignore_case=True)
+
+        # Assert
+        self.assertEqual([book.title for book in books], ["Анна Каренина", "Евгения Онегина"])
+        self.assertEqual([lib.id for lib in libraries], [2, 4])
+        self.assertEqual(self.system.libraries_with_name_prefix("абонемент"), ())
+        self.assertEqual(len(self.system.books_with_title_suffix("МИР", ignore_case=True)), 1)
+
+        # Индекс обновляется при добавлении и удалении
+        self.system.add_book(Book(8, "Малина", "И. Бахман", 200, 1))
+        self.assertEqual(self.system.books_with_title_suffix("ина")[-1].id, 8)
+        self.system.remove_book(2)
+        self.assertEqual([book.id for book in self.system.books_with_title_suffix("ина")], [3, 8])
+
+    def test_search_books(self):
+        """Дополнительный тест: полнотекстовый поиск по названию и автору"""
+        # Arrange & Act
+        tolstoy = self.system.search_books("толстой")
+        war_by_tolstoy = self.system.search_books("ТОЛСТОЙ мир")
+        either = self.system.search_books("пушкин эйнштейн", mode="or")
+        in_library = self.system.search_books("толстой", library_id=1)
+
+        # Assert
+        self.assertEqual([book.id for book in tolstoy], [1, 2])
+        self.assertEqual([book.id for book in war_by_tolstoy], [1])
+        self.assertEqual([book.id for book in either], [3, 6])
+        self.assertEqual([book.id for book in in_library], [1])
+
+        self.system.remove_book(1)
+        self.assertEqual([book.id for book in self.system.search_books("толстой")], [2])
+
+    def test_relation_set_operations(self):
+        """Дополнительный тест: пересечение и объединение книг библиотек"""
+        # Arrange
+        libraries_a = [lib.id for lib in self.system.libraries_with_name_prefix("А")]
+
+        # Act
+        common = self.system.books_in_all_libraries([1, 2])
+        any_a = self.system.books_in_any_library(libraries_a)
+        holders = self.system.libraries_with_book(5)
+
+        # Assert
+        self.assertEqual([book.id for book in common], [1, 5])
+        self.assertEqual([book.id for book in any_a], [1, 2, 3, 5, 6, 7])
+        self.assertEqual([lib.id for lib in holders], [1, 2])
+
+        self.system.remove_library_book(1, 5)
+        self.assertEqual([lib.id for lib in self.system.libraries_with_book(5)], [2])
+
+    def test_move_missing_relation_is_rejected(self):
+        """Дополнительный тест: нельзя перенести книгу из библиотеки, где её нет"""
+        with self.assertRaisesRegex(ValueError, "Книги 7 нет в библиотеке 1"):
+            self.system.move_library_book(7, 1, 3)
+        self.assertEqual([lib.id for lib in self.system.libraries_with_book(7)], [4])
+
+    def test_avg_pages_follow_mutations(self):
+        """Дополнительный тест: средние пересчитываются при изменениях"""
+        # Arrange
+        self.system.add_book(Book(8, "Азбука", "В. Даль", 100, 3))
+        self.system.add_library_book(LibraryBook(3, 8))
+
+        # Act
+        self.system.move_library_book(7, 4, 3)
+        self.system.remove_book(1)
+
+        # Assert
+        expected = {}
+        for library in self.system.libraries:
+            books = self.system._get_books_by_library(library.id)
+            expected[library.name] = (sum(book.pages for book in books) / len(books), len(books))
+        actual = self.system.get_library_avg_pages()
+        self.assertEqual({name: (avg, count) for name, avg, count in actual}, expected)
+        self.assertEqual([row[1] for row in actual], sorted(row[1] for row in actual))
+
+        top = self.system.top_libraries_by_avg_pages(2)
+        self.assertEqual(top, list(actual[::-1][:2]))
+
+    def test_iterator_queries_with_pagination(self):
+        """Дополнительный тест: ленивые запросы с offset/limit и курсором"""
+        # Arrange
+        all_rows = list(self.system.get_library_avg_pages())
+
+        # Act
+        first_page = list(self.system.iter_library_avg_pages(limit=2))
+        library_id = self.system.libraries_with_name_prefix(first_page[-1][0])[0].id
+        cursor = self.system.avg_pages_cursor(library_id)
+        second_page = list(self.system.iter_library_avg_pages(after=cursor))
+
+        # Assert
+        self.assertEqual(first_page + second_page, all_rows)
+        self.assertEqual(list(self.system.iter_library_avg_pages(offset=1, limit=1)), all_rows[1:2])
+
+        books = list(self.system.iter_books_ending_with_a(after=self.system.book_cursor(2)))
+        self.assertEqual([book.id for book in books], [3, 4])
+        self.assertEqual([book.id for book in self.system.iter_books_by_library(2, offset=1)], [2, 5])
+        self.assertEqual([book.id for book in self.system.iter_books_by_library(2, offset=1, limit=1)], [2])
+
+        libraries = tuple((lib, tuple(books)) for lib, books in
+                          self.system.iter_libraries_starting_with_a_with_books())
+        self.assertEqual(libraries, self.system.get_libraries_starting_with_a_with_books())
+
+    def test_cursor_survives_deleted_item(self):
+        """Дополнительный тест: курсор работает, даже если последний элемент страницы удалён"""
+        # Arrange
+        page = list(self.system.iter_search_books("толстой", limit=1))
+        book_cursor = self.system.book_cursor(page[-1].id)
+        library_cursor = self.system.avg_pages_cursor(3)
+        rows_after = list(self.system.iter_library_avg_pages(after=library_cursor))
+
+        # Act
+        self.system.remove_library(3)
+        rows_after_removal = list(self.system.iter_library_avg_pages(after=library_cursor))
+        self.system.remove_book(page[-1].id)
+
+        # Assert
+        self.assertEqual(rows_after_removal, rows_after)
+        self.assertEqual([book.id for book in self.system.iter_search_books("толстой", after=book_cursor)], [2])
+        self.assertEqual([book.id for book in self.system.iter_books_by_library(2, after=book_cursor)], [2, 5])
+
+    def test_bulk_load_in_chunks_matches_constructor(self):
+        """Дополнительный тест: загрузка порциями даёт те же индексы, revision растёт раз на порцию"""
+        # Arrange
+        from benchmark import generate_data
+        libraries, books, library_books = generate_data(600, seed=4)
+        reference = LibrarySystem(libraries, books, library_books)
+        system = LibrarySystem([], [], [])
+
+        # Act
+        revisions = []
+        for start in range(0, 600, 70):
+            system.bulk_load(libraries[start // 100:start // 100 + 1], books[start:start + 70],
+                             library_books[start * 3 // 2:(start + 70) * 3 // 2])
+            revisions.append(system.revision)
+
+        # Assert
+        self.assertEqual(revisions, list(range(1, len(revisions) + 1)))
+        self.assertEqual(system.library_books, reference.library_books)
+        self.assertEqual(system.get_library_avg_pages(), reference.get_library_avg_pages())
+        self.assertEqual(system.get_books_ending_with_a(), reference.get_books_ending_with_a())
+        self.assertEqual(system.books_with_title_suffix("а", ignore_case=True),
+                         reference.books_with_title_suffix("а", ignore_case=True))
+        self.assertEqual(system.libraries_with_name_prefix("А"), reference.libraries_with_name_prefix("А"))
+
+        # Индексы после пакетной загрузки обновляются и поштучно
+        system.remove_book(books[0].id)
+        reference.remove_book(books[0].id)
+        self.assertEqual(system.books_with_title_suffix("а", ignore_case=True),
+                         reference.books_with_title_suffix("а", ignore_case=True))
+        self.assertEqual(system.get_library_avg_pages(), reference.get_library_avg_pages())
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,96 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import asdict
+from library_system import LibrarySystem, create_sample_data
+from loader import load_library_system
+from sqlite_library_system import SqliteLibrarySystem
+
+class TestLoader(unittest.TestCase):
+    """Тесты для потоковой загрузки данных из файлов"""
+
+    def setUp(self):
+        """Записать пример данных в CSV и JSONL"""
+        self.reference = create_sample_data()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.libraries_path = self._write_csv("libraries.csv", self.reference.libraries)
+        self.books_path = self._write_jsonl("books.jsonl", self.reference.books)
+        self.relations_path = self._write_csv("library_books.csv", self.reference.library_books)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_csv(self, name, records):
+        path = os.path.join(self.tmp.name, name)
+        rows = [asdict(record) for record in records]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def _write_jsonl(self, name, records):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        return path
+
+    def test_load_in_chunks(self):
+        """Тест 1: Загрузка порциями даёт те же данные и сообщает о прогрессе"""
+        # Arrange
+        system = LibrarySystem([], [], [])
+        progress = []
+
+        # Act
+        load_library_system(system, self.libraries_path, self.books_path, self.relations_path,
+                            chunk_size=2, progress=lambda path, n: progress.append((os.path.basename(path), n)))
+
+        # Assert
+        self.assertEqual(system.books, self.reference.books)
+        self.assertEqual(system.library_books, self.reference.library_books)
+        self.assertEqual(system.get_library_avg_pages(), self.reference.get_library_avg_pages())
+        self.assertIn(("books.jsonl", 7), progress)
+        self.assertIn(("library_books.csv", 8), progress)
+
+    def test_load_into_sqlite(self):
+        """Тест 2: Загрузка в SqliteLibrarySystem"""
+        system = SqliteLibrarySystem()
+        load_library_system(system, self.libraries_path, self.books_path, self.relations_path)
+        self.assertEqual(system.get_all_books(), self.reference.books)
+        system.close()
+
+    def test_invalid_type_is_reported(self):
+        """Тест 3: Неверный тип поля приводит к ошибке с номером строки"""
+        with open(self.books_path, "a", encoding="utf-8") as f:
+            f.write('{"id": 8, "title": "Азбука", "author": "В. Даль", "pages": "много", "library_id": 1}\n')
+
+        with self.assertRaisesRegex(ValueError, ":8: поле 'pages'"):
+            load_library_system(LibrarySystem([], [], []), self.libraries_path,
+                                self.books_path, self.relations_path)
+
+    def test_jsonl_numbers_are_not_converted(self):
+        """Дополнительный тест: В JSONL дробное число и число в строке - ошибка, а не приведение"""
+        for line in ('{"id": 8, "title": "Азбука", "author": "В. Даль", "pages": 12.9, "library_id": 1}\n',
+                     '{"id": "8", "title": "Азбука", "author": "В. Даль", "pages": 12, "library_id": 1}\n'):
+            path = self._write_jsonl("extra.jsonl", self.reference.books)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+            with self.assertRaisesRegex(ValueError, ":8: поле"):
+                load_library_system(LibrarySystem([], [], []), self.libraries_path,
+                                    path, self.relations_path)
+
+    def test_unknown_foreign_key_is_reported(self):
+        """Тест 4: Связь с несуществующей книгой приводит к ошибке"""
+        with open(self.relations_path, "a", encoding="utf-8") as f:
+            f.write("1,100\n")
+
+        with self.assertRaisesRegex(ValueError, "книга 100 не найдена"):
+            load_library_system(LibrarySystem([], [], []), self.libraries_path,
+                                self.books_path, self.relations_path)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+from benchmark import generate_data
+from library_system import Book, LibraryBook, LibrarySystem, create_sample_data
+import parallel
+from parallel import ParallelLibraryQueries
+
+class TestParallelLibraryQueries(unittest.TestCase):
+    """Тесты для параллельного расчёта агрегатов"""
+
+    def test_avg_pages_match_serial_on_sample(self):
+        """Тест 1: Результат совпадает с последовательным расчётом"""
+        system = create_sample_data()
+        with ParallelLibraryQueries(system, workers=2) as queries:
+            self.assertEqual(queries.get_library_avg_pages(), list(system.get_library_avg_pages()))
+
+    def test_avg_pages_match_serial_on_generated_data(self):
+        """Тест 2: Совпадение на сгенерированных данных с повторами связей"""
+        system = LibrarySystem(*generate_data(5000, seed=3))
+        with ParallelLibraryQueries(system, workers=3) as queries:
+            self.assertEqual(queries.get_library_avg_pages(), list(system.get_library_avg_pages()))
+            stats = queries.library_page_stats()
+
+        books = system._get_books_by_library(1)
+        pages = [book.pages for book in books]
+        self.assertEqual(stats[1], (sum(pages), len(pages), min(pages), max(pages)))
+
+    def test_shards_follow_mutations(self):
+        """Дополнительный тест: после изменения системы группы перестраиваются"""
+        system = create_sample_data()
+        with ParallelLibraryQueries(system, workers=2) as queries:
+            queries.get_library_avg_pages()
+            system.add_book(Book(8, "Азбука", "В. Даль", 100, 3))
+            system.add_library_book(LibraryBook(3, 8))
+            system.remove_library_book(1, 5)
+            self.assertEqual(queries.get_library_avg_pages(), list(system.get_library_avg_pages()))
+
+    def test_shard_stats_without_numpy(self):
+        """Дополнительный тест: расчёт группы без numpy совпадает с расчётом через numpy"""
+        system = LibrarySystem(*generate_data(2000, seed=5))
+        with ParallelLibraryQueries(system, workers=2) as queries:
+            for shm, n in queries._shards:
+                expected = parallel._shard_page_stats(shm.name, n)
+                with mock.patch.object(parallel, "np", None):
+                    self.assertEqual(parallel._shard_page_stats(shm.name, n), expected)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
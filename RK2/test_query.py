@@ -0,0 +1,58 @@
+import unittest
+from benchmark import generate_data
+from library_system import Book, Library, LibrarySystem, create_sample_data
+from query import (Query, books_ending_with_a, libraries_starting_with_a_with_books,
+                   library_avg_pages, library_avg_pages_by_book_library)
+
+class TestQuery(unittest.TestCase):
+    """Тесты для слоя запросов"""
+
+    def setUp(self):
+        """Настройка тестовых данных перед каждым тестом"""
+        self.system = create_sample_data()
+        self.data = (self.system.libraries, self.system.books, self.system.library_books)
+
+    def test_rk_queries_match_library_system(self):
+        """Тест 1: Три запроса RK совпадают с LibrarySystem"""
+        libraries, books, library_books = self.data
+        self.assertEqual(books_ending_with_a(books), list(self.system.get_books_ending_with_a()))
+        self.assertEqual(library_avg_pages(*self.data), list(self.system.get_library_avg_pages()))
+        self.assertEqual(libraries_starting_with_a_with_books(*self.data),
+                         [(library, list(books)) for library, books in self.system.get_libraries_starting_with_a_with_books()])
+
+    def test_rk_queries_on_generated_data(self):
+        """Тест 2: Совпадение на сгенерированных данных с пустыми библиотеками"""
+        libraries, books, library_books = generate_data(3000, seed=4)
+        libraries.append(Library(10 ** 6, "Абонемент без книг"))
+        books.append(Book(1, "Дубликат", "Автор", 1, 1))
+        system = LibrarySystem(libraries, books, library_books)
+        self.assertEqual(library_avg_pages(libraries, books, library_books), list(system.get_library_avg_pages()))
+        self.assertEqual(libraries_starting_with_a_with_books(libraries, books, library_books),
+                         [(library, list(books)) for library, books in system.get_libraries_starting_with_a_with_books()])
+
+    def test_rk1_avg_pages_by_book_library(self):
+        """Тест 3: Запрос 2 из RK1 (по полю library_id книги)"""
+        libraries, books, _ = self.data
+        result = library_avg_pages_by_book_library(libraries, books)
+        self.assertEqual(result, [("Абонемент научной литературы", 445.0, 2),
+                                  ("Городская центральная библиотека", 480.0, 1),
+                                  ("Абонемент художественной литературы", 768.0, 2),
+                                  ("Академическая библиотека", 772.5, 2)])
+
+    def test_predicate_pushdown(self):
+        """Дополнительный тест: условие переносится к чтению таблицы"""
+        libraries, books, library_books = self.data
+        query = (Query(libraries, 'l')
+                 .join(Query(library_books, 'lb'), on=('l.id', 'lb.library_id'))
+                 .where('l', lambda l: l.id == 1))
+        self.assertIn("Scan l where x1", query.explain())
+        self.assertEqual(len(query.execute()), 3)
+
+        left = (Query(libraries, 'l')
+                .left_join(Query(books, 'b'), on=('l.id', 'b.library_id'))
+                .where('b', lambda b: b.pages > 1000))
+        self.assertNotIn("where", left.explain())
+        self.assertEqual(left.select('b.title'), ["Война и мир"])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from library_system import LibraryBook, create_sample_data
+from report import BufferedLineWriter, render_all_data
+
+class TestReport(unittest.TestCase):
+    """Тесты для вывода отчёта"""
+
+    def setUp(self):
+        """Настройка тестовых данных перед каждым тестом"""
+        self.system = create_sample_data()
+        self.system.add_library_book(LibraryBook(9, 100))
+
+    def test_report_matches_print_all_data(self):
+        """Тест 1: Отчёт в файл совпадает с выводом print_all_data"""
+        # Arrange
+        stdout = io.StringIO()
+        out = io.StringIO()
+
+        # Act
+        with redirect_stdout(stdout):
+            self.system.print_all_data()
+        render_all_data(self.system.libraries, self.system.books, self.system.library_books, out)
+
+        # Assert
+        self.assertEqual(out.getvalue(), stdout.getvalue())
+        self.assertIn("Библиотека 'Неизвестно' -> Книга 'Неизвестно'", out.getvalue())
+        self.assertIn("Библиотека 'Академическая библиотека' -> Книга 'Война и мир'", out.getvalue())
+
+    def test_csv_and_jsonl_in_same_pass(self):
+        """Тест 2: CSV и JSONL пишутся в том же проходе"""
+        # Arrange
+        csv_out, jsonl_out = io.StringIO(), io.StringIO()
+
+        # Act
+        self.system.print_all_data(io.StringIO(), csv_out=csv_out, jsonl_out=jsonl_out)
+
+        # Assert
+        rows = list(csv.DictReader(io.StringIO(csv_out.getvalue())))
+        records = [json.loads(line) for line in jsonl_out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 4 + 7 + 10)
+        self.assertEqual(len(records), len(rows))
+        self.assertEqual(records[4], {"section": "book", "book_id": 1, "title": "Война и мир",
+                                      "author": "Л. Толстой", "pages": 1225, "library_id": 1})
+        self.assertEqual(rows[-1]["section"], "relation")
+        self.assertEqual(rows[-1]["library_name"], "Неизвестно")
+
+    def test_buffered_writer_flushes_in_blocks(self):
+        """Дополнительный тест: строки пишутся блоками"""
+        out = io.StringIO()
+        writer = BufferedLineWriter(out, buffer_size=10)
+        writer.write_line("abc")
+        self.assertEqual(out.getvalue(), "")
+        writer.write_line("defghij")
+        self.assertEqual(out.getvalue(), "abc\ndefghij\n")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import unittest
+from library_system import create_sample_data
+from service import LibraryService
+
+class TestLibraryService(unittest.IsolatedAsyncioTestCase):
+    """Тесты для HTTP сервиса"""
+
+    async def asyncSetUp(self):
+        """Запустить сервис на свободном порту"""
+        self.system = create_sample_data()
+        self.service = LibraryService(self.system)
+        self.server = await self.service.serve("127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.service.executor.shutdown()
+
+    async def _get(self, reader, writer, path):
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("utf-8"))
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        return status, json.loads(body)
+
+    async def test_queries_over_keep_alive_connection(self):
+        """Тест 1: Несколько запросов в одном соединении"""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+        status, rows = await self._get(reader, writer, "/libraries/avg-pages")
+        self.assertEqual(status, 200)
+        self.assertEqual([(r["name"], r["avg_pages"], r["count"]) for r in rows],
+                         list(self.system.get_library_avg_pages()))
+
+        status, books = await self._get(reader, writer, "/books/ending-with-a?offset=1&limit=1")
+        self.assertEqual([book["id"] for book in books], [3])
+
+        status, book = await self._get(reader, writer, "/books/1")
+        self.assertEqual(book["title"], "Война и мир")
+
+        status, books = await self._get(reader, writer, "/books/search?q=%D1%82%D0%BE%D0%BB%D1%81%D1%82%D0%BE%D0%B9")
+        self.assertEqual([book["id"] for book in books], [1, 2])
+
+        status, body = await self._get(reader, writer, "/books/100")
+        self.assertEqual(status, 404)
+
+        writer.close()
+
+    async def test_concurrent_requests(self):
+        """Тест 2: Параллельные соединения обслуживаются"""
+        async def request(path):
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            try:
+                return await self._get(reader, writer, path)
+            finally:
+                writer.close()
+
+        results = await asyncio.gather(*(request("/libraries/starting-with-a") for _ in range(20)))
+        self.assertTrue(all(status == 200 and len(rows) == 3 for status, rows in results))
+
+        status, body = await request("/libraries/x/books")
+        self.assertEqual(status, 400)
+
+    async def test_malformed_content_length(self):
+        """Дополнительный тест: некорректный Content-Length даёт ответ 400"""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b"GET /books/1 HTTP/1.1\r\nHost: localhost\r\nContent-Length: abc\r\n\r\n")
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), timeout=5)
+
+        self.assertEqual(int(status_line.split()[1]), 400)
+        writer.close()
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
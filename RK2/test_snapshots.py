@@ -0,0 +1,137 @@
+import gc
+import threading
+import unittest
+from library_system import Book, LibraryBook, create_sample_data
+from snapshots import VersionedLibrarySystem
+
+class TestVersionedLibrarySystem(unittest.TestCase):
+    """Тесты для снимков LibrarySystem"""
+
+    def setUp(self):
+        """Настройка тестовых данных перед каждым тестом"""
+        sample = create_sample_data()
+        self.system = VersionedLibrarySystem(sample.libraries, sample.books, sample.library_books)
+
+    def test_reader_keeps_its_version(self):
+        """Тест 1: Читатель видит свою версию, новые запросы - новую"""
+        # Arrange
+        snapshot = self.system.snapshot()
+        before = snapshot.get_library_avg_pages()
+
+        # Act
+        with self.system.write() as draft:
+            draft.add_book(Book(8, "Азбука", "В. Даль", 100, 3))
+            draft.add_library_book(LibraryBook(3, 8))
+
+        # Assert
+        self.assertEqual(snapshot.get_library_avg_pages(), before)
+        self.assertIsNone(snapshot.get_book_by_id(8))
+        self.assertEqual(self.system.get_book_by_id(8).title, "Азбука")
+        self.assertEqual(self.system.version, 1)
+
+    def test_failed_write_is_not_published(self):
+        """Тест 2: Изменения из блока с ошибкой не публикуются"""
+        with self.assertRaises(RuntimeError):
+            with self.system.write() as draft:
+                draft.remove_book(1)
+                raise RuntimeError("ошибка")
+        self.assertIsNotNone(self.system.get_book_by_id(1))
+        self.assertEqual(self.system.version, 0)
+
+    def test_old_versions_are_reclaimed(self):
+        """Тест 3: Старая версия освобождается, когда её никто не держит"""
+        snapshot = self.system.snapshot()
+        with self.system.write() as draft:
+            draft.remove_library_book(1, 5)
+        self.assertEqual(self.system.live_versions(), [0, 1])
+
+        del snapshot
+        gc.collect()
+        self.assertEqual(self.system.live_versions(), [1])
+
+    def test_mutators_are_only_available_in_write(self):
+        """Дополнительный тест: изменить опубликованную версию мимо write() нельзя"""
+        with self.assertRaisesRegex(AttributeError, "write"):
+            self.system.add_book(Book(99, "Азбука", "В. Даль", 100, 3))
+        self.assertIsNone(self.system.snapshot().get_book_by_id(99))
+        self.assertEqual(self.system.version, 0)
+
+    def test_published_version_is_frozen(self):
+        """Дополнительный тест: опубликованную версию нельзя изменить через snapshot() или draft"""
+        # Arrange
+        snapshot = self.system.snapshot()
+        with self.system.write() as draft:
+            draft.add_book(Book(99, "Азбука", "В. Даль", 100, 3))
+
+        # Act & Assert
+        with self.assertRaises(RuntimeError):
+            snapshot.add_book(Book(98, "Букварь", "Л. Толстой", 50, 3))
+        with self.assertRaises(RuntimeError):
+            draft.remove_book(99)
+        with self.assertRaises(RuntimeError):
+            self.system.snapshot().bulk_load([], [Book(98, "Букварь", "Л. Толстой", 50, 3)], [])
+        self.assertIsNone(snapshot.get_book_by_id(98))
+        self.assertIsNotNone(self.system.snapshot().get_book_by_id(99))
+        self.assertEqual(self.system.version, 1)
+
+        # Копию замороженной версии изменять можно
+        copy = snapshot.copy()
+        copy.add_book(Book(98, "Букварь", "Л. Толстой", 50, 3))
+        self.assertIsNone(snapshot.get_book_by_id(98))
+
+    def test_write_shares_unchanged_indexes(self):
+        """Дополнительный тест: изменения копии не затрагивают общие с версией индексы"""
+        # Arrange
+        snapshot = self.system.snapshot()
+        before = (snapshot.search_books("толстой"), snapshot.books_in_all_libraries([1, 2]),
+                  snapshot.get_library_avg_pages())
+
+        # Act
+        with self.system.write() as draft:
+            draft.remove_library_book(1, 5)
+            draft.remove_book(2)
+            draft.add_book(Book(8, "Детство", "Л. Толстой", 300, 1))
+            draft.add_library_book(LibraryBook(1, 8))
+
+        # Assert
+        after = (snapshot.search_books("толстой"), snapshot.books_in_all_libraries([1, 2]),
+                 snapshot.get_library_avg_pages())
+        self.assertEqual(after, before)
+        self.assertEqual([b.id for b in self.system.search_books("толстой")], [1, 8])
+        self.assertEqual([b.id for b in self.system.books_in_all_libraries([1, 2])], [1])
+        expected = create_sample_data()
+        expected.remove_library_book(1, 5)
+        expected.remove_book(2)
+        expected.add_book(Book(8, "Детство", "Л. Толстой", 300, 1))
+        expected.add_library_book(LibraryBook(1, 8))
+        self.assertEqual(self.system.get_library_avg_pages(), expected.get_library_avg_pages())
+
+    def test_concurrent_readers_see_consistent_state(self):
+        """Тест 4: Во время записи читатели не видят частично изменённых данных"""
+        errors = []
+
+        def reader():
+            for _ in range(200):
+                snapshot = self.system.snapshot()
+                books = snapshot._get_books_by_library(1)
+                rows = {name: count for name, _, count in snapshot.get_library_avg_pages()}
+                if rows["Академическая библиотека"] != len(books):
+                    errors.append((rows, books))
+
+        def writer():
+            for i in range(20):
+                with self.system.write() as draft:
+                    draft.add_book(Book(100 + i, "Книга", "Автор", 10, 1))
+                    draft.add_library_book(LibraryBook(1, 100 + i))
+
+        threads = [threading.Thread(target=reader) for _ in range(4)] + [threading.Thread(target=writer)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.system._get_books_by_library(1)), 23)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from library_system import Book, LibraryBook, create_sample_data
+from sqlite_library_system import SqliteLibrarySystem
+
+class TestSqliteLibrarySystem(unittest.TestCase):
+    """Тесты для системы управления библиотекой на SQLite"""
+
+    def setUp(self):
+        """Настройка тестовых данных перед каждым тестом"""
+        self.reference = create_sample_data()
+        self.system = SqliteLibrarySystem()
+        self.system.bulk_load(self.reference.libraries, self.reference.books,
+                              self.reference.library_books)
+
+    def tearDown(self):
+        self.system.close()
+
+    def test_queries_match_library_system(self):
+        """Тест 1: Запросы совпадают с LibrarySystem"""
+        self.assertEqual(self.system.get_books_ending_with_a(),
+                         list(self.reference.get_books_ending_with_a()))
+        self.assertEqual(self.system.get_library_avg_pages(),
+                         list(self.reference.get_library_avg_pages()))
+        self.assertEqual(self.system.get_libraries_starting_with_a_with_books(),
+                         [(library, list(books)) for library, books in self.reference.get_libraries_starting_with_a_with_books()])
+        self.assertEqual(self.system._get_books_by_library(2),
+                         self.reference._get_books_by_library(2))
+
+    def test_lookups_and_mutations(self):
+        """Тест 2: Поиск по ID и изменение данных"""
+        # Arrange
+        self.system.add_book(Book(8, "Азбука", "В. Даль", 100, 1))
+        self.system.add_library_book(LibraryBook(1, 8))
+
+        # Act
+        books = self.system._get_books_by_library(1)
+
+        # Assert
+        self.assertEqual([book.id for book in books], [1, 3, 5, 8])
+        self.assertEqual(self.system.get_library_by_id(1).name, "Академическая библиотека")
+
+        self.system.remove_library_book(1, 8)
+        self.system.remove_book(8)
+        self.assertIsNone(self.system.get_book_by_id(8))
+        self.assertEqual(len(self.system._get_books_by_library(1)), 3)
+
+    def test_data_persists_between_connections(self):
+        """Тест 3: Данные сохраняются в файле"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "library.db")
+            system = SqliteLibrarySystem(path)
+            system.bulk_load(self.reference.libraries, self.reference.books,
+                             self.reference.library_books)
+            system.close()
+
+            reopened = SqliteLibrarySystem(path)
+            self.assertEqual(reopened.get_all_books(), self.reference.books)
+            self.assertEqual(reopened.get_library_books_relations(), self.reference.library_books)
+            reopened.close()
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
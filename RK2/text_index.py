@@ -0,0 +1,115 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import groupby, islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Разбить текст на слова без учёта регистра; 'ё' считается равной 'е'"""
+    return _TOKEN_RE.findall(text.casefold().replace('ё', 'е'))
+
+
+def _contains(posting: array, doc: int) -> bool:
+    i = bisect_left(posting, doc)
+    return i < len(posting) and posting[i] == doc
+
+
+class InvertedIndex:
+    """Инвертированный индекс: слово -> отсортированный массив номеров документов.
+
+    Номера документов должны выдаваться по возрастанию (порядок добавления),
+    тогда добавление в конец массива сохраняет его отсортированным.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._items: Dict[int, Hashable] = {}
+        # После copy() массивы общие с копией: перед изменением массив копируется
+        self._shared = False
+        self._owned: Set[str] = set()
+
+    def copy(self) -> 'InvertedIndex':
+        """Копия, разделяющая неизменённые массивы номеров с исходным индексом"""
+        result = InvertedIndex()
+        result._postings = dict(self._postings)
+        result._items = dict(self._items)
+        result._shared = self._shared = True
+        self._owned = set()
+        return result
+
+    def _posting_for_update(self, token: str) -> array:
+        posting = self._postings.get(token)
+        if posting is None:
+            posting = self._postings[token] = array('q')
+        elif self._shared and token not in self._owned:
+            posting = self._postings[token] = array('q', posting)
+        else:
+            return posting
+        if self._shared:
+            self._owned.add(token)
+        return posting
+
+    def add(self, doc: int, item_id: Hashable, text: str):
+        """Проиндексировать документ"""
+        self._items[doc] = item_id
+        for token in set(tokenize(text)):
+            posting = self._posting_for_update(token)
+            if posting and posting[-1] > doc:
+                posting.insert(bisect_left(posting, doc), doc)
+            else:
+                posting.append(doc)
+
+    def remove(self, doc: int, text: str):
+        """Удалить документ из индекса"""
+        self._items.pop(doc, None)
+        for token in set(tokenize(text)):
+            posting = self._postings.get(token)
+            if posting is not None and _contains(posting, doc):
+                posting = self._posting_for_update(token)
+                del posting[bisect_left(posting, doc)]
+                if not posting:
+                    del self._postings[token]
+
+    def iter_search(self, query: str, mode: str = 'and', allowed: Iterable[Hashable] = None,
+                    after: Optional[int] = None) -> Iterator[Hashable]:
+        """Лениво перебрать id документов со всеми (mode='and') или любыми (mode='or')
+        словами запроса по возрастанию номера документа.
+
+        allowed - необязательный набор id, которыми ограничивается результат;
+        after - номер документа, после которого начинать (ищется двоичным поиском).
+        """
+        if mode not in ('and', 'or'):
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
+        # Множества, словари и битовые карты проверяются напрямую, без копирования
+        if allowed is not None and (not hasattr(allowed, '__contains__') or isinstance(allowed, (list, tuple))):
+            allowed = set(allowed)
+
+        postings = [self._postings.get(token, array('q')) for token in set(tokenize(query))]
+        if not postings:
+            return
+        start = -1 if after is None else after
+
+        if mode == 'and':
+            postings.sort(key=len)
+            first = postings[0]
+            docs = (doc for doc in islice(first, bisect_right(first, start), None)
+                    if all(_contains(posting, doc) for posting in postings[1:]))
+        else:
+            runs = [islice(posting, bisect_right(posting, start), None) for posting in postings]
+            docs = (doc for doc, _ in groupby(heapq.merge(*runs)))
+
+        for doc in docs:
+            item_id = self._items[doc]
+            if allowed is None or item_id in allowed:
+                yield item_id
+
+    def search(self, query: str, mode: str = 'and', allowed: Iterable[Hashable] = None) -> List[Hashable]:
+        """Найти документы со всеми (mode='and') или любыми (mode='or') словами запроса.
+
+        allowed - необязательный набор id, которыми ограничивается результат.
+        """
+        return list(self.iter_search(query, mode, allowed))